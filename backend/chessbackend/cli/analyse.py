@@ -0,0 +1,190 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from chessbackend import engine
+from chessbackend.cli import formatting
+from chessbackend.engine import pgn, search
+import argparse
+import json
+import os
+import re
+import sys
+
+# Analyses a stream of positions with a pool of worker processes and writes
+# one JSON object per position, in input order. Only a few positions per worker
+# are in flight at a time, so memory use does not depend on the input size.
+# Output written to a file can be resumed: positions that already have a result
+# line are skipped.
+
+# Positions in flight per worker process.
+POSITIONS_PER_WORKER = 4
+
+_EPD_ID_PATTERN = re.compile(r'\bid\s+"([^"]*)"')
+
+
+class PositionRecord(NamedTuple):
+    # Number of the position in the input, starting at 0.
+    index: int
+    # The EPD "id" operation, if any.
+    id: Optional[str]
+    fen: str
+    # The move played in this position, in SAN, for positions from PGN games.
+    played_move: Optional[str] = None
+
+
+def read_positions(lines: Iterable[str]) -> Iterator[PositionRecord]:
+    # Reads FEN or EPD lines. EPD operations other than "id" are ignored, and
+    # missing move counters do not matter, because the engine ignores them.
+    index = 0
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = line.split(maxsplit=4)
+        id_match = _EPD_ID_PATTERN.search(fields[4]) if len(fields) > 4 else None
+        yield PositionRecord(
+            index, id_match.group(1) if id_match else None, " ".join(fields[:4])
+        )
+        index += 1
+
+
+def read_pgn_positions(lines: Iterable[str]) -> Iterator[PositionRecord]:
+    # Reads the position before every move of every game. The id is the number
+    # of the game, starting at 1, and the ply, e.g. "3:12". A game with a move
+    # that cannot be decoded is only read up to that move.
+    index = 0
+    for game_number, game in enumerate(pgn.read_games(lines), 1):
+        ply = 0
+        try:
+            for played_game, move in pgn.iterate_moves(game):
+                yield PositionRecord(
+                    index, f"{game_number}:{ply}", played_game.to_fen(), game.moves[ply]
+                )
+                index += 1
+                ply += 1
+        except ValueError as error:
+            print(f"Game {game_number}, ply {ply}: {error}", file=sys.stderr)
+
+
+def analyse_position(
+    record: PositionRecord, max_depth: int, time_limit: Optional[float]
+) -> Dict[str, Any]:
+    result_data: Dict[str, Any] = {"index": record.index, "fen": record.fen}
+    if record.id is not None:
+        result_data["id"] = record.id
+    if record.played_move is not None:
+        result_data["playedMove"] = record.played_move
+    try:
+        game = engine.Game.from_fen(record.fen)
+    except ValueError as error:
+        result_data["error"] = str(error)
+        return result_data
+
+    result = search.search(game, max_depth, time_limit)
+    result_data.update(
+        {
+            "bestMove": (
+                formatting.format_move(result.best_move) if result.best_move else None
+            ),
+            "score": result.score,
+            "depth": result.depth,
+            "nodes": result.nodes,
+            "principalVariation": [
+                formatting.format_move(move) for move in result.principal_variation
+            ],
+            "check": game.is_check(),
+            "checkmate": game.is_checkmate(),
+            "stalemate": game.is_stalemate(),
+        }
+    )
+    return result_data
+
+
+def analyse(
+    records: Iterable[PositionRecord],
+    max_depth: int,
+    time_limit: Optional[float] = None,
+    workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    # Yields the results in the order of `records`.
+    workers = workers or os.cpu_count() or 1
+    max_pending = POSITIONS_PER_WORKER * workers
+    with ProcessPoolExecutor(workers) as executor:
+        pending: Deque[Future] = deque()
+        for record in records:
+            pending.append(
+                executor.submit(analyse_position, record, max_depth, time_limit)
+            )
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def count_results(output_path: str) -> int:
+    # Counts the complete result lines of an earlier run and cuts off a line
+    # that was only partly written when that run was stopped.
+    if not os.path.exists(output_path):
+        return 0
+    complete_size = 0
+    count = 0
+    with open(output_path, "rb") as output_file:
+        for line in output_file:
+            if not line.endswith(b"\n"):
+                break
+            complete_size += len(line)
+            count += 1
+    os.truncate(output_path, complete_size)
+    return count
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Search FEN or EPD positions, or the positions of PGN games, "
+        "and write the results as JSON lines."
+    )
+    parser.add_argument(
+        "input", nargs="?", default="-", help="FEN/EPD/PGN file, '-' for stdin"
+    )
+    parser.add_argument(
+        "--pgn",
+        action="store_true",
+        help="read PGN games (default for files ending in .pgn)",
+    )
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--time", type=float, help="time limit per position")
+    parser.add_argument(
+        "--workers", type=int, help="number of worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--output", help="append results to this file and skip those already in it"
+    )
+    args = parser.parse_args(argv)
+
+    input_file = sys.stdin if args.input == "-" else open(args.input)
+    try:
+        is_pgn = args.pgn or args.input.lower().endswith(".pgn")
+        records: Iterable[PositionRecord] = (
+            read_pgn_positions(input_file) if is_pgn else read_positions(input_file)
+        )
+        if args.output is not None:
+            done = count_results(args.output)
+            records = (record for record in records if record.index >= done)
+            output_file = open(args.output, "a")
+        else:
+            output_file = sys.stdout
+        try:
+            for result_data in analyse(records, args.depth, args.time, args.workers):
+                output_file.write(json.dumps(result_data) + "\n")
+                # A stopped run loses at most the positions in flight.
+                output_file.flush()
+        finally:
+            if output_file is not sys.stdout:
+                output_file.close()
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+
+
+if __name__ == "__main__":
+    main()
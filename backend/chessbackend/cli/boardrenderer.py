@@ -7,9 +7,9 @@ class BoardRenderer:
 
     def render(self):
         grid = []
-        for x in range(self._game.size[0]):
+        for x in range(engine.BOARD_SIZE):
             row = []
-            for y in range(self._game.size[0]):
+            for y in range(engine.BOARD_SIZE):
                 row.append("")
             grid.append(row)
         for fig in self._game.figures:
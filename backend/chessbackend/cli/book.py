@@ -0,0 +1,42 @@
+from typing import List, Optional
+from chessbackend.engine import book, pgn
+import argparse
+import sys
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Build an opening book from the first moves of PGN games."
+    )
+    parser.add_argument("input", help="PGN file, '-' for stdin")
+    parser.add_argument("output", help="book file to write")
+    parser.add_argument(
+        "--max-ply",
+        type=int,
+        default=book.DEFAULT_MAX_PLY,
+        help="number of plies of every game to add",
+    )
+    args = parser.parse_args(argv)
+
+    builder = book.BookBuilder(args.max_ply)
+    input_file = sys.stdin if args.input == "-" else open(args.input)
+    games = 0
+    try:
+        for game_number, game in enumerate(pgn.read_games(input_file), 1):
+            try:
+                builder.add_game(game)
+            except ValueError as error:
+                # The moves before the one that cannot be decoded are kept.
+                print(f"Game {game_number}: {error}", file=sys.stderr)
+            games += 1
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+
+    builder.write(args.output)
+    with book.OpeningBook(args.output) as opening_book:
+        print(f"{games} games, {len(opening_book)} book entries")
+
+
+if __name__ == "__main__":
+    main()
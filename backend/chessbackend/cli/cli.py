@@ -3,7 +3,7 @@ from chessbackend.cli import boardrenderer
 
 
 def main():
-    figures = engine.build_default_figures()
+    figures = engine.build_default_figures(engine.FigureBuilder(engine.FigureFactory()))
     game = engine.Game(figures)
     renderer = boardrenderer.BoardRenderer(game)
     renderer.render()
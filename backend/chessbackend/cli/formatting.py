@@ -0,0 +1,16 @@
+from typing import Optional
+from chessbackend import engine
+
+# Output formats shared by the command line tools.
+
+
+def format_move(move: Optional[engine.Move]) -> str:
+    # Coordinate notation, like "e2e4".
+    if move is None:
+        return "none"
+    return "".join(engine.get_field_name(position) for position in move)
+
+
+def format_speed(nodes: int, seconds: float) -> str:
+    nodes_per_second = nodes / seconds if seconds > 0 else float("inf")
+    return f"{seconds:.3f}s, {nodes_per_second:.0f} nodes/s"
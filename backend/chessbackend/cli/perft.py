@@ -0,0 +1,122 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from chessbackend import engine
+from chessbackend.cli import formatting
+from chessbackend.engine import fen
+import argparse
+import sys
+import time
+
+
+class PerftPosition(NamedTuple):
+    fen: str
+    # Expected leaf node counts for depth 1, 2, ...
+    node_counts: Tuple[int, ...]
+
+
+# Standard perft counts. The engine has no castling, en passant or promotion,
+# so only positions and depths where none of these can happen are included.
+REFERENCE_SUITE = (
+    PerftPosition(fen.START_FEN, (20, 400, 8902, 197281)),
+    PerftPosition("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", (14, 191)),
+    PerftPosition("4k3/8/8/8/8/8/8/4K2R w - - 0 1", (14, 63, 1149, 6786)),
+    PerftPosition("r3k2r/8/8/8/8/8/8/R3K2R w - - 0 1", (24, 482, 11522)),
+    PerftPosition("8/8/1k6/2b5/2pP4/8/5K2/8 b - - 0 1", (14, 121, 1843, 13508)),
+    PerftPosition("8/3k4/8/8/8/8/3K4/8 w - - 0 1", (8, 64, 440, 2974)),
+    PerftPosition("3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", (18, 92, 1670)),
+    PerftPosition("8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1", (13, 102, 1266)),
+    PerftPosition(
+        "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w - - 2 3",
+        (27, 835, 23926),
+    ),
+    PerftPosition("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1", (20, 152, 3029, 23005)),
+)
+
+
+def perft(game: engine.Game, depth: int) -> int:
+    # Counts the leaf nodes of the tree of all legal moves down to `depth`.
+    if depth <= 0:
+        return 1
+    possible_moves = game.get_all_possible_moves()
+    # The moves of the last ply are counted without applying them.
+    if depth == 1:
+        return len(possible_moves)
+    nodes = 0
+    for move in possible_moves:
+        game.push(move)
+        nodes += perft(game, depth - 1)
+        game.pop()
+    return nodes
+
+
+def divide(game: engine.Game, depth: int) -> Dict[engine.Move, int]:
+    # Leaf node counts per root move, to narrow down move generator bugs.
+    node_counts = {}
+    for move in game.get_all_possible_moves():
+        game.push(move)
+        node_counts[move] = perft(game, depth - 1)
+        game.pop()
+    return node_counts
+
+
+def run_suite(max_depth: Optional[int] = None) -> bool:
+    all_passed = True
+    for position in REFERENCE_SUITE:
+        game = engine.Game.from_fen(position.fen)
+        for depth, expected_nodes in enumerate(position.node_counts, start=1):
+            if max_depth is not None and depth > max_depth:
+                break
+            nodes, seconds = _timed_perft(game, depth)
+            passed = nodes == expected_nodes
+            all_passed = all_passed and passed
+            print(
+                f"{'ok' if passed else 'FAIL':4} {position.fen} depth {depth}: "
+                f"{nodes} nodes (expected {expected_nodes}), "
+                f"{formatting.format_speed(nodes, seconds)}"
+            )
+    return all_passed
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Count the leaf nodes of the legal move tree (perft)."
+    )
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fen", default=fen.START_FEN)
+    parser.add_argument(
+        "--divide", action="store_true", help="print node counts per root move"
+    )
+    parser.add_argument(
+        "--suite",
+        action="store_true",
+        help="check the reference suite up to --depth and exit non-zero on errors",
+    )
+    args = parser.parse_args(argv)
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")
+
+    if args.suite:
+        sys.exit(0 if run_suite(args.depth) else 1)
+
+    game = engine.Game.from_fen(args.fen)
+    if args.divide:
+        start = time.perf_counter()
+        node_counts = divide(game, args.depth)
+        seconds = time.perf_counter() - start
+        for move, nodes in sorted(node_counts.items()):
+            print(f"{formatting.format_move(move)}: {nodes}")
+        nodes = sum(node_counts.values())
+    else:
+        nodes, seconds = _timed_perft(game, args.depth)
+    print(
+        f"depth {args.depth}: {nodes} nodes, {formatting.format_speed(nodes, seconds)}"
+    )
+
+
+def _timed_perft(game: engine.Game, depth: int) -> Tuple[int, float]:
+    start = time.perf_counter()
+    nodes = perft(game, depth)
+    return nodes, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
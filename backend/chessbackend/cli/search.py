@@ -0,0 +1,60 @@
+from typing import List, Optional
+from chessbackend import engine
+from chessbackend.cli import formatting
+from chessbackend.engine import fen, parallel, search
+import argparse
+import time
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Search a position with several worker processes (Lazy SMP)."
+    )
+    parser.add_argument("--fen", default=fen.START_FEN)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--time", type=float, help="time limit in seconds")
+    parser.add_argument(
+        "--workers", type=int, help="number of worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="also search with a single process and print the speedup",
+    )
+    args = parser.parse_args(argv)
+
+    game = engine.Game.from_fen(args.fen)
+    with parallel.ParallelSearcher(args.workers) as searcher:
+        # Starts the worker processes, so that their start-up is not timed.
+        searcher.search(game, max_depth=1)
+        searcher.clear()
+        parallel_result = searcher.search(game, args.depth, args.time)
+
+    result = parallel_result.result
+    speed = formatting.format_speed(result.nodes, parallel_result.seconds)
+    print(
+        f"{searcher.workers} workers: "
+        f"best move {formatting.format_move(result.best_move)}, "
+        f"score {result.score}, depth {result.depth}, {result.nodes} nodes, {speed}"
+    )
+    for worker, (nodes, depth) in enumerate(
+        zip(parallel_result.worker_nodes, parallel_result.worker_depths)
+    ):
+        print(f"  worker {worker}: {nodes} nodes, depth {depth}")
+
+    if args.compare:
+        start = time.perf_counter()
+        single_result = search.search(game, args.depth, args.time)
+        seconds = time.perf_counter() - start
+        speed = formatting.format_speed(single_result.nodes, seconds)
+        print(
+            f"1 process: best move {formatting.format_move(single_result.best_move)}, "
+            f"score {single_result.score}, depth {single_result.depth}, "
+            f"{single_result.nodes} nodes, {speed}"
+        )
+        # Only meaningful for searches to a fixed depth, not for time limits.
+        print(f"speedup: {seconds / parallel_result.seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,5 +7,15 @@ from chessbackend.engine.engine import (
     FigureFactory,
     FigureBuilder,
     Move,
+    GameStatus,
+    Board,
+    get_square_index,
+    get_position,
+    get_field_name,
+    parse_field_name,
+    BOARD_SIZE,
 )
 from chessbackend.engine.game import Game
+from chessbackend.engine.bitboard import BitboardGame
+from chessbackend.engine.search import Searcher, SearchResult
+from chessbackend.engine.transposition import TranspositionTable
@@ -0,0 +1,358 @@
+from typing import List, Optional, Tuple
+from chessbackend.engine import engine, fen, zobrist
+import copy
+
+# A position is stored as one 64 bit integer per colour and piece type. Bit
+# `y * 8 + x` of a bitboard is set if such a piece stands on field (x, y), which
+# is the same field numbering as `engine.Board` uses.
+
+# Piece types are the figure codes of `engine`.
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = (
+    engine.PAWN,
+    engine.KNIGHT,
+    engine.BISHOP,
+    engine.ROOK,
+    engine.QUEEN,
+    engine.KING,
+)
+WHITE, BLACK = 0, 1
+
+COLOUR_INDICES = {engine.Colour.WHITE: WHITE, engine.Colour.BLACK: BLACK}
+
+SQUARE_COUNT = engine.BOARD_SIZE * engine.BOARD_SIZE
+
+
+def _build_step_attacks(offsets: Tuple[Tuple[int, int], ...]) -> Tuple[int, ...]:
+    attacks = []
+    for square in range(SQUARE_COUNT):
+        x, y = square % engine.BOARD_SIZE, square // engine.BOARD_SIZE
+        bitboard = 0
+        for x_offset, y_offset in offsets:
+            target = engine.Position(x + x_offset, y + y_offset)
+            if engine.is_on_board(target):
+                bitboard |= 1 << engine.get_square_index(target)
+        attacks.append(bitboard)
+    return tuple(attacks)
+
+
+def _build_rays(direction: Tuple[int, int]) -> Tuple[int, ...]:
+    # For every field, all fields reached by walking in `direction` on an empty
+    # board, excluding the field itself.
+    x_step, y_step = direction
+    rays = []
+    for square in range(SQUARE_COUNT):
+        target = engine.Position(
+            square % engine.BOARD_SIZE + x_step, square // engine.BOARD_SIZE + y_step
+        )
+        bitboard = 0
+        while engine.is_on_board(target):
+            bitboard |= 1 << engine.get_square_index(target)
+            target = engine.Position(target.x + x_step, target.y + y_step)
+        rays.append(bitboard)
+    return tuple(rays)
+
+
+def _build_ray_tables(
+    directions: Tuple[Tuple[int, int], ...],
+) -> Tuple[Tuple[Tuple[int, ...], bool], ...]:
+    # Directions with a positive square index step find their first blocker in
+    # the lowest set bit, the others in the highest set bit.
+    return tuple(
+        (_build_rays((x_step, y_step)), y_step * engine.BOARD_SIZE + x_step > 0)
+        for x_step, y_step in directions
+    )
+
+
+KNIGHT_ATTACKS = _build_step_attacks(engine.KNIGHT_OFFSETS)
+KING_ATTACKS = _build_step_attacks(engine.KING_OFFSETS)
+PAWN_ATTACKS = (
+    _build_step_attacks(((-1, 1), (1, 1))),
+    _build_step_attacks(((-1, -1), (1, -1))),
+)
+ORTHOGONAL_RAYS = _build_ray_tables(engine.ORTHOGONAL_DIRECTIONS)
+DIAGONAL_RAYS = _build_ray_tables(engine.DIAGONAL_DIRECTIONS)
+
+PAWN_DIRECTIONS = (engine.BOARD_SIZE, -engine.BOARD_SIZE)
+PAWN_START_RANKS = (1, engine.BOARD_SIZE - 2)
+
+
+def get_sliding_attacks(
+    square: int, occupied: int, ray_tables: Tuple[Tuple[Tuple[int, ...], bool], ...]
+) -> int:
+    attacks = 0
+    for rays, is_positive in ray_tables:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            if is_positive:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            # Cut off the part of the ray behind the first blocker.
+            ray ^= rays[blocker]
+        attacks |= ray
+    return attacks
+
+
+def iterate_squares(bitboard: int):
+    while bitboard:
+        lowest_bit = bitboard & -bitboard
+        yield lowest_bit.bit_length() - 1
+        bitboard ^= lowest_bit
+
+
+class BitboardGame:
+    # Drop-in alternative to `engine.Game` with the same rules and public API,
+    # but with move generation and check detection on bitboards.
+
+    def __init__(self, figures: Tuple[engine.Figure, ...], in_turn=engine.Colour.WHITE):
+        self._in_turn = in_turn
+        self.figures = figures
+
+    @property
+    def in_turn(self) -> engine.Colour:
+        return self._in_turn
+
+    @in_turn.setter
+    def in_turn(self, in_turn: engine.Colour):
+        self.hash ^= zobrist.get_in_turn_key(self._in_turn)
+        self.hash ^= zobrist.get_in_turn_key(in_turn)
+        self._in_turn = in_turn
+        self._status: Optional[engine.GameStatus] = None
+
+    @property
+    def figures(self) -> Tuple[engine.Figure, ...]:
+        return tuple(fig for fig in self._figures_by_square if fig is not None)
+
+    @figures.setter
+    def figures(self, figures: Tuple[engine.Figure, ...]):
+        self._pieces: List[int] = [0] * 12
+        self._occupancy: List[int] = [0, 0]
+        # The original figure objects are kept, so callers get back the same
+        # figures (e.g. with their ids) that they passed in.
+        self._figures_by_square: List[Optional[engine.Figure]] = [None] * SQUARE_COUNT
+        self._piece_by_square: List[Optional[int]] = [None] * SQUARE_COUNT
+        for figure in figures:
+            square = engine.get_square_index(figure.position)
+            colour = COLOUR_INDICES[figure.colour]
+            piece = colour * 6 + figure.code
+            self._pieces[piece] |= 1 << square
+            self._occupancy[colour] |= 1 << square
+            self._figures_by_square[square] = figure
+            self._piece_by_square[square] = piece
+        self._status = None
+        # Zobrist hash of the position like `Game.hash`, kept up to date by
+        # `make_move`.
+        self.hash = zobrist.compute_hash(figures, self._in_turn)
+
+    @classmethod
+    def from_fen(
+        cls, fen_string: str, figure_builder: Optional[engine.FigureBuilder] = None
+    ) -> "BitboardGame":
+        if figure_builder is None:
+            figure_builder = engine.FigureBuilder(engine.FigureFactory())
+        figures, in_turn = fen.parse_fen(fen_string, figure_builder)
+        return cls(figures, in_turn)
+
+    def to_fen(self) -> str:
+        return fen.build_fen(self.figures, self.in_turn)
+
+    def is_move_possible(self, move: engine.Move) -> bool:
+        if not engine.is_on_board(move.source) or not engine.is_on_board(move.target):
+            return False
+
+        source = engine.get_square_index(move.source)
+        target = engine.get_square_index(move.target)
+        piece = self._piece_by_square[source]
+
+        # There must be a figure to move.
+        if piece is None:
+            return False
+
+        # Player can only move figures of matching color.
+        colour = COLOUR_INDICES[self.in_turn]
+        if piece // 6 != colour:
+            return False
+
+        if not self._get_target_squares(source, piece) >> target & 1:
+            return False
+
+        # Cannot expose own king.
+        return self._is_legal(source, target)
+
+    def make_move(self, move: engine.Move):
+        if not self.is_move_possible(move):
+            raise ValueError("Invalid move")
+        source = engine.get_square_index(move.source)
+        target = engine.get_square_index(move.target)
+        self._make(source, target)
+
+        figure = self._figures_by_square[source]
+        captured_figure = self._figures_by_square[target]
+        new_figure = copy.copy(figure)
+        new_figure.position = move.target
+        self._figures_by_square[source] = None
+        self._figures_by_square[target] = new_figure
+        self.hash ^= zobrist.get_figure_key(figure) ^ zobrist.get_figure_key(new_figure)
+        if captured_figure is not None:
+            self.hash ^= zobrist.get_figure_key(captured_figure)
+        self.in_turn = engine.get_opposite_color(self.in_turn)
+
+    def get_all_target_positions(
+        self, source_position: engine.Position
+    ) -> Tuple[engine.Position, ...]:
+        source = engine.get_square_index(source_position)
+        piece = self._piece_by_square[source]
+        if piece is None or piece // 6 != COLOUR_INDICES[self.in_turn]:
+            return tuple()
+        return tuple(
+            engine.get_position(target)
+            for target in iterate_squares(self._get_target_squares(source, piece))
+            if self._is_legal(source, target)
+        )
+
+    def get_all_possible_moves(self) -> Tuple[engine.Move, ...]:
+        return tuple(
+            engine.Move(engine.get_position(source), engine.get_position(target))
+            for source, target in self._generate_legal_moves()
+        )
+
+    def is_check(self) -> bool:
+        return self.is_colour_in_check(self.in_turn)
+
+    def is_colour_in_check(self, colour: engine.Colour) -> bool:
+        return self._is_king_attacked(COLOUR_INDICES[colour])
+
+    def is_checkmate(self) -> bool:
+        return self.get_status().checkmate
+
+    def is_stalemate(self) -> bool:
+        return self.get_status().stalemate
+
+    def get_status(self) -> engine.GameStatus:
+        # Computed once per position, until the next move is made.
+        if self._status is None:
+            is_check = self.is_check()
+            has_legal_move = self._has_legal_move()
+            self._status = engine.GameStatus(
+                check=is_check,
+                checkmate=is_check and not has_legal_move,
+                stalemate=not is_check and not has_legal_move,
+            )
+        return self._status
+
+    def _has_legal_move(self) -> bool:
+        return next(self._generate_legal_moves(), None) is not None
+
+    def _generate_legal_moves(self):
+        colour = COLOUR_INDICES[self.in_turn]
+        for source in iterate_squares(self._occupancy[colour]):
+            piece = self._piece_by_square[source]
+            for target in iterate_squares(self._get_target_squares(source, piece)):
+                if self._is_legal(source, target):
+                    yield source, target
+
+    def _get_target_squares(self, source: int, piece: int) -> int:
+        colour, piece_type = divmod(piece, 6)
+        own = self._occupancy[colour]
+        occupied = own | self._occupancy[1 - colour]
+
+        if piece_type == PAWN:
+            targets = PAWN_ATTACKS[colour][source] & self._occupancy[1 - colour]
+            one_field_forward = source + PAWN_DIRECTIONS[colour]
+            if 0 <= one_field_forward < SQUARE_COUNT and not (
+                occupied >> one_field_forward & 1
+            ):
+                targets |= 1 << one_field_forward
+                two_fields_forward = one_field_forward + PAWN_DIRECTIONS[colour]
+                if source // engine.BOARD_SIZE == PAWN_START_RANKS[colour] and not (
+                    occupied >> two_fields_forward & 1
+                ):
+                    targets |= 1 << two_fields_forward
+            return targets
+        if piece_type == KNIGHT:
+            return KNIGHT_ATTACKS[source] & ~own
+        if piece_type == KING:
+            return KING_ATTACKS[source] & ~own
+
+        attacks = 0
+        if piece_type == ROOK or piece_type == QUEEN:
+            attacks |= get_sliding_attacks(source, occupied, ORTHOGONAL_RAYS)
+        if piece_type == BISHOP or piece_type == QUEEN:
+            attacks |= get_sliding_attacks(source, occupied, DIAGONAL_RAYS)
+        return attacks & ~own
+
+    def _is_legal(self, source: int, target: int) -> bool:
+        colour = self._piece_by_square[source] // 6
+        captured_piece = self._make(source, target)
+        is_exposed = self._is_king_attacked(colour)
+        self._unmake(source, target, captured_piece)
+        return not is_exposed
+
+    def _is_king_attacked(self, colour: int) -> bool:
+        king = self._pieces[colour * 6 + KING]
+
+        # Only for test cases. In practice, both kings must always exist.
+        if not king:
+            return False
+
+        return self._is_square_attacked(king.bit_length() - 1, 1 - colour)
+
+    def _is_square_attacked(self, square: int, by_colour: int) -> bool:
+        pieces = self._pieces
+        offset = by_colour * 6
+        if KNIGHT_ATTACKS[square] & pieces[offset + KNIGHT]:
+            return True
+        if KING_ATTACKS[square] & pieces[offset + KING]:
+            return True
+        # A pawn attacks the square if a pawn of the other colour standing on
+        # the square would attack the pawn.
+        if PAWN_ATTACKS[1 - by_colour][square] & pieces[offset + PAWN]:
+            return True
+
+        occupied = self._occupancy[WHITE] | self._occupancy[BLACK]
+        queens = pieces[offset + QUEEN]
+        orthogonal_attackers = pieces[offset + ROOK] | queens
+        if orthogonal_attackers and (
+            get_sliding_attacks(square, occupied, ORTHOGONAL_RAYS)
+            & orthogonal_attackers
+        ):
+            return True
+        diagonal_attackers = pieces[offset + BISHOP] | queens
+        if diagonal_attackers and (
+            get_sliding_attacks(square, occupied, DIAGONAL_RAYS) & diagonal_attackers
+        ):
+            return True
+        return False
+
+    def _make(self, source: int, target: int) -> Optional[int]:
+        # Moves a piece on the bitboards only and returns the captured piece, so
+        # that `_unmake` can restore the position.
+        piece = self._piece_by_square[source]
+        captured_piece = self._piece_by_square[target]
+        colour = piece // 6
+        source_bit = 1 << source
+        target_bit = 1 << target
+
+        if captured_piece is not None:
+            self._pieces[captured_piece] ^= target_bit
+            self._occupancy[1 - colour] ^= target_bit
+        self._pieces[piece] ^= source_bit | target_bit
+        self._occupancy[colour] ^= source_bit | target_bit
+        self._piece_by_square[source] = None
+        self._piece_by_square[target] = piece
+        return captured_piece
+
+    def _unmake(self, source: int, target: int, captured_piece: Optional[int]):
+        piece = self._piece_by_square[target]
+        colour = piece // 6
+        source_bit = 1 << source
+        target_bit = 1 << target
+
+        self._pieces[piece] ^= source_bit | target_bit
+        self._occupancy[colour] ^= source_bit | target_bit
+        if captured_piece is not None:
+            self._pieces[captured_piece] ^= target_bit
+            self._occupancy[1 - colour] ^= target_bit
+        self._piece_by_square[source] = piece
+        self._piece_by_square[target] = captured_piece
@@ -0,0 +1,156 @@
+from collections import defaultdict
+from typing import DefaultDict, Iterator, NamedTuple, Optional, Tuple
+from chessbackend.engine import engine, pgn
+from chessbackend.engine.game import Game
+import mmap
+import os
+import random
+import struct
+
+# Opening books use the entry layout of Polyglot books: 16 byte big-endian
+# entries of position key, move, weight and a learn value, sorted by key. The
+# key is the engine's Zobrist hash, not the Polyglot one, because the engine has
+# no castling or en passant rights to hash. A book file is memory-mapped and
+# binary-searched, so a lookup parses nothing, and all worker processes share
+# the pages of the file.
+
+ENTRY = struct.Struct(">QHHI")
+_KEY = struct.Struct(">Q")
+MAX_WEIGHT = 0xFFFF
+# Plies of every game that go into a book by default.
+DEFAULT_MAX_PLY = 24
+# Weight of a move per game, by the result for the colour that played it.
+WIN_WEIGHT = 2
+DRAW_WEIGHT = 1
+
+
+class BookError(ValueError):
+    pass
+
+
+class BookEntry(NamedTuple):
+    move: engine.Move
+    weight: int
+
+
+class OpeningBook:
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size % ENTRY.size:
+            self._file.close()
+            raise BookError(f"Invalid book file: {path}")
+        self._size = size // ENTRY.size
+        # An empty file cannot be mapped.
+        self._map = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get_entries(self, position_hash: int) -> Tuple[BookEntry, ...]:
+        entries = []
+        index = self._find_first(position_hash)
+        while index < self._size:
+            key, move, weight, _ = ENTRY.unpack_from(self._map, index * ENTRY.size)
+            if key != position_hash:
+                break
+            entries.append(BookEntry(decode_move(move), weight))
+            index += 1
+        return tuple(entries)
+
+    def choose_move(
+        self, game: Game, random_source: Optional[random.Random] = None
+    ) -> Optional[engine.Move]:
+        # Picks a book move at random by weight, or `None` if the position is
+        # not in the book. Moves that are not legal, e.g. after a hash
+        # collision, are never picked.
+        entries = [
+            entry
+            for entry in self.get_entries(game.hash)
+            if entry.weight > 0 and game.is_move_possible(entry.move)
+        ]
+        if not entries:
+            return None
+        return (random_source or random).choices(
+            [entry.move for entry in entries], [entry.weight for entry in entries]
+        )[0]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _find_first(self, position_hash: int) -> int:
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if _KEY.unpack_from(self._map, middle * ENTRY.size)[0] < position_hash:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class BookBuilder:
+    # Counts the moves of the first plies of games. Only the counts are kept,
+    # so the games can be streamed from a PGN file of any size.
+
+    def __init__(self, max_ply: int = DEFAULT_MAX_PLY):
+        self.max_ply = max_ply
+        self._weights: DefaultDict[Tuple[int, int], int] = defaultdict(int)
+
+    def add_game(self, game: pgn.PgnGame):
+        # Raises on the first move that cannot be decoded, after adding the
+        # moves before it.
+        for ply, (played_game, move) in enumerate(pgn.iterate_moves(game)):
+            if ply >= self.max_ply:
+                break
+            weight = _get_weight(game.result, played_game.in_turn)
+            if weight:
+                self._weights[(played_game.hash, encode_move(move))] += weight
+
+    def iterate_entries(self) -> Iterator[Tuple[int, int, int]]:
+        # Sorted (key, move, weight) tuples. Weights are scaled down together
+        # if the largest does not fit into an entry.
+        scale = max(1, -(-max(self._weights.values(), default=0) // MAX_WEIGHT))
+        for (key, move), weight in sorted(self._weights.items()):
+            yield key, move, max(1, weight // scale)
+
+    def write(self, path: str):
+        # Replaces the file in one step, so that processes that have mapped an
+        # older book keep reading a complete file.
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as book_file:
+            for key, move, weight in self.iterate_entries():
+                book_file.write(ENTRY.pack(key, move, weight, 0))
+        os.replace(temporary_path, path)
+
+
+def encode_move(move: engine.Move) -> int:
+    # Polyglot move encoding: bits 0-5 are the target square and bits 6-11 the
+    # source square, both numbered rank by rank from a1 like square indexes.
+    return engine.get_square_index(move.source) << 6 | engine.get_square_index(
+        move.target
+    )
+
+
+def decode_move(encoded_move: int) -> engine.Move:
+    return engine.Move(
+        engine.get_position(encoded_move >> 6 & 0x3F),
+        engine.get_position(encoded_move & 0x3F),
+    )
+
+
+def _get_weight(result: str, in_turn: engine.Colour) -> int:
+    if result == "1/2-1/2" or result == "*":
+        return DRAW_WEIGHT
+    winner = engine.Colour.WHITE if result == "1-0" else engine.Colour.BLACK
+    return WIN_WEIGHT if winner == in_turn else 0
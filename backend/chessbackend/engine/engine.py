@@ -1,9 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import NamedTuple, Tuple, Optional, Type
+from typing import NamedTuple, Tuple, Optional, Type, Iterable, Iterator, List, Dict
 import enum
 import copy
 
-
 BOARD_SIZE = 8
 
 
@@ -29,29 +28,80 @@ class Move(NamedTuple):
     target: Position
 
 
+# Every kind of figure has an integer code, which indexes the tables of the
+# other modules (evaluation, hashing, packing, ...) instead of its name.
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+FIGURE_NAMES = ("Pawn", "Knight", "Bishop", "Rook", "Queen", "King")
+FIGURE_CODES = {name: code for code, name in enumerate(FIGURE_NAMES)}
+
+
+class GameStatus(NamedTuple):
+    check: bool
+    checkmate: bool
+    stalemate: bool
+
+
+ORTHOGONAL_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+KNIGHT_OFFSETS = (
+    (1, 2),
+    (2, 1),
+    (2, -1),
+    (1, -2),
+    (-1, -2),
+    (-2, -1),
+    (-2, 1),
+    (-1, 2),
+)
+KING_OFFSETS = ORTHOGONAL_DIRECTIONS + DIAGONAL_DIRECTIONS
+
+
 class Movement(ABC):
     @abstractmethod
-    def is_move_possible(self, move: Move, figures: Tuple["Figure", ...]) -> bool:
+    def is_move_possible(self, move: Move, board: "Board") -> bool:
         pass
 
-    def execute_move(
-        self, move: Move, figures: Tuple["Figure", ...]
-    ) -> Tuple["Figure", ...]:
-        figure = get_figure_at_position(figures, move.source)
+    @abstractmethod
+    def get_possible_moves(self, source: Position, board: "Board") -> Tuple[Move, ...]:
+        # Generates the candidate moves of this movement directly, instead of
+        # testing every field of the board with `is_move_possible`.
+        pass
+
+    def get_possible_captures(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Move, ...]:
+        # Only the moves that beat a figure. Movements override this where
+        # captures can be found without generating all moves.
+        return tuple(
+            move
+            for move in self.get_possible_moves(source, board)
+            if board.get(move.target) is not None
+        )
+
+    @abstractmethod
+    def get_attacked_positions(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Position, ...]:
+        # Fields that a figure of the opposite colour could be beaten on,
+        # including fields that are empty or occupied by the own colour.
+        pass
+
+    def execute_move(self, move: Move, board: "Board") -> Tuple["Figure", ...]:
+        figure = board.get(move.source)
         new_figure = copy.copy(figure)
         new_figure.position = move.target
         untouched_figures = tuple(
             fig
-            for fig in figures
+            for fig in board
             if fig.position != move.source and fig.position != move.target
         )
         return untouched_figures + (new_figure,)
 
 
 class PawnCaptureMovement(Movement):
-    def is_move_possible(self, move: Move, figures: Tuple["Figure", ...]) -> bool:
-        source_figure = get_figure_at_position(figures, move.source)
-        target_figure = get_figure_at_position(figures, move.target)
+    def is_move_possible(self, move: Move, board: "Board") -> bool:
+        source_figure = board.get(move.source)
+        target_figure = board.get(move.target)
 
         # Must capture something.
         if not target_figure:
@@ -68,11 +118,38 @@ class PawnCaptureMovement(Movement):
         move_one_field_to_side = x_diff == 1
         return moves_one_field_forward and move_one_field_to_side
 
+    def get_possible_moves(self, source: Position, board: "Board") -> Tuple[Move, ...]:
+        source_figure = board.get(source)
+        allowed_direction = 1 if source_figure.colour == Colour.WHITE else -1
+        possible_moves = []
+        for x_offset in (-1, 1):
+            target = Position(source.x + x_offset, source.y + allowed_direction)
+            if not is_on_board(target):
+                continue
+            target_figure = board.get(target)
+            if target_figure and target_figure.colour != source_figure.colour:
+                possible_moves.append(Move(source, target))
+        return tuple(possible_moves)
+
+    def get_possible_captures(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Move, ...]:
+        return self.get_possible_moves(source, board)
+
+    def get_attacked_positions(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Position, ...]:
+        source_figure = board.get(source)
+        allowed_direction = 1 if source_figure.colour == Colour.WHITE else -1
+        return _get_stepping_attacked_positions(
+            source, ((-1, allowed_direction), (1, allowed_direction))
+        )
+
 
 class PawnForwardMovement(Movement):
-    def is_move_possible(self, move: Move, figures: Tuple["Figure", ...]) -> bool:
-        source_figure = get_figure_at_position(figures, move.source)
-        target_figure = get_figure_at_position(figures, move.target)
+    def is_move_possible(self, move: Move, board: "Board") -> bool:
+        source_figure = board.get(move.source)
+        target_figure = board.get(move.target)
 
         # Cannot beat figure of same colour.
         if target_figure is not None:
@@ -88,25 +165,54 @@ class PawnForwardMovement(Movement):
 
         # White moves two field foward from start.
         if source_figure.colour == Colour.WHITE:
-            jump_over_field_is_free = (
-                get_figure_at_position(figures, Position(move.source.x, 2)) is None
-            )
+            jump_over_field_is_free = board.get(Position(move.source.x, 2)) is None
             return move.source.y == 1 and move.target.y == 3 and jump_over_field_is_free
 
         # White moves two field foward from start.
         if source_figure.colour == Colour.BLACK:
-            jump_over_field_is_free = (
-                get_figure_at_position(figures, Position(move.source.x, 5)) is None
-            )
+            jump_over_field_is_free = board.get(Position(move.source.x, 5)) is None
             return move.source.y == 6 and move.target.y == 4 and jump_over_field_is_free
 
         return False
 
+    def get_possible_moves(self, source: Position, board: "Board") -> Tuple[Move, ...]:
+        source_figure = board.get(source)
+        if source_figure.colour == Colour.WHITE:
+            allowed_direction, start_y = 1, 1
+        else:
+            allowed_direction, start_y = -1, 6
+
+        one_field_forward = Position(source.x, source.y + allowed_direction)
+        if not is_on_board(one_field_forward):
+            return tuple()
+        if board.get(one_field_forward) is not None:
+            return tuple()
+        possible_moves = [Move(source, one_field_forward)]
+
+        # Move two fields forward from start.
+        if source.y == start_y:
+            two_fields_forward = Position(source.x, source.y + 2 * allowed_direction)
+            if board.get(two_fields_forward) is None:
+                possible_moves.append(Move(source, two_fields_forward))
+        return tuple(possible_moves)
+
+    def get_possible_captures(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Move, ...]:
+        # Pawns cannot beat figures by moving forward.
+        return tuple()
+
+    def get_attacked_positions(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Position, ...]:
+        # Pawns cannot beat figures by moving forward.
+        return tuple()
+
 
 class LinearMovement(Movement):
-    def is_move_possible(self, move: Move, figures: Tuple["Figure", ...]) -> bool:
-        source_figure = get_figure_at_position(figures, move.source)
-        target_figure = get_figure_at_position(figures, move.target)
+    def is_move_possible(self, move: Move, board: "Board") -> bool:
+        source_figure = board.get(move.source)
+        target_figure = board.get(move.target)
 
         # Cannot beat figure of same colour.
         if target_figure and target_figure.colour == source_figure.colour:
@@ -119,10 +225,7 @@ class LinearMovement(Movement):
         if vertical_move:
             y_values = (move.source.y, move.target.y)
             for y in range(min(y_values) + 1, max(y_values)):
-                if (
-                    get_figure_at_position(figures, Position(move.source.x, y))
-                    is not None
-                ):
+                if board.get(Position(move.source.x, y)) is not None:
                     return False
             return True
 
@@ -133,20 +236,30 @@ class LinearMovement(Movement):
         if horizontal_move:
             x_values = (move.source.x, move.target.x)
             for x in range(min(x_values) + 1, max(x_values)):
-                if (
-                    get_figure_at_position(figures, Position(x, move.source.y))
-                    is not None
-                ):
+                if board.get(Position(x, move.source.y)) is not None:
                     return False
             return True
 
         return False
 
+    def get_possible_moves(self, source: Position, board: "Board") -> Tuple[Move, ...]:
+        return _get_sliding_moves(source, ORTHOGONAL_DIRECTIONS, board)
+
+    def get_possible_captures(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Move, ...]:
+        return _get_sliding_captures(source, ORTHOGONAL_DIRECTIONS, board)
+
+    def get_attacked_positions(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Position, ...]:
+        return _get_sliding_attacked_positions(source, ORTHOGONAL_DIRECTIONS, board)
+
 
 class KingRegularMovement(Movement):
-    def is_move_possible(self, move: Move, figures: Tuple["Figure", ...]) -> bool:
-        source_figure = get_figure_at_position(figures, move.source)
-        target_figure = get_figure_at_position(figures, move.target)
+    def is_move_possible(self, move: Move, board: "Board") -> bool:
+        source_figure = board.get(move.source)
+        target_figure = board.get(move.target)
 
         # Cannot beat figure of same colour.
         if target_figure and target_figure.colour == source_figure.colour:
@@ -157,11 +270,24 @@ class KingRegularMovement(Movement):
         did_move = x_diff > 0 or y_diff > 0
         return did_move and x_diff <= 1 and y_diff <= 1
 
+    def get_possible_moves(self, source: Position, board: "Board") -> Tuple[Move, ...]:
+        return _get_stepping_moves(source, KING_OFFSETS, board)
+
+    def get_possible_captures(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Move, ...]:
+        return _get_stepping_captures(source, KING_OFFSETS, board)
+
+    def get_attacked_positions(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Position, ...]:
+        return _get_stepping_attacked_positions(source, KING_OFFSETS)
+
 
 class DiagonalMovement(Movement):
-    def is_move_possible(self, move: Move, figures: Tuple["Figure", ...]) -> bool:
-        source_figure = get_figure_at_position(figures, move.source)
-        target_figure = get_figure_at_position(figures, move.target)
+    def is_move_possible(self, move: Move, board: "Board") -> bool:
+        source_figure = board.get(move.source)
+        target_figure = board.get(move.target)
 
         # Cannot beat figure of same colour.
         if target_figure and target_figure.colour == source_figure.colour:
@@ -181,16 +307,29 @@ class DiagonalMovement(Movement):
         # Path must be free.
         x_range = _get_exclusive_range(move.source.x, move.target.x)
         y_range = _get_exclusive_range(move.source.y, move.target.y)
-        for (x, y) in zip(x_range, y_range):
-            if get_figure_at_position(figures, Position(x, y)) is not None:
+        for x, y in zip(x_range, y_range):
+            if board.get(Position(x, y)) is not None:
                 return False
         return True
 
+    def get_possible_moves(self, source: Position, board: "Board") -> Tuple[Move, ...]:
+        return _get_sliding_moves(source, DIAGONAL_DIRECTIONS, board)
+
+    def get_possible_captures(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Move, ...]:
+        return _get_sliding_captures(source, DIAGONAL_DIRECTIONS, board)
+
+    def get_attacked_positions(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Position, ...]:
+        return _get_sliding_attacked_positions(source, DIAGONAL_DIRECTIONS, board)
+
 
 class KnightMovement(Movement):
-    def is_move_possible(self, move: Move, figures: Tuple["Figure", ...]) -> bool:
-        source_figure = get_figure_at_position(figures, move.source)
-        target_figure = get_figure_at_position(figures, move.target)
+    def is_move_possible(self, move: Move, board: "Board") -> bool:
+        source_figure = board.get(move.source)
+        target_figure = board.get(move.target)
 
         # Cannot beat figure of same colour.
         if target_figure and target_figure.colour == source_figure.colour:
@@ -200,6 +339,19 @@ class KnightMovement(Movement):
         y_diff = abs(move.target.y - move.source.y)
         return x_diff == 2 and y_diff == 1 or x_diff == 1 and y_diff == 2
 
+    def get_possible_moves(self, source: Position, board: "Board") -> Tuple[Move, ...]:
+        return _get_stepping_moves(source, KNIGHT_OFFSETS, board)
+
+    def get_possible_captures(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Move, ...]:
+        return _get_stepping_captures(source, KNIGHT_OFFSETS, board)
+
+    def get_attacked_positions(
+        self, source: Position, board: "Board"
+    ) -> Tuple[Position, ...]:
+        return _get_stepping_attacked_positions(source, KNIGHT_OFFSETS)
+
 
 class Figure:
     def __init__(
@@ -213,44 +365,94 @@ class Figure:
         self.position = position
         self._movements = movements
         self.name = name
+        self.code = FIGURE_CODES[name]
 
-    def is_move_possible(self, move: Move, figures: Tuple["Figure", ...]) -> bool:
+    def is_move_possible(self, move: Move, board: "Board") -> bool:
         return any(
-            movement.is_move_possible(move, figures) for movement in self._movements
+            movement.is_move_possible(move, board) for movement in self._movements
         )
 
-    def execute_move(
-        self, move: Move, figures: Tuple["Figure", ...]
-    ) -> Tuple["Figure", ...]:
+    def execute_move(self, move: Move, board: "Board") -> Tuple["Figure", ...]:
         possible_movement = None
         for movement in self._movements:
-            if movement.is_move_possible(move, figures):
+            if movement.is_move_possible(move, board):
                 possible_movement = movement
         assert possible_movement is not None
-        return possible_movement.execute_move(move, figures)
-
-    def get_all_possible_moves(self, figures: Tuple["Figure", ...]) -> Tuple[Move, ...]:
-        # Brute force approach trying if moving to every field is possible,
-        # could technically be optimized.
+        return possible_movement.execute_move(move, board)
 
+    def get_all_possible_moves(self, board: "Board") -> Tuple[Move, ...]:
         possible_moves = []
+        for movement in self._movements:
+            possible_moves.extend(movement.get_possible_moves(self.position, board))
+        return tuple(possible_moves)
 
-        for x in range(BOARD_SIZE):
-            for y in range(BOARD_SIZE):
-                target_position = Position(x, y)
-                move = Move(self.position, target_position)
-                if self.is_move_possible(move, figures):
-                    possible_moves.append(move)
+    def get_all_possible_captures(self, board: "Board") -> Tuple[Move, ...]:
+        possible_captures = []
+        for movement in self._movements:
+            possible_captures.extend(
+                movement.get_possible_captures(self.position, board)
+            )
+        return tuple(possible_captures)
 
-        return tuple(possible_moves)
+    def get_attacked_positions(self, board: "Board") -> Tuple[Position, ...]:
+        attacked_positions = []
+        for movement in self._movements:
+            attacked_positions.extend(
+                movement.get_attacked_positions(self.position, board)
+            )
+        return tuple(attacked_positions)
 
-    def can_do_some_move(self, figures: Tuple["Figure", ...]) -> bool:
-        return len(self.get_all_possible_moves(figures)) > 0
+    def can_do_some_move(self, board: "Board") -> bool:
+        return len(self.get_all_possible_moves(board)) > 0
 
     def __copy__(self):
         return Figure(self.colour, self.position, self._movements, self.name)
 
 
+class Board:
+    # Mailbox with one slot per field, so finding the figure on a field is an
+    # index lookup instead of a scan over all figures.
+
+    def __init__(self, figures: Iterable[Figure] = ()):
+        self._squares: List[Optional[Figure]] = [None] * (BOARD_SIZE * BOARD_SIZE)
+        self._kings: Dict[Colour, Figure] = {}
+        self._figure_count = 0
+        for figure in figures:
+            self.place(figure)
+
+    def get(self, position: Position) -> Optional[Figure]:
+        if not is_on_board(position):
+            return None
+        return self._squares[get_square_index(position)]
+
+    def get_king(self, colour: Colour) -> Optional[Figure]:
+        return self._kings.get(colour)
+
+    def place(self, figure: Figure):
+        self.remove(figure.position)
+        self._squares[get_square_index(figure.position)] = figure
+        self._figure_count += 1
+        if figure.code == KING:
+            self._kings[figure.colour] = figure
+
+    def remove(self, position: Position) -> Optional[Figure]:
+        square_index = get_square_index(position)
+        figure = self._squares[square_index]
+        if figure is None:
+            return None
+        self._squares[square_index] = None
+        self._figure_count -= 1
+        if self._kings.get(figure.colour) is figure:
+            del self._kings[figure.colour]
+        return figure
+
+    def __iter__(self) -> Iterator[Figure]:
+        return (figure for figure in self._squares if figure is not None)
+
+    def __len__(self) -> int:
+        return self._figure_count
+
+
 class FigureFactory:
     def create(
         self,
@@ -262,33 +464,50 @@ class FigureFactory:
         return Figure(colour, position, movements, name)
 
 
+# Movements have no state, so all figures of a kind share the same movements.
+QUEEN_MOVEMENTS = (LinearMovement(), DiagonalMovement())
+ROOK_MOVEMENTS = (LinearMovement(),)
+BISHOP_MOVEMENTS = (DiagonalMovement(),)
+KNIGHT_MOVEMENTS = (KnightMovement(),)
+KING_MOVEMENTS = (KingRegularMovement(),)
+PAWN_MOVEMENTS = (PawnForwardMovement(), PawnCaptureMovement())
+# By figure code.
+FIGURE_MOVEMENTS = (
+    PAWN_MOVEMENTS,
+    KNIGHT_MOVEMENTS,
+    BISHOP_MOVEMENTS,
+    ROOK_MOVEMENTS,
+    QUEEN_MOVEMENTS,
+    KING_MOVEMENTS,
+)
+
+
 class FigureBuilder:
     def __init__(self, figure_factory: Type[FigureFactory]):
         self.figure_factory = figure_factory
 
+    def build(self, code: int, colour: Colour, position: Position):
+        return self.figure_factory.create(
+            colour, position, FIGURE_MOVEMENTS[code], FIGURE_NAMES[code]
+        )
+
     def build_queen(self, colour: Colour, position: Position):
-        movements = (LinearMovement(), DiagonalMovement())
-        return self.figure_factory.create(colour, position, movements, "Queen")
+        return self.figure_factory.create(colour, position, QUEEN_MOVEMENTS, "Queen")
 
     def build_rook(self, colour: Colour, position: Position):
-        movements = (LinearMovement(),)
-        return self.figure_factory.create(colour, position, movements, "Rook")
+        return self.figure_factory.create(colour, position, ROOK_MOVEMENTS, "Rook")
 
     def build_bishop(self, colour: Colour, position: Position):
-        movements = (DiagonalMovement(),)
-        return self.figure_factory.create(colour, position, movements, "Bishop")
+        return self.figure_factory.create(colour, position, BISHOP_MOVEMENTS, "Bishop")
 
     def build_knight(self, colour: Colour, position: Position):
-        movements = (KnightMovement(),)
-        return self.figure_factory.create(colour, position, movements, "Knight")
+        return self.figure_factory.create(colour, position, KNIGHT_MOVEMENTS, "Knight")
 
     def build_king(self, colour: Colour, position: Position):
-        movements = (KingRegularMovement(),)
-        return self.figure_factory.create(colour, position, movements, "King")
+        return self.figure_factory.create(colour, position, KING_MOVEMENTS, "King")
 
     def build_pawn(self, colour: Colour, position: Position):
-        movements = (PawnForwardMovement(), PawnCaptureMovement())
-        return self.figure_factory.create(colour, position, movements, "Pawn")
+        return self.figure_factory.create(colour, position, PAWN_MOVEMENTS, "Pawn")
 
 
 def get_figure_at_position(
@@ -334,6 +553,118 @@ def build_default_figures(figure_builder: FigureBuilder) -> Tuple[Figure, ...]:
     return tuple(figures)
 
 
+def is_on_board(position: Position) -> bool:
+    return 0 <= position.x < BOARD_SIZE and 0 <= position.y < BOARD_SIZE
+
+
+def get_square_index(position: Position) -> int:
+    return position.y * BOARD_SIZE + position.x
+
+
+def get_position(square_index: int) -> Position:
+    return Position(square_index % BOARD_SIZE, square_index // BOARD_SIZE)
+
+
+def get_field_name(position: Position) -> str:
+    # The name of the field in chess notation, e.g. "e2".
+    return f"{chr(ord('a') + position.x)}{position.y + 1}"
+
+
+def parse_field_name(field_name: str) -> Position:
+    return Position(ord(field_name[0]) - ord("a"), int(field_name[1]) - 1)
+
+
+def _get_sliding_moves(
+    source: Position, directions: Tuple[Tuple[int, int], ...], board: "Board"
+) -> Tuple[Move, ...]:
+    # Walks every ray until the board edge or the first figure. A figure of the
+    # opposite colour can be beaten, so its field is still a valid target.
+    source_figure = board.get(source)
+    possible_moves = []
+    for x_step, y_step in directions:
+        target = Position(source.x + x_step, source.y + y_step)
+        while is_on_board(target):
+            target_figure = board.get(target)
+            if target_figure is None:
+                possible_moves.append(Move(source, target))
+            else:
+                if target_figure.colour != source_figure.colour:
+                    possible_moves.append(Move(source, target))
+                break
+            target = Position(target.x + x_step, target.y + y_step)
+    return tuple(possible_moves)
+
+
+def _get_stepping_moves(
+    source: Position, offsets: Tuple[Tuple[int, int], ...], board: "Board"
+) -> Tuple[Move, ...]:
+    source_figure = board.get(source)
+    possible_moves = []
+    for x_offset, y_offset in offsets:
+        target = Position(source.x + x_offset, source.y + y_offset)
+        if not is_on_board(target):
+            continue
+        target_figure = board.get(target)
+        if target_figure is None or target_figure.colour != source_figure.colour:
+            possible_moves.append(Move(source, target))
+    return tuple(possible_moves)
+
+
+def _get_sliding_captures(
+    source: Position, directions: Tuple[Tuple[int, int], ...], board: "Board"
+) -> Tuple[Move, ...]:
+    # Like `_get_sliding_moves`, but only the first figure on each ray matters.
+    source_figure = board.get(source)
+    possible_captures = []
+    for x_step, y_step in directions:
+        target = Position(source.x + x_step, source.y + y_step)
+        while is_on_board(target):
+            target_figure = board.get(target)
+            if target_figure is not None:
+                if target_figure.colour != source_figure.colour:
+                    possible_captures.append(Move(source, target))
+                break
+            target = Position(target.x + x_step, target.y + y_step)
+    return tuple(possible_captures)
+
+
+def _get_stepping_captures(
+    source: Position, offsets: Tuple[Tuple[int, int], ...], board: "Board"
+) -> Tuple[Move, ...]:
+    source_figure = board.get(source)
+    possible_captures = []
+    for x_offset, y_offset in offsets:
+        target_figure = board.get(Position(source.x + x_offset, source.y + y_offset))
+        if target_figure is not None and target_figure.colour != source_figure.colour:
+            possible_captures.append(Move(source, target_figure.position))
+    return tuple(possible_captures)
+
+
+def _get_sliding_attacked_positions(
+    source: Position, directions: Tuple[Tuple[int, int], ...], board: "Board"
+) -> Tuple[Position, ...]:
+    attacked_positions = []
+    for x_step, y_step in directions:
+        target = Position(source.x + x_step, source.y + y_step)
+        while is_on_board(target):
+            attacked_positions.append(target)
+            if board.get(target) is not None:
+                break
+            target = Position(target.x + x_step, target.y + y_step)
+    return tuple(attacked_positions)
+
+
+def _get_stepping_attacked_positions(
+    source: Position, offsets: Tuple[Tuple[int, int], ...]
+) -> Tuple[Position, ...]:
+    attacked_positions = []
+    for x_offset, y_offset in offsets:
+        target = Position(source.x + x_offset, source.y + y_offset)
+        if is_on_board(target):
+            attacked_positions.append(target)
+    return tuple(attacked_positions)
+
+
 def _get_exclusive_range(start: int, end: int):
     # TODO: rename
     if start < end:
@@ -0,0 +1,179 @@
+from typing import Tuple
+from chessbackend.engine import engine
+
+# Tables are indexed by figure code, so that evaluating a move is a few list
+# lookups instead of comparing figure names.
+COLOUR_CODES = {engine.Colour.WHITE: 0, engine.Colour.BLACK: 1}
+
+FIGURE_VALUES = (100, 320, 330, 500, 900, 0)
+
+# How much each figure counts towards the middlegame. With all figures on the
+# board the phase is `MAX_PHASE`, with only kings and pawns it is 0.
+PHASE_WEIGHTS = (0, 1, 1, 2, 4, 0)
+MAX_PHASE = 24
+
+# Piece-square tables from white's point of view, written as the board is seen
+# by white: the first row is the eighth rank (y = 7), the last the first rank.
+# fmt: off
+PAWN_TABLE = (
+    0,  0,  0,  0,  0,  0,  0,  0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5,  5, 10, 25, 25, 10,  5,  5,
+    0,  0,  0, 20, 20,  0,  0,  0,
+    5, -5,-10,  0,  0,-10, -5,  5,
+    5, 10, 10,-20,-20, 10, 10,  5,
+    0,  0,  0,  0,  0,  0,  0,  0,
+)
+KNIGHT_TABLE = (
+    -50,-40,-30,-30,-30,-30,-40,-50,
+    -40,-20,  0,  0,  0,  0,-20,-40,
+    -30,  0, 10, 15, 15, 10,  0,-30,
+    -30,  5, 15, 20, 20, 15,  5,-30,
+    -30,  0, 15, 20, 20, 15,  0,-30,
+    -30,  5, 10, 15, 15, 10,  5,-30,
+    -40,-20,  0,  5,  5,  0,-20,-40,
+    -50,-40,-30,-30,-30,-30,-40,-50,
+)
+BISHOP_TABLE = (
+    -20,-10,-10,-10,-10,-10,-10,-20,
+    -10,  0,  0,  0,  0,  0,  0,-10,
+    -10,  0,  5, 10, 10,  5,  0,-10,
+    -10,  5,  5, 10, 10,  5,  5,-10,
+    -10,  0, 10, 10, 10, 10,  0,-10,
+    -10, 10, 10, 10, 10, 10, 10,-10,
+    -10,  5,  0,  0,  0,  0,  5,-10,
+    -20,-10,-10,-10,-10,-10,-10,-20,
+)
+ROOK_TABLE = (
+    0,  0,  0,  0,  0,  0,  0,  0,
+    5, 10, 10, 10, 10, 10, 10,  5,
+    -5,  0,  0,  0,  0,  0,  0, -5,
+    -5,  0,  0,  0,  0,  0,  0, -5,
+    -5,  0,  0,  0,  0,  0,  0, -5,
+    -5,  0,  0,  0,  0,  0,  0, -5,
+    -5,  0,  0,  0,  0,  0,  0, -5,
+    0,  0,  0,  5,  5,  0,  0,  0,
+)
+QUEEN_TABLE = (
+    -20,-10,-10, -5, -5,-10,-10,-20,
+    -10,  0,  0,  0,  0,  0,  0,-10,
+    -10,  0,  5,  5,  5,  5,  0,-10,
+    -5,  0,  5,  5,  5,  5,  0, -5,
+    0,  0,  5,  5,  5,  5,  0, -5,
+    -10,  5,  5,  5,  5,  5,  0,-10,
+    -10,  0,  5,  0,  0,  0,  0,-10,
+    -20,-10,-10, -5, -5,-10,-10,-20,
+)
+KING_MIDDLEGAME_TABLE = (
+    -30,-40,-40,-50,-50,-40,-40,-30,
+    -30,-40,-40,-50,-50,-40,-40,-30,
+    -30,-40,-40,-50,-50,-40,-40,-30,
+    -30,-40,-40,-50,-50,-40,-40,-30,
+    -20,-30,-30,-40,-40,-30,-30,-20,
+    -10,-20,-20,-20,-20,-20,-20,-10,
+    20, 20,  0,  0,  0,  0, 20, 20,
+    20, 30, 10,  0,  0, 10, 30, 20,
+)
+KING_ENDGAME_TABLE = (
+    -50,-40,-30,-20,-20,-30,-40,-50,
+    -30,-20,-10,  0,  0,-10,-20,-30,
+    -30,-10, 20, 30, 30, 20,-10,-30,
+    -30,-10, 30, 40, 40, 30,-10,-30,
+    -30,-10, 30, 40, 40, 30,-10,-30,
+    -30,-10, 20, 30, 30, 20,-10,-30,
+    -30,-30,  0,  0,  0,  0,-30,-30,
+    -50,-30,-30,-30,-30,-30,-30,-50,
+)
+# fmt: on
+
+MIDDLEGAME_TABLES = (
+    PAWN_TABLE,
+    KNIGHT_TABLE,
+    BISHOP_TABLE,
+    ROOK_TABLE,
+    QUEEN_TABLE,
+    KING_MIDDLEGAME_TABLE,
+)
+ENDGAME_TABLES = MIDDLEGAME_TABLES[: engine.KING] + (KING_ENDGAME_TABLE,)
+
+
+def _build_square_scores(
+    tables: Tuple[Tuple[int, ...], ...],
+) -> Tuple[Tuple[int, ...], ...]:
+    # Figure value plus piece-square bonus, indexed by
+    # `colour code * 6 + figure code` and then by square index.
+    square_scores = []
+    for colour_code in (0, 1):
+        for figure_code, table in enumerate(tables):
+            scores = []
+            for square in range(engine.BOARD_SIZE * engine.BOARD_SIZE):
+                x, y = square % engine.BOARD_SIZE, square // engine.BOARD_SIZE
+                # Black uses the white table mirrored vertically.
+                row = engine.BOARD_SIZE - 1 - y if colour_code == 0 else y
+                scores.append(
+                    FIGURE_VALUES[figure_code] + table[row * engine.BOARD_SIZE + x]
+                )
+            square_scores.append(tuple(scores))
+    return tuple(square_scores)
+
+
+MIDDLEGAME_SQUARE_SCORES = _build_square_scores(MIDDLEGAME_TABLES)
+ENDGAME_SQUARE_SCORES = _build_square_scores(ENDGAME_TABLES)
+
+
+class Evaluation:
+    # Material and piece-square score of a position, updated figure by figure
+    # while moves are applied, so that scoring a position is constant time.
+    # The middlegame and endgame scores are blended by the game phase.
+
+    def __init__(self, figures: Tuple[engine.Figure, ...] = ()):
+        self._middlegame_scores = [0, 0]
+        self._endgame_scores = [0, 0]
+        self._phase = 0
+        for figure in figures:
+            self.add_figure(figure)
+
+    def add_figure(self, figure: engine.Figure):
+        colour_code, middlegame_score, endgame_score, phase = _get_figure_scores(figure)
+        self._middlegame_scores[colour_code] += middlegame_score
+        self._endgame_scores[colour_code] += endgame_score
+        self._phase += phase
+
+    def remove_figure(self, figure: engine.Figure):
+        colour_code, middlegame_score, endgame_score, phase = _get_figure_scores(figure)
+        self._middlegame_scores[colour_code] -= middlegame_score
+        self._endgame_scores[colour_code] -= endgame_score
+        self._phase -= phase
+
+    def get_score(self, colour: engine.Colour) -> int:
+        # Score in centipawns from the point of view of `colour`.
+        colour_code = COLOUR_CODES[colour]
+        middlegame_score = (
+            self._middlegame_scores[colour_code]
+            - self._middlegame_scores[1 - colour_code]
+        )
+        endgame_score = (
+            self._endgame_scores[colour_code] - self._endgame_scores[1 - colour_code]
+        )
+        phase = min(self._phase, MAX_PHASE)
+        return (
+            middlegame_score * phase + endgame_score * (MAX_PHASE - phase)
+        ) // MAX_PHASE
+
+
+def get_figure_value(figure: engine.Figure) -> int:
+    return FIGURE_VALUES[figure.code]
+
+
+def _get_figure_scores(figure: engine.Figure) -> Tuple[int, int, int, int]:
+    colour_code = COLOUR_CODES[figure.colour]
+    figure_code = figure.code
+    table_index = colour_code * 6 + figure_code
+    square = engine.get_square_index(figure.position)
+    return (
+        colour_code,
+        MIDDLEGAME_SQUARE_SCORES[table_index][square],
+        ENDGAME_SQUARE_SCORES[table_index][square],
+        PHASE_WEIGHTS[figure_code],
+    )
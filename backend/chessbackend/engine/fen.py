@@ -0,0 +1,105 @@
+from typing import List, Tuple
+from chessbackend.engine import engine
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Lowercase letters by figure code.
+FIGURE_LETTERS = "pnbrqk"
+FIGURE_CODES_BY_LETTER = {letter: code for code, letter in enumerate(FIGURE_LETTERS)}
+COLOURS_BY_LETTER = {"w": engine.Colour.WHITE, "b": engine.Colour.BLACK}
+LETTERS_BY_COLOUR = {colour: letter for letter, colour in COLOURS_BY_LETTER.items()}
+
+
+class FenError(ValueError):
+    pass
+
+
+def parse_fen(
+    fen: str, figure_builder: engine.FigureBuilder
+) -> Tuple[Tuple[engine.Figure, ...], engine.Colour]:
+    # Returns the figures and the colour in turn. Castling rights, en passant
+    # field and move counters are accepted but ignored, because the engine does
+    # not know these rules.
+    fields = fen.split()
+    if len(fields) < 2:
+        raise FenError(f"Invalid FEN: {fen}")
+    placement, in_turn_letter = fields[0], fields[1]
+
+    ranks = placement.split("/")
+    if len(ranks) != engine.BOARD_SIZE:
+        raise FenError(f"Invalid FEN placement: {placement}")
+    if in_turn_letter not in COLOURS_BY_LETTER:
+        raise FenError(f"Invalid FEN colour in turn: {in_turn_letter}")
+
+    figures = []
+    for rank_index, rank in enumerate(ranks):
+        # FEN lists the eighth rank first.
+        y = engine.BOARD_SIZE - 1 - rank_index
+        x = 0
+        for letter in rank:
+            if letter in "12345678":
+                x += int(letter)
+                continue
+            code = FIGURE_CODES_BY_LETTER.get(letter.lower())
+            if code is None or x >= engine.BOARD_SIZE:
+                raise FenError(f"Invalid FEN rank: {rank}")
+            colour = engine.Colour.WHITE if letter.isupper() else engine.Colour.BLACK
+            figures.append(figure_builder.build(code, colour, engine.Position(x, y)))
+            x += 1
+        if x != engine.BOARD_SIZE:
+            raise FenError(f"Invalid FEN rank: {rank}")
+
+    in_turn = COLOURS_BY_LETTER[in_turn_letter]
+    _check_position(figures, in_turn)
+    return tuple(figures), in_turn
+
+
+def _check_position(figures: List[engine.Figure], in_turn: engine.Colour):
+    # The engine needs exactly one king per colour, and the colour that just
+    # moved cannot have left its king in check.
+    kings = {}
+    for figure in figures:
+        if figure.code == engine.KING:
+            if figure.colour in kings:
+                raise FenError(f"More than one {figure.colour.value} king")
+            kings[figure.colour] = figure
+    for colour in engine.Colour:
+        if colour not in kings:
+            raise FenError(f"No {colour.value} king")
+
+    board = engine.Board(figures)
+    opposite_king = kings[engine.get_opposite_color(in_turn)]
+    for figure in figures:
+        if figure.colour == in_turn and opposite_king.position in (
+            figure.get_attacked_positions(board)
+        ):
+            raise FenError("The colour not in turn is in check")
+
+
+def build_fen(figures: Tuple[engine.Figure, ...], in_turn: engine.Colour) -> str:
+    # Castling rights and en passant field are always empty and the move
+    # counters are not tracked by the engine.
+    letters_by_position = {}
+    for figure in figures:
+        letter = FIGURE_LETTERS[figure.code]
+        if figure.colour == engine.Colour.WHITE:
+            letter = letter.upper()
+        letters_by_position[figure.position] = letter
+
+    ranks = []
+    for y in reversed(range(engine.BOARD_SIZE)):
+        rank = ""
+        empty_fields = 0
+        for x in range(engine.BOARD_SIZE):
+            letter = letters_by_position.get(engine.Position(x, y))
+            if letter is None:
+                empty_fields += 1
+                continue
+            if empty_fields:
+                rank += str(empty_fields)
+                empty_fields = 0
+            rank += letter
+        if empty_fields:
+            rank += str(empty_fields)
+        ranks.append(rank)
+    return f"{'/'.join(ranks)} {LETTERS_BY_COLOUR[in_turn]} - - 0 1"
@@ -1,15 +1,76 @@
-from typing import Tuple, Optional
-from chessbackend.engine import engine
+from typing import NamedTuple, Tuple, List, Optional, FrozenSet, Dict
+from chessbackend.engine import engine, evaluation, fen, zobrist
 import copy
 
 
+class _Undo(NamedTuple):
+    # Everything `Game.pop` needs to take back a move applied by `Game.push`.
+    move: engine.Move
+    captured_figure: Optional[engine.Figure]
+    in_turn: engine.Colour
+    hash: int
+
+
+class _AttackInfo(NamedTuple):
+    # What the opponent of the player in turn does to the player's king, computed
+    # once per position and used to filter moves without trying them out.
+    attacked_positions: FrozenSet[engine.Position]
+    checkers: Tuple[engine.Figure, ...]
+    # Fields a figure other than the king can move to to resolve a single
+    # check (capture the checker or block it), `None` if not in check.
+    check_resolving_positions: Optional[FrozenSet[engine.Position]]
+    # Fields each pinned figure can move to without exposing the king.
+    pin_rays: Dict[engine.Position, FrozenSet[engine.Position]]
+
+
 class Game:
     def __init__(self, figures: Tuple[engine.Figure, ...], in_turn=engine.Colour.WHITE):
-        self.in_turn = in_turn
+        self._in_turn = in_turn
         self.figures = figures
 
+    @property
+    def figures(self) -> Tuple[engine.Figure, ...]:
+        return tuple(self.board)
+
+    @figures.setter
+    def figures(self, figures: Tuple[engine.Figure, ...]):
+        # Moves are applied to the figures in place, so the game works on its
+        # own copies and never changes figures that the caller still holds.
+        self.board = engine.Board(copy.copy(fig) for fig in figures)
+        self._undo_stack: List[_Undo] = []
+        self._attack_info: Optional[_AttackInfo] = None
+        self._status: Optional[engine.GameStatus] = None
+        # Zobrist hash and evaluation of the position, kept up to date by `push`
+        # and `pop`.
+        self.hash = zobrist.compute_hash(self.figures, self._in_turn)
+        self.evaluation = evaluation.Evaluation(self.figures)
+
+    @property
+    def in_turn(self) -> engine.Colour:
+        return self._in_turn
+
+    @in_turn.setter
+    def in_turn(self, in_turn: engine.Colour):
+        self.hash ^= zobrist.get_in_turn_key(self._in_turn)
+        self.hash ^= zobrist.get_in_turn_key(in_turn)
+        self._in_turn = in_turn
+        self._attack_info = None
+        self._status = None
+
+    @classmethod
+    def from_fen(
+        cls, fen_string: str, figure_builder: Optional[engine.FigureBuilder] = None
+    ) -> "Game":
+        if figure_builder is None:
+            figure_builder = engine.FigureBuilder(engine.FigureFactory())
+        figures, in_turn = fen.parse_fen(fen_string, figure_builder)
+        return cls(figures, in_turn)
+
+    def to_fen(self) -> str:
+        return fen.build_fen(self.figures, self.in_turn)
+
     def is_move_possible(self, move: engine.Move) -> bool:
-        figure_to_move = engine.get_figure_at_position(self.figures, move.source)
+        figure_to_move = self.board.get(move.source)
 
         # There must be a figure to move.
         if figure_to_move is None:
@@ -19,87 +80,253 @@ class Game:
         if _is_outside_board(move.target):
             return False
 
-        # Cannot expose own king.
-        game_copy = Game(self.figures, self.in_turn)
-        game_copy._unsafe_make_move(move)
-        if game_copy.is_colour_in_check(self.in_turn):
-            return False
-
         # Player can only move figures of matching color.
         if not figure_to_move.colour == self.in_turn:
             return False
 
-        return figure_to_move.is_move_possible(move, self.figures)
+        if not figure_to_move.is_move_possible(move, self.board):
+            return False
+
+        # Cannot expose own king.
+        return self._is_legal(move, figure_to_move)
 
     def make_move(self, move: engine.Move):
         if not self.is_move_possible(move):
             raise ValueError("Invalid move")
-        self._unsafe_make_move(move)
+        self.push(move)
+
+    def push(self, move: engine.Move):
+        # This applies a move in place without checking for validity first.
+        # This is necessary, because the check for validity needs to move figures to
+        # check if the resulting board would be invalid (e.g. expose own king to check).
+        self._undo_stack.append(
+            _Undo(move, self.board.get(move.target), self._in_turn, self.hash)
+        )
+        figure_to_move = self.board.remove(move.source)
+        self.hash ^= zobrist.get_figure_key(figure_to_move)
+        self.evaluation.remove_figure(figure_to_move)
+        captured_figure = self.board.remove(move.target)
+        if captured_figure is not None:
+            self.hash ^= zobrist.get_figure_key(captured_figure)
+            self.evaluation.remove_figure(captured_figure)
+        figure_to_move.position = move.target
+        self.board.place(figure_to_move)
+        self.hash ^= zobrist.get_figure_key(figure_to_move)
+        self.evaluation.add_figure(figure_to_move)
+        self.hash ^= zobrist.BLACK_IN_TURN_KEY
+        self._in_turn = engine.get_opposite_color(self._in_turn)
+        self._attack_info = None
+        self._status = None
+
+    def pop(self) -> engine.Move:
+        # Takes back the last move applied by `push` and returns it.
+        undo = self._undo_stack.pop()
+        moved_figure = self.board.remove(undo.move.target)
+        self.evaluation.remove_figure(moved_figure)
+        moved_figure.position = undo.move.source
+        self.board.place(moved_figure)
+        self.evaluation.add_figure(moved_figure)
+        if undo.captured_figure is not None:
+            self.board.place(undo.captured_figure)
+            self.evaluation.add_figure(undo.captured_figure)
+        self._in_turn = undo.in_turn
+        self.hash = undo.hash
+        self._attack_info = None
+        self._status = None
+        return undo.move
 
     def get_all_target_positions(
         self, source_position: engine.Position
     ) -> Tuple[engine.Position, ...]:
-        figure_to_move = engine.get_figure_at_position(self.figures, source_position)
-        possible_moves = figure_to_move.get_all_possible_moves(self.figures)
+        figure_to_move = self.board.get(source_position)
+        if figure_to_move.colour != self.in_turn:
+            return tuple()
+        possible_moves = figure_to_move.get_all_possible_moves(self.board)
         return tuple(
-            move.target for move in possible_moves if self.is_move_possible(move)
+            move.target
+            for move in possible_moves
+            if self._is_legal(move, figure_to_move)
         )
 
     def is_check(self) -> bool:
-        king = _find_king(self.figures, self.in_turn)
+        return len(self._get_attack_info().checkers) > 0
+
+    def is_colour_in_check(self, colour: engine.Colour) -> bool:
+        king = self.board.get_king(colour)
 
         # Only for test cases. In practice, both kings must always exist.
         if king is None:
             return False
 
-        for figure in self.figures:
+        for figure in self.board:
             move_to_beat_king = engine.Move(figure.position, king.position)
-            if figure.is_move_possible(move_to_beat_king, self.figures):
+            if figure.is_move_possible(move_to_beat_king, self.board):
                 return True
         return False
 
-    def is_colour_in_check(self, colour: engine.Colour) -> bool:
-        king = _find_king(self.figures, colour)
+    def is_checkmate(self) -> bool:
+        return self.get_status().checkmate
 
-        # Only for test cases. In practice, both kings must always exist.
-        if king is None:
-            return False
+    def is_stalemate(self) -> bool:
+        return self.get_status().stalemate
 
-        for figure in self.figures:
-            move_to_beat_king = engine.Move(figure.position, king.position)
-            if figure.is_move_possible(move_to_beat_king, self.figures):
-                return True
+    def get_status(self) -> engine.GameStatus:
+        # Computed once per position, until the next move is applied.
+        if self._status is None:
+            is_check = self.is_check()
+            has_legal_move = self._has_legal_move()
+            self._status = engine.GameStatus(
+                check=is_check,
+                checkmate=is_check and not has_legal_move,
+                stalemate=not is_check and not has_legal_move,
+            )
+        return self._status
+
+    def get_all_possible_moves(self) -> Tuple[engine.Move, ...]:
+        possible_moves = []
+        for figure in self.board:
+            if figure.colour != self.in_turn:
+                continue
+            for move in figure.get_all_possible_moves(self.board):
+                if self._is_legal(move, figure):
+                    possible_moves.append(move)
+        return tuple(possible_moves)
+
+    def get_all_possible_captures(self) -> Tuple[engine.Move, ...]:
+        possible_captures = []
+        for figure in self.board:
+            if figure.colour != self.in_turn:
+                continue
+            for move in figure.get_all_possible_captures(self.board):
+                if self._is_legal(move, figure):
+                    possible_captures.append(move)
+        return tuple(possible_captures)
+
+    def _has_legal_move(self) -> bool:
+        for figure in self.board:
+            if figure.colour != self.in_turn:
+                continue
+            for move in figure.get_all_possible_moves(self.board):
+                if self._is_legal(move, figure):
+                    return True
         return False
 
-    def is_checkmate(self) -> bool:
-        if not self.is_check():
-            return False
+    def _is_legal(self, move: engine.Move, figure: engine.Figure) -> bool:
+        # Checks if a possible move of the figure in turn does not expose the own
+        # king, using the attack info instead of trying out the move.
+        attack_info = self._get_attack_info()
+        if figure is self.board.get_king(figure.colour):
+            return move.target not in attack_info.attacked_positions
 
-        all_possible_moves = self._get_all_possible_moves()
-        return len(all_possible_moves) == 0
+        # In double check, only the king can move.
+        if len(attack_info.checkers) > 1:
+            return False
 
-    def is_stalemate(self) -> bool:
-        if self.is_check():
+        if (
+            attack_info.check_resolving_positions is not None
+            and move.target not in attack_info.check_resolving_positions
+        ):
             return False
 
-        all_possible_moves = self._get_all_possible_moves()
-        return len(all_possible_moves) == 0
+        pin_ray = attack_info.pin_rays.get(move.source)
+        return pin_ray is None or move.target in pin_ray
 
-    def _get_all_possible_moves(self):
-        possible_figure_moves = []
-        for figure in self.figures:
-            possible_figure_moves.extend(figure.get_all_possible_moves(self.figures))
-        return tuple(
-            move for move in possible_figure_moves if self.is_move_possible(move)
+    def _get_attack_info(self) -> _AttackInfo:
+        if self._attack_info is None:
+            self._attack_info = self._compute_attack_info()
+        return self._attack_info
+
+    def _compute_attack_info(self) -> _AttackInfo:
+        king = self.board.get_king(self.in_turn)
+
+        # Only for test cases. In practice, both kings must always exist.
+        if king is None:
+            return _AttackInfo(frozenset(), tuple(), None, {})
+
+        opponent_figures = tuple(
+            fig for fig in self.board if fig.colour != self.in_turn
         )
 
-    def _unsafe_make_move(self, move: engine.Move):
-        # This applies a move without checking for validity first.
-        # This is necessary, because the check for validity needs to move figures to
-        # check if the resulting board would be invalid (e.g. expose own king to check).
-        figure_to_move = engine.get_figure_at_position(self.figures, move.source)
-        self.figures = figure_to_move.execute_move(move, self.figures)
-        self.in_turn = engine.get_opposite_color(self.in_turn)
+        # The king is taken off the board, so fields behind it on the ray of a
+        # checking figure count as attacked as well.
+        self.board.remove(king.position)
+        attacked_positions = frozenset(
+            position
+            for fig in opponent_figures
+            for position in fig.get_attacked_positions(self.board)
+        )
+        self.board.place(king)
+
+        checkers = tuple(
+            fig
+            for fig in opponent_figures
+            if king.position in fig.get_attacked_positions(self.board)
+        )
+        check_resolving_positions = None
+        if len(checkers) == 1:
+            checker = checkers[0]
+            check_resolving_positions = frozenset(
+                _get_positions_between(king.position, checker.position)
+                + (checker.position,)
+            )
+
+        pin_rays = {}
+        for x_step, y_step in engine.KING_OFFSETS:
+            pin_ray = self._find_pin_ray(king, x_step, y_step)
+            if pin_ray is not None:
+                pinned_position, positions = pin_ray
+                pin_rays[pinned_position] = positions
+
+        return _AttackInfo(
+            attacked_positions, checkers, check_resolving_positions, pin_rays
+        )
+
+    def _find_pin_ray(self, king: engine.Figure, x_step: int, y_step: int):
+        # Walks from the king in one direction. If the first figure is an own one
+        # and the next figure is an opponent attacking the king through it, the
+        # own figure is pinned to the fields up to and including the opponent.
+        pinned_figure = None
+        ray = []
+        position = engine.Position(king.position.x + x_step, king.position.y + y_step)
+        while engine.is_on_board(position):
+            ray.append(position)
+            figure = self.board.get(position)
+            if figure is not None:
+                if figure.colour == king.colour:
+                    if pinned_figure is not None:
+                        return None
+                    pinned_figure = figure
+                else:
+                    if pinned_figure is None:
+                        return None
+                    self.board.remove(pinned_figure.position)
+                    is_pinned = figure.is_move_possible(
+                        engine.Move(figure.position, king.position), self.board
+                    )
+                    self.board.place(pinned_figure)
+                    if not is_pinned:
+                        return None
+                    return pinned_figure.position, frozenset(ray)
+            position = engine.Position(position.x + x_step, position.y + y_step)
+        return None
+
+
+def _get_positions_between(
+    start: engine.Position, end: engine.Position
+) -> Tuple[engine.Position, ...]:
+    # Fields strictly between two fields on a common line, empty if the fields
+    # do not share a line (e.g. for a knight's move).
+    x_diff = end.x - start.x
+    y_diff = end.y - start.y
+    if x_diff != 0 and y_diff != 0 and abs(x_diff) != abs(y_diff):
+        return tuple()
+    steps = max(abs(x_diff), abs(y_diff))
+    x_step = (x_diff > 0) - (x_diff < 0)
+    y_step = (y_diff > 0) - (y_diff < 0)
+    return tuple(
+        engine.Position(start.x + x_step * i, start.y + y_step * i)
+        for i in range(1, steps)
+    )
 
 
 def _is_outside_board(position: engine.Position):
@@ -109,11 +336,3 @@ def _is_outside_board(position: engine.Position):
         or position.x >= engine.BOARD_SIZE
         or position.y >= engine.BOARD_SIZE
     )
-
-
-def _find_king(
-    figures: Tuple[engine.Figure, ...], colour: engine.Colour
-) -> Optional[engine.Figure]:
-    return next(
-        (fig for fig in figures if fig.name == "King" and fig.colour == colour), None
-    )
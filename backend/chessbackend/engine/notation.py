@@ -0,0 +1,108 @@
+from typing import Dict
+from chessbackend.engine import engine, fen
+from chessbackend.engine.game import Game
+import re
+
+# Standard algebraic notation (SAN), e.g. "Nf3", "exd5" or "Rae1+". The engine
+# has no castling, en passant or promotion, so these are not supported.
+
+_SAN_PATTERN = re.compile(
+    r"^(?P<letter>[NBRQK])?(?P<file>[a-h])?(?P<rank>[1-8])?x?(?P<target>[a-h][1-8])$"
+)
+# Check and mate marks and annotations like "!?" are not needed to find a move.
+_SAN_SUFFIX_PATTERN = re.compile(r"[+#!?]+$")
+_CASTLING_PATTERN = re.compile(r"^[O0]-[O0](-[O0])?")
+
+
+class SanError(ValueError):
+    pass
+
+
+def parse_san(game: Game, san: str) -> engine.Move:
+    # Finds the legal move of the colour in turn that `san` stands for. Works
+    # with every game class that has `figures` and `get_all_possible_moves`.
+    stripped_san = _SAN_SUFFIX_PATTERN.sub("", san.strip())
+    if _CASTLING_PATTERN.match(stripped_san):
+        raise SanError(f"Castling is not supported: {san}")
+    if "=" in stripped_san:
+        raise SanError(f"Promotion is not supported: {san}")
+    match = _SAN_PATTERN.match(stripped_san)
+    if match is None:
+        raise SanError(f"Invalid SAN: {san}")
+
+    code = fen.FIGURE_CODES_BY_LETTER[(match["letter"] or "p").lower()]
+    target = engine.parse_field_name(match["target"])
+    source_x = ord(match["file"]) - ord("a") if match["file"] else None
+    source_y = int(match["rank"]) - 1 if match["rank"] else None
+    figures_by_position = _get_figures_by_position(game)
+    candidates = [
+        move
+        for move in game.get_all_possible_moves()
+        if move.target == target
+        and figures_by_position[move.source].code == code
+        and (source_x is None or move.source.x == source_x)
+        and (source_y is None or move.source.y == source_y)
+    ]
+    if len(candidates) != 1:
+        problem = "Ambiguous" if candidates else "Illegal"
+        raise SanError(f"{problem} move: {san}")
+    return candidates[0]
+
+
+def build_san(game: Game, move: engine.Move) -> str:
+    # The SAN of a legal move of the colour in turn. The move is tried out to
+    # add the check or mate mark, so this needs a game with `push` and `pop`.
+    figures_by_position = _get_figures_by_position(game)
+    figure = figures_by_position[move.source]
+    is_capture = move.target in figures_by_position
+    target_name = engine.get_field_name(move.target)
+
+    if figure.code == engine.PAWN:
+        san = target_name
+        if is_capture:
+            san = f"{engine.get_field_name(move.source)[0]}x{san}"
+    else:
+        san = (
+            fen.FIGURE_LETTERS[figure.code].upper()
+            + _get_disambiguation(game, move, figures_by_position)
+            + ("x" if is_capture else "")
+            + target_name
+        )
+
+    game.push(move)
+    try:
+        if game.is_checkmate():
+            san += "#"
+        elif game.is_check():
+            san += "+"
+    finally:
+        game.pop()
+    return san
+
+
+def _get_disambiguation(
+    game: Game,
+    move: engine.Move,
+    figures_by_position: Dict[engine.Position, engine.Figure],
+) -> str:
+    # Other figures of the same kind that can move to the same field.
+    code = figures_by_position[move.source].code
+    rivals = [
+        other_move.source
+        for other_move in game.get_all_possible_moves()
+        if other_move.target == move.target
+        and other_move.source != move.source
+        and figures_by_position[other_move.source].code == code
+    ]
+    if not rivals:
+        return ""
+    source_name = engine.get_field_name(move.source)
+    if all(rival.x != move.source.x for rival in rivals):
+        return source_name[0]
+    if all(rival.y != move.source.y for rival in rivals):
+        return source_name[1]
+    return source_name
+
+
+def _get_figures_by_position(game: Game) -> Dict[engine.Position, engine.Figure]:
+    return {figure.position: figure for figure in game.figures}
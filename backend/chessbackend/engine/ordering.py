@@ -0,0 +1,127 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from chessbackend.engine import engine
+from chessbackend.engine.game import Game
+
+# Rank of the figures for most valuable victim / least valuable attacker, by
+# figure code.
+CAPTURE_RANKS = (1, 2, 3, 4, 5, 6)
+
+TRANSPOSITION_MOVE_SCORE = 1000000
+CAPTURE_SCORE = 100000
+KILLER_MOVE_SCORES = (90000, 80000)
+# History scores are halved when one reaches the limit, so quiet moves never
+# outrank killer moves and old history slowly fades out.
+HISTORY_LIMIT = 50000
+
+_SQUARE_COUNT = engine.BOARD_SIZE * engine.BOARD_SIZE
+
+
+class MoveOrderer(ABC):
+    # Orders the moves of a node before they are searched. The better the first
+    # moves, the more often alpha-beta can cut off the remaining ones.
+
+    def __init__(self):
+        self.ordered_nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    @abstractmethod
+    def order_moves(
+        self,
+        game: Game,
+        moves: Tuple[engine.Move, ...],
+        ply: int,
+        transposition_move: Optional[engine.Move],
+    ) -> Tuple[engine.Move, ...]:
+        pass
+
+    def record_cutoff(
+        self, game: Game, move: engine.Move, depth: int, ply: int, move_index: int
+    ):
+        # Called with the position before `move`, when `move` caused a cutoff
+        # as the `move_index`-th move searched.
+        self.cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+
+    @property
+    def cutoff_rate(self) -> float:
+        return self.cutoffs / self.ordered_nodes if self.ordered_nodes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+
+class HeuristicMoveOrderer(MoveOrderer):
+    # Searches the transposition table move first, then captures by most
+    # valuable victim / least valuable attacker, then the killer moves of the
+    # ply and finally the other quiet moves by their history score.
+
+    def __init__(self, max_ply: int = 128):
+        super().__init__()
+        self._killer_moves: List[List[Optional[engine.Move]]] = [
+            [None, None] for _ in range(max_ply)
+        ]
+        self._history = [0] * (2 * _SQUARE_COUNT * _SQUARE_COUNT)
+
+    def order_moves(
+        self,
+        game: Game,
+        moves: Tuple[engine.Move, ...],
+        ply: int,
+        transposition_move: Optional[engine.Move],
+    ) -> Tuple[engine.Move, ...]:
+        self.ordered_nodes += 1
+        killer_moves = self._get_killer_moves(ply)
+
+        def get_score(move: engine.Move) -> int:
+            if move == transposition_move:
+                return TRANSPOSITION_MOVE_SCORE
+            victim = game.board.get(move.target)
+            if victim is not None:
+                attacker = game.board.get(move.source)
+                return (
+                    CAPTURE_SCORE
+                    + CAPTURE_RANKS[victim.code] * 10
+                    - CAPTURE_RANKS[attacker.code]
+                )
+            if move == killer_moves[0]:
+                return KILLER_MOVE_SCORES[0]
+            if move == killer_moves[1]:
+                return KILLER_MOVE_SCORES[1]
+            return self._history[self._get_history_index(game, move)]
+
+        return tuple(sorted(moves, key=get_score, reverse=True))
+
+    def record_cutoff(
+        self, game: Game, move: engine.Move, depth: int, ply: int, move_index: int
+    ):
+        super().record_cutoff(game, move, depth, ply, move_index)
+
+        # Captures are already ordered well, only quiet moves are remembered.
+        if game.board.get(move.target) is not None:
+            return
+
+        killer_moves = self._get_killer_moves(ply)
+        if killer_moves[0] != move:
+            killer_moves[1] = killer_moves[0]
+            killer_moves[0] = move
+
+        history_index = self._get_history_index(game, move)
+        self._history[history_index] += depth * depth
+        if self._history[history_index] >= HISTORY_LIMIT:
+            self._history = [score // 2 for score in self._history]
+
+    def _get_killer_moves(self, ply: int) -> List[Optional[engine.Move]]:
+        if ply >= len(self._killer_moves):
+            return [None, None]
+        return self._killer_moves[ply]
+
+    @staticmethod
+    def _get_history_index(game: Game, move: engine.Move) -> int:
+        colour_index = 0 if game.in_turn == engine.Colour.WHITE else 1
+        return (
+            colour_index * _SQUARE_COUNT + engine.get_square_index(move.source)
+        ) * _SQUARE_COUNT + engine.get_square_index(move.target)
@@ -0,0 +1,49 @@
+from typing import Tuple
+from chessbackend.engine import engine
+
+# A position packed into `PACKED_SIZE` bytes: one byte per field in square
+# index order, followed by one byte for the colour in turn. An empty field is
+# 0, a figure is `colour code * 6 + figure code + 1`.
+
+COLOURS = (engine.Colour.WHITE, engine.Colour.BLACK)
+COLOUR_CODES = {colour: code for code, colour in enumerate(COLOURS)}
+
+SQUARE_COUNT = engine.BOARD_SIZE * engine.BOARD_SIZE
+PACKED_SIZE = SQUARE_COUNT + 1
+
+
+class PackingError(ValueError):
+    pass
+
+
+def pack_position(figures: Tuple[engine.Figure, ...], in_turn: engine.Colour) -> bytes:
+    packed = bytearray(PACKED_SIZE)
+    for figure in figures:
+        packed[engine.get_square_index(figure.position)] = (
+            COLOUR_CODES[figure.colour] * 6 + figure.code + 1
+        )
+    packed[SQUARE_COUNT] = COLOUR_CODES[in_turn]
+    return bytes(packed)
+
+
+def unpack_position(
+    packed: bytes, figure_builder: engine.FigureBuilder
+) -> Tuple[Tuple[engine.Figure, ...], engine.Colour]:
+    # Returns the figures in square index order and the colour in turn.
+    if len(packed) != PACKED_SIZE or packed[SQUARE_COUNT] >= len(COLOURS):
+        raise PackingError("Invalid packed position")
+
+    figures = []
+    for square in range(SQUARE_COUNT):
+        code = packed[square]
+        if not code:
+            continue
+        if code > len(COLOURS) * 6:
+            raise PackingError(f"Invalid figure code {code} on square {square}")
+        colour_code, figure_code = divmod(code - 1, 6)
+        figures.append(
+            figure_builder.build(
+                figure_code, COLOURS[colour_code], engine.get_position(square)
+            )
+        )
+    return tuple(figures), COLOURS[packed[SQUARE_COUNT]]
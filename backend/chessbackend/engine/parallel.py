@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional, Tuple
+from chessbackend.engine import engine, packing, search, transposition
+from chessbackend.engine.game import Game
+import multiprocessing
+import os
+import time
+
+# Lazy SMP: every worker process searches the same position with iterative
+# deepening, and all of them share one transposition table in shared memory.
+# The workers do not coordinate otherwise. What one worker stores in the table
+# cuts off parts of the tree for the others, and every other helper starts one
+# depth deeper than the main worker, so it fills the table ahead of it.
+
+
+class ParallelSearchResult(NamedTuple):
+    # Result of the worker that completed the deepest iteration, the main
+    # worker on ties, with the nodes of all workers.
+    result: search.SearchResult
+    worker_nodes: Tuple[int, ...]
+    worker_depths: Tuple[int, ...]
+    seconds: float
+
+
+class ParallelSearcher:
+    # Keeps its worker processes and the shared table between searches, like a
+    # `search.Searcher` that is passed the same table for every move of a game.
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        memory_limit: int = transposition.DEFAULT_MEMORY_LIMIT,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self._table_buffer = multiprocessing.RawArray(
+            "B", transposition.get_buffer_size(memory_limit)
+        )
+        # The table as seen from this process, e.g. to inspect or clear it.
+        self.transposition_table = transposition.TranspositionTable(
+            memory_limit, memoryview(self._table_buffer).cast("B")
+        )
+        self._stop_flag = multiprocessing.RawValue("b", 0)
+        self._executor = ProcessPoolExecutor(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(self._table_buffer, self._stop_flag, memory_limit),
+        )
+
+    def search(
+        self,
+        game: Game,
+        max_depth: int = search.MAX_DEPTH,
+        time_limit: Optional[float] = None,
+        node_limit: Optional[int] = None,
+    ) -> ParallelSearchResult:
+        # `node_limit` applies to every worker on its own.
+        packed_position = packing.pack_position(game.figures, game.in_turn)
+        self._stop_flag.value = 0
+        start = time.monotonic()
+        futures = [
+            self._executor.submit(
+                _search_worker,
+                packed_position,
+                worker,
+                max_depth,
+                time_limit,
+                node_limit,
+            )
+            for worker in range(self.workers)
+        ]
+        main_result = futures[0].result()
+        # The helpers only help while the main worker searches.
+        self._stop_flag.value = 1
+        results = [main_result] + [future.result() for future in futures[1:]]
+        seconds = time.monotonic() - start
+
+        best_result = max(results, key=lambda result: result.depth)
+        worker_nodes = tuple(result.nodes for result in results)
+        return ParallelSearchResult(
+            best_result._replace(nodes=sum(worker_nodes)),
+            worker_nodes,
+            tuple(result.depth for result in results),
+            seconds,
+        )
+
+    def clear(self):
+        self.transposition_table.clear()
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ParallelSearcher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_transposition_table: Optional[transposition.TranspositionTable] = None
+_stop_flag = None
+
+
+def _init_worker(table_buffer, stop_flag, memory_limit: int):
+    global _transposition_table, _stop_flag
+    _transposition_table = transposition.TranspositionTable(
+        memory_limit, memoryview(table_buffer).cast("B")
+    )
+    _stop_flag = stop_flag
+
+
+def _search_worker(
+    packed_position: bytes,
+    worker: int,
+    max_depth: int,
+    time_limit: Optional[float],
+    node_limit: Optional[int],
+) -> search.SearchResult:
+    figure_builder = engine.FigureBuilder(engine.FigureFactory())
+    figures, in_turn = packing.unpack_position(packed_position, figure_builder)
+    return search.Searcher(
+        Game(figures, in_turn),
+        max_depth,
+        time_limit,
+        node_limit,
+        _transposition_table,
+        should_stop=lambda: worker != 0 and _stop_flag.value != 0,
+        min_depth=min(1 + worker % 2, max_depth),
+    ).search()
@@ -0,0 +1,195 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+from chessbackend.engine import engine, fen, notation
+from chessbackend.engine.game import Game
+import re
+
+# Reading and writing games in portable game notation (PGN). Games are read
+# and written one at a time from streams of lines, so databases of any size
+# can be processed without loading them into memory.
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+# Tags every PGN game has, in this order.
+SEVEN_TAG_ROSTER = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+LINE_LENGTH = 80
+
+_TAG_PATTERN = re.compile(r'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]\s*$')
+_TOKEN_PATTERN = re.compile(r"[{};()]|\$\d+|[^\s{};()$]+")
+_MOVE_NUMBER_PATTERN = re.compile(r"^\d+\.+")
+
+
+class PgnError(ValueError):
+    pass
+
+
+class PgnGame(NamedTuple):
+    headers: Dict[str, str]
+    # Moves in SAN, without comments and variations.
+    moves: Tuple[str, ...]
+    result: str = "*"
+
+
+def read_games(lines: Iterable[str]) -> Iterator[PgnGame]:
+    reader = _GameReader()
+    for line in lines:
+        game = reader.read_line(line.rstrip("\r\n"))
+        if game is not None:
+            yield game
+    game = reader.finish()
+    if game is not None:
+        yield game
+
+
+def write_games(games: Iterable[PgnGame], output_file: TextIO):
+    for game in games:
+        output_file.write(format_game(game))
+        output_file.write("\n")
+
+
+def format_game(game: PgnGame) -> str:
+    headers = dict(game.headers)
+    headers["Result"] = game.result
+    tags = list(SEVEN_TAG_ROSTER) + [
+        tag for tag in headers if tag not in SEVEN_TAG_ROSTER
+    ]
+    lines = [f'[{tag} "{_escape(headers.get(tag, "?"))}"]' for tag in tags]
+    lines.append("")
+
+    # The move numbers follow the colour that starts, which a FEN tag can set.
+    first_colour = get_start_game(game).in_turn
+    tokens = []
+    for ply, san in enumerate(game.moves):
+        is_white_move = (ply % 2 == 0) == (first_colour == engine.Colour.WHITE)
+        move_number = (ply + (first_colour == engine.Colour.BLACK)) // 2 + 1
+        if is_white_move:
+            tokens.append(f"{move_number}.")
+        elif ply == 0:
+            tokens.append(f"{move_number}...")
+        tokens.append(san)
+    tokens.append(game.result)
+
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_LENGTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def get_start_game(game: PgnGame) -> Game:
+    return Game.from_fen(game.headers.get("FEN", fen.START_FEN))
+
+
+def iterate_moves(game: PgnGame) -> Iterator[Tuple[Game, engine.Move]]:
+    # Yields the position before each move and the move, then applies it.
+    # The same `Game` is changed in place, so callers must not keep it.
+    played_game = get_start_game(game)
+    for san in game.moves:
+        move = notation.parse_san(played_game, san)
+        yield played_game, move
+        played_game.push(move)
+
+
+def build_pgn_game(
+    start_game: Game,
+    moves: Iterable[engine.Move],
+    headers: Optional[Dict[str, str]] = None,
+    result: str = "*",
+) -> PgnGame:
+    # Records legal moves played from `start_game`, which is not changed.
+    headers = dict(headers or {})
+    start_fen = start_game.to_fen()
+    if start_fen.split()[:2] != fen.START_FEN.split()[:2]:
+        headers["SetUp"] = "1"
+        headers["FEN"] = start_fen
+    played_game = Game(start_game.figures, start_game.in_turn)
+    sans = []
+    for move in moves:
+        if not played_game.is_move_possible(move):
+            raise PgnError(f"Invalid move {move}")
+        sans.append(notation.build_san(played_game, move))
+        played_game.push(move)
+    return PgnGame(headers, tuple(sans), result)
+
+
+class _GameReader:
+    # Parses PGN line by line. Comments and variations can span lines, so the
+    # state between lines is kept here.
+
+    def __init__(self):
+        self._reset()
+
+    def read_line(self, line: str) -> Optional[PgnGame]:
+        # Returns a game when `line` completes it.
+        if self._comment_depth == 0 and self._variation_depth == 0:
+            if line.startswith("%"):
+                return None
+            stripped_line = line.strip()
+            if stripped_line.startswith("["):
+                game = self._finish_moves() if self._moves else None
+                match = _TAG_PATTERN.match(stripped_line)
+                if match is None:
+                    raise PgnError(f"Invalid tag: {line}")
+                self._headers[match[1]] = _unescape(match[2])
+                return game
+
+        self._rest_of_line_comment = False
+        for token in _TOKEN_PATTERN.findall(line):
+            if self._rest_of_line_comment:
+                break
+            game = self._read_token(token)
+            if game is not None:
+                return game
+        return None
+
+    def finish(self) -> Optional[PgnGame]:
+        if self._headers or self._moves:
+            return self._finish_moves()
+        return None
+
+    def _read_token(self, token: str) -> Optional[PgnGame]:
+        if self._comment_depth:
+            if token == "}":
+                self._comment_depth = 0
+            return None
+        if token == "{":
+            self._comment_depth = 1
+        elif token == ";":
+            self._rest_of_line_comment = True
+        elif token == "(":
+            self._variation_depth += 1
+        elif token == ")":
+            self._variation_depth = max(0, self._variation_depth - 1)
+        elif self._variation_depth or token.startswith("$"):
+            pass
+        elif token in RESULTS:
+            self._result = token
+            return self._finish_moves()
+        else:
+            san = _MOVE_NUMBER_PATTERN.sub("", token)
+            if san:
+                self._moves.append(san)
+        return None
+
+    def _finish_moves(self) -> PgnGame:
+        game = PgnGame(self._headers, tuple(self._moves), self._result)
+        self._reset()
+        return game
+
+    def _reset(self):
+        self._headers: Dict[str, str] = {}
+        self._moves: List[str] = []
+        self._result = "*"
+        self._comment_depth = 0
+        self._variation_depth = 0
+        self._rest_of_line_comment = False
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r"\\(.)", r"\1", value)
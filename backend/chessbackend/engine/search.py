@@ -0,0 +1,333 @@
+from typing import Callable, NamedTuple, Optional, Tuple
+from chessbackend.engine import engine
+from chessbackend.engine.game import Game
+from chessbackend.engine import book, evaluation, ordering, tablebase, transposition
+import time
+
+MATE_SCORE = 100000
+INFINITE_SCORE = MATE_SCORE + 1
+MAX_DEPTH = 64
+# Score of a tablebase win, less the plies to the next capture. Far below mate
+# scores, because the way to the mate is not known.
+TABLEBASE_WIN_SCORE = MATE_SCORE // 2
+
+# Quiescence search skips captures that cannot raise the score to alpha even
+# if the captured figure was won for free, with this safety margin.
+DELTA_PRUNING_MARGIN = 200
+
+# Checking the clock on every node would cost more than the search itself.
+_NODES_BETWEEN_BUDGET_CHECKS = 64
+
+
+class SearchResult(NamedTuple):
+    best_move: Optional[engine.Move]
+    # Score in centipawns from the point of view of the colour in turn.
+    score: int
+    principal_variation: Tuple[engine.Move, ...]
+    depth: int
+    nodes: int
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class Searcher:
+    # Negamax alpha-beta search with iterative deepening. The search is stopped
+    # as soon as the time or node budget is used up, and the result of the last
+    # fully searched depth is returned.
+
+    def __init__(
+        self,
+        game: Game,
+        max_depth: int = MAX_DEPTH,
+        time_limit: Optional[float] = None,
+        node_limit: Optional[int] = None,
+        transposition_table: Optional[transposition.TranspositionTable] = None,
+        move_orderer: Optional[ordering.MoveOrderer] = None,
+        quiescence: bool = True,
+        delta_pruning: bool = True,
+        should_stop: Optional[Callable[[], bool]] = None,
+        min_depth: int = 1,
+        endgame_tablebase: Optional[tablebase.Tablebase] = None,
+    ):
+        self.game = game
+        self.max_depth = max_depth
+        # Iterative deepening starts here, e.g. to let parallel searches work
+        # on different depths.
+        self.min_depth = min_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.quiescence = quiescence
+        self.delta_pruning = delta_pruning
+        # Polled together with the clock, e.g. to cancel a search from outside.
+        self.should_stop = should_stop
+        # Endgame positions it covers are not searched, but looked up.
+        self.endgame_tablebase = endgame_tablebase
+        # Pass a table to share it between searches (e.g. the moves of a game).
+        self.transposition_table = (
+            transposition_table
+            if transposition_table is not None
+            else transposition.TranspositionTable()
+        )
+        self.move_orderer = (
+            move_orderer
+            if move_orderer is not None
+            else ordering.HeuristicMoveOrderer(MAX_DEPTH)
+        )
+        self.nodes = 0
+        self._deadline: Optional[float] = None
+
+    def search(self) -> SearchResult:
+        self.nodes = 0
+        if self.time_limit is not None:
+            self._deadline = time.monotonic() + self.time_limit
+
+        possible_moves = self.game.get_all_possible_moves()
+        result = SearchResult(
+            possible_moves[0] if possible_moves else None,
+            self._evaluate_final_position() if not possible_moves else 0,
+            tuple(),
+            0,
+            0,
+        )
+        if len(possible_moves) == 0:
+            return result
+
+        if self.endgame_tablebase is not None:
+            tablebase_move = self.endgame_tablebase.get_best_move(self.game)
+            if tablebase_move is not None:
+                move, tablebase_result = tablebase_move
+                score = tablebase.get_result_score(
+                    tablebase_result, TABLEBASE_WIN_SCORE
+                )
+                return SearchResult(move, score, (move,), 0, 0)
+
+        for depth in range(self.min_depth, self.max_depth + 1):
+            try:
+                score, principal_variation = self._negamax(
+                    depth, 0, -INFINITE_SCORE, INFINITE_SCORE
+                )
+            except _BudgetExceeded:
+                break
+            result = SearchResult(
+                principal_variation[0], score, principal_variation, depth, self.nodes
+            )
+            # No need to search deeper once a forced mate is found.
+            if abs(score) >= MATE_SCORE - MAX_DEPTH:
+                break
+        return result._replace(nodes=self.nodes)
+
+    def _negamax(
+        self, depth: int, ply: int, alpha: int, beta: int
+    ) -> Tuple[int, Tuple[engine.Move, ...]]:
+        if depth == 0:
+            if self.quiescence:
+                return self._quiescence(ply, alpha, beta)
+            self._count_node()
+            return self.evaluate(), tuple()
+        self._count_node()
+
+        if (
+            ply > 0
+            and self.endgame_tablebase is not None
+            and len(self.game.board) <= self.endgame_tablebase.max_pieces
+        ):
+            tablebase_result = self.endgame_tablebase.probe(self.game)
+            if tablebase_result is not None:
+                score = tablebase.get_result_score(
+                    tablebase_result, TABLEBASE_WIN_SCORE - ply
+                )
+                return score, tuple()
+
+        original_alpha = alpha
+        entry = self.transposition_table.get(self.game.hash)
+        transposition_move = None
+        if entry is not None:
+            transposition_move = entry.best_move
+            # The root always searches, so that it has a full principal variation.
+            if ply > 0 and entry.depth >= depth:
+                score = _get_score_from_transposition(entry.score, ply)
+                if (
+                    entry.bound == transposition.EXACT
+                    or entry.bound == transposition.LOWER_BOUND
+                    and score >= beta
+                    or entry.bound == transposition.UPPER_BOUND
+                    and score <= alpha
+                ):
+                    variation = (entry.best_move,) if entry.best_move else tuple()
+                    return score, variation
+
+        possible_moves = self.game.get_all_possible_moves()
+        if len(possible_moves) == 0:
+            return self._evaluate_final_position(ply), tuple()
+
+        possible_moves = self.move_orderer.order_moves(
+            self.game, possible_moves, ply, transposition_move
+        )
+
+        best_score = -INFINITE_SCORE
+        principal_variation: Tuple[engine.Move, ...] = tuple()
+        for move_index, move in enumerate(possible_moves):
+            self.game.push(move)
+            try:
+                score, child_variation = self._negamax(
+                    depth - 1, ply + 1, -beta, -alpha
+                )
+            finally:
+                self.game.pop()
+            score = -score
+
+            if score > best_score:
+                best_score = score
+                principal_variation = (move,) + child_variation
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.move_orderer.record_cutoff(self.game, move, depth, ply, move_index)
+                break
+
+        if best_score <= original_alpha:
+            bound = transposition.UPPER_BOUND
+        elif best_score >= beta:
+            bound = transposition.LOWER_BOUND
+        else:
+            bound = transposition.EXACT
+        self.transposition_table.store(
+            self.game.hash,
+            depth,
+            _get_score_for_transposition(best_score, ply),
+            bound,
+            principal_variation[0] if bound != transposition.UPPER_BOUND else None,
+        )
+        return best_score, principal_variation
+
+    def _quiescence(
+        self, ply: int, alpha: int, beta: int
+    ) -> Tuple[int, Tuple[engine.Move, ...]]:
+        # Keeps searching captures at the horizon until the position is quiet,
+        # so that the evaluation does not miss a figure about to be beaten.
+        self._count_node()
+        # Checks and evasions could go on for long, so the depth is capped.
+        if ply >= MAX_DEPTH:
+            return self.evaluate(), tuple()
+
+        # In check, the colour in turn cannot stand pat, and the only way out
+        # may be a quiet move, so all evasions are searched.
+        in_check = self.game.is_check()
+        if in_check:
+            possible_moves = self.game.get_all_possible_moves()
+            if len(possible_moves) == 0:
+                return self._evaluate_final_position(ply), tuple()
+            stand_pat = -INFINITE_SCORE
+        else:
+            # The colour in turn does not have to capture, so the evaluation
+            # of the current position ("standing pat") is a lower bound.
+            stand_pat = self.evaluate()
+            if stand_pat >= beta:
+                return stand_pat, tuple()
+            if stand_pat > alpha:
+                alpha = stand_pat
+            possible_moves = self.game.get_all_possible_captures()
+
+        possible_moves = self.move_orderer.order_moves(
+            self.game, possible_moves, ply, None
+        )
+
+        best_score = stand_pat
+        principal_variation: Tuple[engine.Move, ...] = tuple()
+        for move in possible_moves:
+            if self.delta_pruning and not in_check:
+                captured_value = evaluation.get_figure_value(
+                    self.game.board.get(move.target)
+                )
+                if stand_pat + captured_value + DELTA_PRUNING_MARGIN <= alpha:
+                    continue
+
+            self.game.push(move)
+            try:
+                score, child_variation = self._quiescence(ply + 1, -beta, -alpha)
+            finally:
+                self.game.pop()
+            score = -score
+
+            if score > best_score:
+                best_score = score
+                principal_variation = (move,) + child_variation
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        return best_score, principal_variation
+
+    def evaluate(self) -> int:
+        return self.game.evaluation.get_score(self.game.in_turn)
+
+    def _evaluate_final_position(self, ply: int = 0) -> int:
+        # Called when the colour in turn cannot move. Mates closer to the root
+        # score higher, so the search prefers the fastest mate.
+        if self.game.is_check():
+            return -MATE_SCORE + ply
+        return 0
+
+    def _count_node(self):
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise _BudgetExceeded()
+        if self.nodes % _NODES_BETWEEN_BUDGET_CHECKS != 0:
+            return
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            raise _BudgetExceeded()
+        if self.should_stop is not None and self.should_stop():
+            raise _BudgetExceeded()
+
+
+def search(
+    game: Game,
+    max_depth: int = MAX_DEPTH,
+    time_limit: Optional[float] = None,
+    node_limit: Optional[int] = None,
+    transposition_table: Optional[transposition.TranspositionTable] = None,
+    move_orderer: Optional[ordering.MoveOrderer] = None,
+    quiescence: bool = True,
+    delta_pruning: bool = True,
+    should_stop: Optional[Callable[[], bool]] = None,
+    opening_book: Optional[book.OpeningBook] = None,
+    endgame_tablebase: Optional[tablebase.Tablebase] = None,
+) -> SearchResult:
+    if opening_book is not None:
+        # A book move is played without searching. Its score is not known, and
+        # depth 0 with no nodes tells it apart from a searched move.
+        book_move = opening_book.choose_move(game)
+        if book_move is not None:
+            return SearchResult(book_move, 0, (book_move,), 0, 0)
+    return Searcher(
+        game,
+        max_depth,
+        time_limit,
+        node_limit,
+        transposition_table,
+        move_orderer,
+        quiescence,
+        delta_pruning,
+        should_stop,
+        endgame_tablebase=endgame_tablebase,
+    ).search()
+
+
+def _get_score_for_transposition(score: int, ply: int) -> int:
+    # Mate scores count the plies from the root, but a stored position can be
+    # reached at another ply, so they are stored relative to the position.
+    if score >= MATE_SCORE - MAX_DEPTH:
+        return score + ply
+    if score <= -MATE_SCORE + MAX_DEPTH:
+        return score - ply
+    return score
+
+
+def _get_score_from_transposition(score: int, ply: int) -> int:
+    if score >= MATE_SCORE - MAX_DEPTH:
+        return score - ply
+    if score <= -MATE_SCORE + MAX_DEPTH:
+        return score + ply
+    return score
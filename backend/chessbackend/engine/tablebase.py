@@ -0,0 +1,177 @@
+from collections import OrderedDict
+from typing import Any, Iterable, NamedTuple, Optional, Tuple
+from chessbackend.engine import engine
+from chessbackend.engine.game import Game
+import os
+import threading
+
+try:
+    import chess
+    import chess.syzygy
+except ImportError:
+    chess = None
+
+# Probes Syzygy endgame tablebases with the optional python-chess package
+# (`pip install chessbackend[tablebases]`), which memory-maps the table files.
+# The engine has no promotion, so positions with pawns have other results than
+# in the tables and are never probed. There is no fifty-move rule either, so a
+# cursed win counts as a win and a blessed loss as a loss.
+
+DEFAULT_CACHE_SIZE = 65536
+
+
+class TablebaseError(ValueError):
+    pass
+
+
+class TablebaseResult(NamedTuple):
+    # For the colour in turn, as in Syzygy: 2 is a win, 1 a win that takes
+    # more than fifty moves, 0 a draw, -1 and -2 the same for a loss.
+    wdl: int
+    # Plies to the next capture on the fastest way to a win, or the slowest
+    # way to a loss, signed like `wdl`.
+    dtz: int
+
+
+class Tablebase:
+    # Results are kept by Zobrist hash, least recently used first out, so that
+    # a search that reaches the same endgame position again does not probe the
+    # files again. Positions the tables do not cover are cached as `None`.
+    # Request threads of the server share a tablebase, so the cache and its
+    # counters are only changed under a lock.
+
+    def __init__(
+        self, tables: Any, max_pieces: int, cache_size: int = DEFAULT_CACHE_SIZE
+    ):
+        # `tables` probes a `chess.Board`, like `chess.syzygy.Tablebase`.
+        self._tables = tables
+        self.max_pieces = max_pieces
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[int, Optional[TablebaseResult]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def probe(self, game: Game) -> Optional[TablebaseResult]:
+        # Looked up by the hash the game keeps, so a hit costs no copy of the
+        # figures. A miss costs the figures, `game.to_fen()` and a python-chess
+        # board built from it, besides reading the table files.
+        key = game.hash
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return self._results[key]
+
+        figures = game.figures
+        if len(figures) > self.max_pieces:
+            # Not cached, so that positions with many pieces, which the search
+            # does not probe, do not crowd out the endgame positions.
+            return None
+        # The files are probed outside of the lock. Two threads may probe the
+        # same position, which is harmless.
+        if any(figure.code == engine.PAWN for figure in figures):
+            result = None
+        else:
+            result = self._probe_tables(game.to_fen())
+        with self._lock:
+            self.misses += 1
+            self._results[key] = result
+            if len(self._results) > self._cache_size:
+                self._results.popitem(last=False)
+        return result
+
+    def get_best_move(
+        self, game: Game
+    ) -> Optional[Tuple[engine.Move, TablebaseResult]]:
+        # The move that wins fastest, or loses slowest, with the result of the
+        # position, or `None` if the position or one after a move is not
+        # covered. Needs a game with `push` and `pop`.
+        result = self.probe(game)
+        if result is None:
+            return None
+        best_move = None
+        best_key: Tuple[int, int] = (-2, 0)
+        for move in game.get_all_possible_moves():
+            is_capture = game.board.get(move.target) is not None
+            game.push(move)
+            try:
+                if game.is_checkmate():
+                    return move, result
+                child_result = self.probe(game)
+            finally:
+                game.pop()
+            if child_result is None:
+                return None
+            # The results after the move are those of the opponent. A capture
+            # resets the way to the next capture, so it is one ply, and a quiet
+            # move is one ply more than the opponent's way. Wins take the
+            # shortest way and losses the longest.
+            outcome = -_get_sign(child_result.wdl)
+            distance = 1 if is_capture else 1 + abs(child_result.dtz)
+            key = (outcome, -outcome * distance)
+            if key > best_key:
+                best_move, best_key = move, key
+        if best_move is None:
+            return None
+        return best_move, result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        self._tables.close()
+
+    def __enter__(self) -> "Tablebase":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _probe_tables(self, fen_string: str) -> Optional[TablebaseResult]:
+        board = chess.Board(fen_string)
+        if not board.is_valid():
+            return None
+        try:
+            return TablebaseResult(
+                self._tables.probe_wdl(board), self._tables.probe_dtz(board)
+            )
+        except KeyError:
+            # A table of this material is missing.
+            return None
+
+
+def open_tablebase(directory: str, cache_size: int = DEFAULT_CACHE_SIZE) -> Tablebase:
+    if chess is None:
+        raise TablebaseError("Probing tablebases needs the python-chess package")
+    if not os.path.isdir(directory):
+        raise TablebaseError(f"Not a directory: {directory}")
+    return Tablebase(
+        chess.syzygy.open_tablebase(directory),
+        get_max_pieces(os.listdir(directory)),
+        cache_size,
+    )
+
+
+def get_max_pieces(file_names: Iterable[str]) -> int:
+    # Table files are named by their material, e.g. "KRvK.rtbw".
+    return max(
+        (
+            len(file_name[: -len(".rtbw")].replace("v", ""))
+            for file_name in file_names
+            if file_name.endswith(".rtbw")
+        ),
+        default=0,
+    )
+
+
+def get_result_score(result: TablebaseResult, win_score: int) -> int:
+    sign = _get_sign(result.wdl)
+    return sign * (win_score - abs(result.dtz)) if sign else 0
+
+
+def _get_sign(wdl: int) -> int:
+    return (wdl > 0) - (wdl < 0)
@@ -0,0 +1,148 @@
+from typing import NamedTuple, Optional
+from chessbackend.engine import engine
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 1, 2, 3
+
+# Every slot is a 64 bit key plus 64 bits of packed entry data.
+SLOT_SIZE = 16
+SLOTS_PER_BUCKET = 2
+DEFAULT_MEMORY_LIMIT = 8 * 1024 * 1024
+
+# Layout of the packed entry data, from the lowest bit:
+# 13 bits best move (0 for none), 8 bits depth, 2 bits bound, 32 bits score.
+_MOVE_BITS = 13
+_DEPTH_BITS = 8
+_BOUND_BITS = 2
+_DEPTH_SHIFT = _MOVE_BITS
+_BOUND_SHIFT = _DEPTH_SHIFT + _DEPTH_BITS
+_SCORE_SHIFT = _BOUND_SHIFT + _BOUND_BITS
+_SCORE_OFFSET = 1 << 31
+_SQUARE_COUNT = engine.BOARD_SIZE * engine.BOARD_SIZE
+
+
+class TranspositionEntry(NamedTuple):
+    depth: int
+    score: int
+    # One of EXACT, LOWER_BOUND and UPPER_BOUND.
+    bound: int
+    best_move: Optional[engine.Move]
+
+
+def get_bucket_count(memory_limit: int) -> int:
+    return max(1, memory_limit // (SLOT_SIZE * SLOTS_PER_BUCKET))
+
+
+def get_buffer_size(memory_limit: int) -> int:
+    # Bytes a table with `memory_limit` uses, at most `memory_limit`.
+    return get_bucket_count(memory_limit) * SLOTS_PER_BUCKET * SLOT_SIZE
+
+
+class TranspositionTable:
+    # Fixed-size hash table of search results keyed by the Zobrist hash of a
+    # position. Keys and packed entries live in two flat integer arrays, so the
+    # memory used never exceeds `memory_limit` bytes no matter how many
+    # positions are stored.
+    #
+    # Each bucket has two slots: the first keeps the deepest result seen for a
+    # position, the second is always replaced, so recent results are kept too.
+    #
+    # The arrays can be placed in a buffer shared between processes, which then
+    # write to the same table without locks. A slot stores the key XOR-ed with
+    # the data, so a slot whose key and data were written by two processes at
+    # the same time does not match any key and is ignored.
+
+    def __init__(
+        self,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        buffer: Optional[memoryview] = None,
+    ):
+        self._bucket_count = get_bucket_count(memory_limit)
+        size = get_buffer_size(memory_limit)
+        if buffer is None:
+            buffer = memoryview(bytearray(size))
+        elif len(buffer) < size:
+            raise ValueError(f"Buffer of {len(buffer)} bytes, {size} needed")
+        self._buffer = buffer[:size]
+        self._keys = self._buffer[: size // 2].cast("Q")
+        self._data = self._buffer[size // 2 :].cast("Q")
+        self.probes = 0
+        self.hits = 0
+
+    def get(self, key: int) -> Optional[TranspositionEntry]:
+        self.probes += 1
+        slot = self._get_bucket_slot(key)
+        for index in (slot, slot + 1):
+            data = self._data[index]
+            if data != 0 and self._keys[index] ^ data == key:
+                self.hits += 1
+                return _unpack_entry(data)
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        score: int,
+        bound: int,
+        best_move: Optional[engine.Move],
+    ):
+        slot = self._get_bucket_slot(key)
+        data = _pack_entry(depth, score, bound, best_move)
+        stored_data = self._data[slot]
+        stored_depth = (stored_data >> _DEPTH_SHIFT) & ((1 << _DEPTH_BITS) - 1)
+        if (
+            stored_data == 0
+            or self._keys[slot] ^ stored_data == key
+            or depth >= stored_depth
+        ):
+            self._keys[slot] = key ^ data
+            self._data[slot] = data
+        else:
+            self._keys[slot + 1] = key ^ data
+            self._data[slot + 1] = data
+
+    def clear(self):
+        self._buffer[:] = bytes(len(self._buffer))
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def memory_usage(self) -> int:
+        return (len(self._keys) + len(self._data)) * self._keys.itemsize
+
+    def _get_bucket_slot(self, key: int) -> int:
+        return (key % self._bucket_count) * SLOTS_PER_BUCKET
+
+
+def _pack_entry(
+    depth: int, score: int, bound: int, best_move: Optional[engine.Move]
+) -> int:
+    packed_move = 0
+    if best_move is not None:
+        packed_move = (
+            1
+            + engine.get_square_index(best_move.source) * _SQUARE_COUNT
+            + engine.get_square_index(best_move.target)
+        )
+    return (
+        packed_move
+        | min(depth, (1 << _DEPTH_BITS) - 1) << _DEPTH_SHIFT
+        | bound << _BOUND_SHIFT
+        | (score + _SCORE_OFFSET) << _SCORE_SHIFT
+    )
+
+
+def _unpack_entry(data: int) -> TranspositionEntry:
+    packed_move = data & ((1 << _MOVE_BITS) - 1)
+    best_move = None
+    if packed_move:
+        source, target = divmod(packed_move - 1, _SQUARE_COUNT)
+        best_move = engine.Move(
+            engine.get_position(source), engine.get_position(target)
+        )
+    return TranspositionEntry(
+        (data >> _DEPTH_SHIFT) & ((1 << _DEPTH_BITS) - 1),
+        (data >> _SCORE_SHIFT) - _SCORE_OFFSET,
+        (data >> _BOUND_SHIFT) & ((1 << _BOUND_BITS) - 1),
+        best_move,
+    )
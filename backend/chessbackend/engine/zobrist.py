@@ -0,0 +1,42 @@
+from typing import Tuple
+from chessbackend.engine import engine
+import random
+
+
+# Zobrist hashing gives every figure on every field a random 64 bit key. The hash
+# of a position is the XOR of the keys of all its figures (plus a key if black is
+# in turn), so a move changes the hash by XOR-ing only the keys it touches.
+# The keys are generated from a fixed seed, so hashes are the same in every
+# process and can be stored.
+
+_random = random.Random(0x5EED)
+
+# By colour, then figure code and square index.
+FIGURE_KEYS = {
+    colour: tuple(
+        tuple(
+            _random.getrandbits(64)
+            for _ in range(engine.BOARD_SIZE * engine.BOARD_SIZE)
+        )
+        for _ in engine.FIGURE_NAMES
+    )
+    for colour in engine.Colour
+}
+BLACK_IN_TURN_KEY = _random.getrandbits(64)
+
+
+def get_figure_key(figure: engine.Figure) -> int:
+    return FIGURE_KEYS[figure.colour][figure.code][
+        engine.get_square_index(figure.position)
+    ]
+
+
+def get_in_turn_key(in_turn: engine.Colour) -> int:
+    return BLACK_IN_TURN_KEY if in_turn == engine.Colour.BLACK else 0
+
+
+def compute_hash(figures: Tuple[engine.Figure, ...], in_turn: engine.Colour) -> int:
+    position_hash = get_in_turn_key(in_turn)
+    for figure in figures:
+        position_hash ^= get_figure_key(figure)
+    return position_hash
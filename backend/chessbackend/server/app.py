@@ -1,56 +1,119 @@
 import json
-from typing import Tuple, Type
+import os
+from typing import Tuple, Type, Union
 from flask import Flask, jsonify, request, Response, make_response
 from chessbackend import engine
-from chessbackend.server import data
+from chessbackend.engine import fen, notation, packing, tablebase
+from chessbackend.server import data, events, jobs
 
 app = Flask(__name__)
-game_repository = data.GameRepository()
-figure_repository = data.FigureRepository()
+# Rules engine used for newly created games, one of `data.GAME_DATA_ADAPTERS`.
+app.config["ENGINE_BACKEND"] = os.environ.get("CHESS_ENGINE_BACKEND", "figures")
+# SQLite database file shared by all workers. Without one, games are kept in
+# the memory of the process.
+app.config["GAME_DATABASE"] = os.environ.get("CHESS_GAME_DATABASE")
+game_store = data.create_game_store(app.config["GAME_DATABASE"])
+status_cache = data.GameStatusCache()
+# Seconds after which an idle event stream sends a comment, so that proxies do
+# not close it.
+app.config["EVENTS_KEEPALIVE_SECONDS"] = 15
+game_events = events.GameEvents()
+# AI moves are searched by a pool of worker processes, one per CPU by default.
+# Jobs beyond `AI_MAX_PENDING_JOBS` queued or running ones are rejected.
+app.config["AI_WORKERS"] = int(os.environ.get("CHESS_AI_WORKERS", 0)) or None
+app.config["AI_MAX_PENDING_JOBS"] = 16
+# Default and maximum search time of an AI move in seconds.
+app.config["AI_TIME_LIMIT"] = 1.0
+app.config["AI_MAX_TIME_LIMIT"] = 10.0
+# Opening book file built with `chessbackend.cli.book`, if any.
+app.config["AI_OPENING_BOOK"] = os.environ.get("CHESS_OPENING_BOOK")
+# Directory of Syzygy tablebase files, if any. Game statuses report their
+# results, and AI moves in the positions they cover are looked up.
+app.config["TABLEBASE_DIRECTORY"] = os.environ.get("CHESS_TABLEBASE_DIRECTORY")
+endgame_tablebase = (
+    tablebase.open_tablebase(app.config["TABLEBASE_DIRECTORY"])
+    if app.config["TABLEBASE_DIRECTORY"]
+    else None
+)
+# Jobs are recorded in the game store, so that any worker process of the app can
+# answer for them, as long as the store is shared between them.
+ai_move_jobs = jobs.AiMoveJobs(
+    app.config["AI_WORKERS"],
+    app.config["AI_MAX_PENDING_JOBS"],
+    book_path=app.config["AI_OPENING_BOOK"],
+    tablebase_directory=app.config["TABLEBASE_DIRECTORY"],
+    job_store=game_store,
+)
 
 
 def reset_data():
-    game_repository.clear()
-    figure_repository.clear()
+    game_store.clear()
+    status_cache.clear()
+    game_events.clear()
+    if endgame_tablebase is not None:
+        endgame_tablebase.clear()
+
+
+@app.errorhandler(data.NotFoundError)
+def handle_not_found(error):
+    return jsonify("Not found"), 404
 
 
 @app.route("/game", methods=["POST"])
 def create_game():
-    game_factory = data.GameDataAdapterFactory()
+    json = request.get_json(silent=True) or {}
+    if not isinstance(json, dict):
+        return jsonify("Invalid request body"), 400
+    game_factory = data.GameDataAdapterFactory(app.config["ENGINE_BACKEND"])
     game = game_factory.create()
 
     figure_factory = data.FigureDataAdapterFactory(game.id)
     figure_builder = engine.FigureBuilder(figure_factory)
-    figures = engine.build_default_figures(figure_builder)
+    if "fen" in json:
+        if not isinstance(json["fen"], str):
+            return jsonify("Invalid FEN"), 400
+        try:
+            figures, game.in_turn = fen.parse_fen(json["fen"], figure_builder)
+        except fen.FenError as error:
+            return jsonify(str(error)), 400
+    else:
+        figures = engine.build_default_figures(figure_builder)
 
     game.figures = figures
 
-    game_repository.add(game)
-    for figure in game.figures:
-        figure_repository.add(figure)
+    game_store.add(game)
 
     return make_response(jsonify({"id": game.id, "inTurn": game.in_turn.value}), 201)
 
 
 @app.route("/game/<game_id>", methods=["GET"])
 def get_game(game_id):
-    game = game_repository.get(game_id)
-    game_figures = figure_repository.get_game_figures(game_id)
-    game.figures = game_figures
-    return jsonify(
-        {
-            "id": game.id,
-            "inTurn": game.in_turn.value,
-            "check": game.is_check(),
-            "checkmate": game.is_checkmate(),
-            "stalemate": game.is_stalemate(),
-        }
+    game = game_store.get(game_id)
+    status = status_cache.get_status(game)
+    game_data = {
+        "id": game.id,
+        "inTurn": game.in_turn.value,
+        "check": status.check,
+        "checkmate": status.checkmate,
+        "stalemate": status.stalemate,
+        "fen": game.to_fen(),
+    }
+    tablebase_result = (
+        endgame_tablebase.probe(game) if endgame_tablebase is not None else None
     )
+    if tablebase_result is not None:
+        # The exact result with best play, for the colour in turn.
+        game_data["tablebase"] = tablebase_result._asdict()
+    return jsonify(game_data)
 
 
 @app.route("/game/<game_id>/figures", methods=["GET"])
 def get_figures(game_id):
-    figures = figure_repository.get_game_figures(game_id)
+    # Listed rank by rank from black's side, as in FEN, for every store.
+    figures = sorted(
+        game_store.get(game_id).figures,
+        key=lambda fig: (-fig.position.y, fig.position.x),
+    )
     figures_data = tuple(
         {
             "positionX": fig.position[0],
@@ -66,10 +129,10 @@ def get_figures(game_id):
 
 @app.route("/game/<game_id>/figures/<figure_id>", methods=["GET"])
 def get_figure_details(game_id, figure_id):
-    figure = figure_repository.get(figure_id)
-    game = game_repository.get(game_id)
-    game_figures = figure_repository.get_game_figures(game_id)
-    game.figures = game_figures
+    game = game_store.get(game_id)
+    figure = next((fig for fig in game.figures if fig.id == figure_id), None)
+    if figure is None:
+        raise data.NotFoundError("Not found")
     valid_moves = game.get_all_target_positions(figure.position)
     return jsonify(
         {
@@ -83,27 +146,159 @@ def get_figure_details(game_id, figure_id):
     )
 
 
+@app.route("/game/<game_id>/moves", methods=["GET"])
+def get_moves(game_id):
+    game = game_store.get(game_id)
+    # The legal moves only depend on the position, so its hash is the ETag and
+    # a client that already has them does not need another move generation.
+    etag = _get_position_hash(game)
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        moves = {}
+        for move in game.get_all_possible_moves():
+            figure_id = data.get_figure_id(move.source)
+            moves.setdefault(figure_id, []).append(move.target)
+        response = jsonify({"inTurn": game.in_turn.value, "moves": moves})
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+
 # TODO: should route be different?
 @app.route("/game/<game_id>", methods=["PATCH"])
 def make_move(game_id):
     json = request.get_json()
-    from_position = engine.Position(json["from"]["x"], json["from"]["y"])
-    to_position = engine.Position(json["to"]["x"], json["to"]["y"])
-    game = game_repository.get(game_id)
-    game.figures = figure_repository.get_game_figures(game_id)
-    old_figure_ids = tuple(fig.id for fig in game.figures)
-
+    if "san" in json and not isinstance(json["san"], str):
+        return jsonify("Invalid SAN"), 400
     try:
-        game.make_move(engine.Move(from_position, to_position))
-        game_repository.update(game)
-        new_figure_ids = tuple(fig.id for fig in game.figures)
-        for figure in game.figures:
-            figure_repository.update(figure)
-        for fig_id in old_figure_ids:
-            if fig_id not in new_figure_ids:
-                figure_repository.delete(fig_id)
-        return jsonify({}), 204
-    except engine.NoFigureError:
-        return jsonify("No figure"), 409  # TODO: other status code? error message
-    except engine.InvalidMoveError:
+        if "san" in json:
+            # SAN is resolved against the current position. A move made in the
+            # meantime makes the resolved move fail the check in `make_move`.
+            move = notation.parse_san(game_store.get(game_id), json["san"])
+        else:
+            move = engine.Move(
+                engine.Position(json["from"]["x"], json["from"]["y"]),
+                engine.Position(json["to"]["x"], json["to"]["y"]),
+            )
+        game = game_store.make_move(game_id, move)
+    except data.NotFoundError:
+        raise
+    except ValueError:
         return jsonify("Invalid move"), 409  # TODO: other status code? error message
+
+    status = status_cache.get_status(game)
+    game_events.publish(
+        game_id,
+        {
+            "move": _get_move_data(move),
+            "inTurn": game.in_turn.value,
+            "check": status.check,
+            "checkmate": status.checkmate,
+            "stalemate": status.stalemate,
+            "hash": _get_position_hash(game),
+        },
+    )
+    return jsonify({}), 204
+
+
+@app.route("/game/<game_id>/events", methods=["GET"])
+def get_events(game_id):
+    # Server-sent events with one "move" event per move made in the game, so
+    # clients do not have to poll for the opponent's moves.
+    game_store.get(game_id)
+    subscription = game_events.subscribe(game_id)
+    response = Response(
+        _stream_events(game_id, subscription), mimetype="text/event-stream"
+    )
+    response.cache_control.no_cache = True
+    # Stops nginx from buffering the stream.
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@app.route("/game/<game_id>/ai-move", methods=["POST"])
+def create_ai_move_job(game_id):
+    json = request.get_json(silent=True) or {}
+    if not isinstance(json, dict):
+        return jsonify("Invalid request body"), 400
+    try:
+        time_limit = float(json.get("timeLimit", app.config["AI_TIME_LIMIT"]))
+    except (TypeError, ValueError):
+        return jsonify("Invalid time limit"), 400
+    if not time_limit > 0:
+        return jsonify("Invalid time limit"), 400
+    time_limit = min(time_limit, app.config["AI_MAX_TIME_LIMIT"])
+
+    game = game_store.get(game_id)
+    packed_position = packing.pack_position(game.figures, game.in_turn)
+    try:
+        job = ai_move_jobs.submit(game_id, packed_position, time_limit)
+    except jobs.JobQueueFullError as error:
+        response = make_response(jsonify(str(error)), 503)
+        response.headers["Retry-After"] = "1"
+        return response
+
+    response = make_response(jsonify(_get_job_data(job)), 202)
+    response.headers["Location"] = f"/game/{game_id}/ai-move/{job.id}"
+    return response
+
+
+@app.route("/game/<game_id>/ai-move/<job_id>", methods=["GET"])
+def get_ai_move_job(game_id, job_id):
+    return jsonify(_get_job_data(_get_ai_move_job(game_id, job_id)))
+
+
+@app.route("/game/<game_id>/ai-move/<job_id>", methods=["DELETE"])
+def cancel_ai_move_job(game_id, job_id):
+    _get_ai_move_job(game_id, job_id)
+    return jsonify(_get_job_data(ai_move_jobs.cancel(job_id)))
+
+
+def _stream_events(game_id: str, subscription: events.Subscription):
+    try:
+        # Sent right away, so the response headers reach the client before the
+        # first move.
+        yield ": subscribed\n\n"
+        while not subscription.closed:
+            event = subscription.get(app.config["EVENTS_KEEPALIVE_SECONDS"])
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: move\ndata: {json.dumps(event)}\n\n"
+    finally:
+        # Runs when the client disconnects and the server closes the stream.
+        game_events.unsubscribe(game_id, subscription)
+
+
+def _get_position_hash(game: engine.Game) -> str:
+    return f"{game.hash:016x}"
+
+
+def _get_ai_move_job(
+    game_id: str, job_id: str
+) -> Union[jobs.AiMoveJob, jobs.StoredAiMoveJob]:
+    job = ai_move_jobs.get(job_id)
+    if job.game_id != game_id:
+        raise data.NotFoundError("Not found")
+    return job
+
+
+def _get_job_data(job: Union[jobs.AiMoveJob, jobs.StoredAiMoveJob]) -> dict:
+    job_data = {"id": job.id, "status": job.status}
+    result = job.result
+    if result is not None:
+        job_data["result"] = {
+            "move": _get_move_data(result.move) if result.move else None,
+            "score": result.score,
+            "depth": result.depth,
+            "nodes": result.nodes,
+        }
+    return job_data
+
+
+def _get_move_data(move: engine.Move) -> dict:
+    return {
+        "from": {"x": move.source.x, "y": move.source.y},
+        "to": {"x": move.target.x, "y": move.target.y},
+    }
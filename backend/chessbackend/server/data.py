@@ -1,6 +1,26 @@
+import contextlib
+import os
+import sqlite3
+import threading
 import uuid
 from chessbackend import engine
-from typing import Tuple, Type
+from chessbackend.engine import packing
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class NotFoundError(ValueError):
+    pass
+
+
+class JobRecord(NamedTuple):
+    # The state of a job that every worker process can read. The store does not
+    # interpret the status, and keeps the result as the JSON text it is given.
+    id: str
+    game_id: str
+    status: str
+    finished: bool = False
+    result: Optional[str] = None
 
 
 class GameDataAdapter(engine.Game):
@@ -11,37 +31,51 @@ class GameDataAdapter(engine.Game):
         self.id = id
 
 
+class BitboardGameDataAdapter(engine.BitboardGame):
+    def __init__(
+        self, figures: Tuple[engine.Figure, ...], in_turn=engine.Colour.WHITE, id=str
+    ):
+        super().__init__(figures, in_turn)
+        self.id = id
+
+
+GAME_DATA_ADAPTERS = {"figures": GameDataAdapter, "bitboard": BitboardGameDataAdapter}
+
+
 class GameDataAdapterFactory:
+    def __init__(self, backend: str = "figures"):
+        self._game_data_adapter = GAME_DATA_ADAPTERS[backend]
+
     def create(self, in_turn=engine.Colour.WHITE):
-        return GameDataAdapter(tuple(), in_turn, str(uuid.uuid4()))
+        return self._game_data_adapter(tuple(), in_turn, str(uuid.uuid4()))
 
 
 class FigureDataAdapter(engine.Figure):
+    # Figures are not stored one by one. A figure is identified by the field it
+    # stands on, which is all a client needs to ask for its valid moves.
+
     def __init__(
         self,
         colour: engine.Colour,
         position: engine.Position,
         movements: Tuple[engine.Movement, ...],
         name: str,
-        id: str,
         game_id: str,
     ):
         super().__init__(colour, position, movements, name)
-        self.id = id
         self.game_id = game_id
 
+    @property
+    def id(self) -> str:
+        return get_figure_id(self.position)
+
     def __copy__(self):
         return FigureDataAdapter(
-            self.colour,
-            self.position,
-            self._movements,
-            self.name,
-            self.id,
-            self.game_id,
+            self.colour, self.position, self._movements, self.name, self.game_id
         )
 
 
-class FigureDataAdapterFactory(Type[engine.FigureFactory]):
+class FigureDataAdapterFactory(engine.FigureFactory):
     def __init__(self, game_id: str):
         self._game_id = game_id
 
@@ -52,57 +86,299 @@ class FigureDataAdapterFactory(Type[engine.FigureFactory]):
         movements: Tuple[engine.Movement, ...],
         name: str,
     ):
-        return FigureDataAdapter(
-            colour, position, movements, name, str(uuid.uuid4()), self._game_id
-        )
+        return FigureDataAdapter(colour, position, movements, name, self._game_id)
+
+
+class MemoryGameStore:
+    # Keeps the packed position of every game in process memory, so games are
+    # lost on restart and are not shared between worker processes. The same
+    # goes for AI move jobs, so an app with this store must run in a single
+    # process. A move is loaded, checked and saved under a lock, like in one
+    # transaction of `SqliteGameStore`, so that concurrent moves cannot
+    # overwrite each other.
+
+    def __init__(self, max_kept_jobs: int = 1024):
+        self._games: Dict[str, Tuple[str, bytes]] = {}
+        self._jobs: "OrderedDict[str, JobRecord]" = OrderedDict()
+        self._max_kept_jobs = max_kept_jobs
+        self._lock = threading.Lock()
+
+    def add(self, game: GameDataAdapter):
+        self._games[game.id] = (_get_backend(game), _pack_game(game))
+
+    def get(self, game_id: str) -> GameDataAdapter:
+        try:
+            backend, packed = self._games[game_id]
+        except KeyError:
+            raise NotFoundError("Not found")
+        return _unpack_game(game_id, backend, packed)
+
+    def make_move(self, game_id: str, move: engine.Move) -> GameDataAdapter:
+        with self._lock:
+            game = self.get(game_id)
+            game.make_move(move)
+            self.add(game)
+        return game
+
+    def add_job(self, job: JobRecord):
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self._max_kept_jobs:
+                self._jobs.popitem(last=False)
 
+    def finish_job(
+        self, job_id: str, status: str, result: Optional[str] = None
+    ) -> JobRecord:
+        # Only the first finish counts, so a job cancelled in one process keeps
+        # that status when the process running it finishes it later.
+        with self._lock:
+            job = self.get_job(job_id)
+            if not job.finished:
+                job = job._replace(status=status, finished=True, result=result)
+                self._jobs[job_id] = job
+        return job
 
-class GameRepository:
-    def __init__(self):
-        self._games = []
+    def get_job(self, job_id: str) -> JobRecord:
+        try:
+            return self._jobs[job_id]
+        except KeyError:
+            raise NotFoundError("Not found")
+
+    def clear(self):
+        self._games = {}
+        self._jobs.clear()
+
+
+class SqliteGameStore:
+    # Keeps every game as one row with its packed position, plus one row per
+    # move made. Several worker processes can share the database file: WAL mode
+    # lets readers continue while a move is written, and a move is loaded,
+    # checked and written in one transaction.
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS games (
+            id TEXT PRIMARY KEY,
+            backend TEXT NOT NULL,
+            position BLOB NOT NULL,
+            ply INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS moves (
+            game_id TEXT NOT NULL REFERENCES games (id),
+            ply INTEGER NOT NULL,
+            source INTEGER NOT NULL,
+            target INTEGER NOT NULL,
+            PRIMARY KEY (game_id, ply)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            number INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            game_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            finished INTEGER NOT NULL DEFAULT 0,
+            result TEXT
+        )
+        """,
+    )
+
+    def __init__(self, path: str, timeout: float = 5.0, max_kept_jobs: int = 1024):
+        self._path = path
+        self._timeout = timeout
+        self._max_kept_jobs = max_kept_jobs
+        self._local = threading.local()
+        with self._transaction() as connection:
+            for statement in self.SCHEMA:
+                connection.execute(statement)
 
     def add(self, game: GameDataAdapter):
-        self._games.append(game)
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO games (id, backend, position) VALUES (?, ?, ?)",
+                (game.id, _get_backend(game), _pack_game(game)),
+            )
+
+    def get(self, game_id: str) -> GameDataAdapter:
+        return self._load(self._get_connection(), game_id)[0]
+
+    def make_move(self, game_id: str, move: engine.Move) -> GameDataAdapter:
+        with self._transaction() as connection:
+            game, ply = self._load(connection, game_id)
+            game.make_move(move)
+            connection.execute(
+                "UPDATE games SET position = ?, ply = ? WHERE id = ?",
+                (_pack_game(game), ply + 1, game_id),
+            )
+            connection.execute(
+                "INSERT INTO moves (game_id, ply, source, target) VALUES (?, ?, ?, ?)",
+                (
+                    game_id,
+                    ply + 1,
+                    engine.get_square_index(move.source),
+                    engine.get_square_index(move.target),
+                ),
+            )
+        return game
+
+    def get_moves(self, game_id: str) -> Tuple[engine.Move, ...]:
+        rows = self._get_connection().execute(
+            "SELECT source, target FROM moves WHERE game_id = ? ORDER BY ply",
+            (game_id,),
+        )
+        return tuple(
+            engine.Move(engine.get_position(source), engine.get_position(target))
+            for source, target in rows
+        )
 
-    def update(self, game: engine.Game):
-        pass
+    def add_job(self, job: JobRecord):
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "INSERT INTO jobs (id, game_id, status, finished, result) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.game_id, job.status, job.finished, job.result),
+            )
+            # Jobs are numbered in the order they were added, so the oldest
+            # ones beyond `max_kept_jobs` are dropped.
+            connection.execute(
+                "DELETE FROM jobs WHERE number <= ?",
+                (cursor.lastrowid - self._max_kept_jobs,),
+            )
 
-    def get(self, game_id: int) -> engine.Game:
-        for game in self._games:
-            if game.id == game_id:
-                return game
-        raise ValueError("Not found")
+    def finish_job(
+        self, job_id: str, status: str, result: Optional[str] = None
+    ) -> JobRecord:
+        # Only the first finish counts, see `MemoryGameStore.finish_job`.
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished = 1, result = ? "
+                "WHERE id = ? AND NOT finished",
+                (status, result, job_id),
+            )
+            return self._load_job(connection, job_id)
+
+    def get_job(self, job_id: str) -> JobRecord:
+        return self._load_job(self._get_connection(), job_id)
 
     def clear(self):
-        self._games = []
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM jobs")
+            connection.execute("DELETE FROM moves")
+            connection.execute("DELETE FROM games")
+
+    def _load(
+        self, connection: sqlite3.Connection, game_id: str
+    ) -> Tuple[GameDataAdapter, int]:
+        row = connection.execute(
+            "SELECT backend, position, ply FROM games WHERE id = ?", (game_id,)
+        ).fetchone()
+        if row is None:
+            raise NotFoundError("Not found")
+        backend, packed, ply = row
+        return _unpack_game(game_id, backend, packed), ply
+
+    def _load_job(self, connection: sqlite3.Connection, job_id: str) -> JobRecord:
+        row = connection.execute(
+            "SELECT id, game_id, status, finished, result FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            raise NotFoundError("Not found")
+        id, game_id, status, finished, result = row
+        return JobRecord(id, game_id, status, bool(finished), result)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # The write lock is taken up front, so two processes making a move in
+        # the same game cannot both read the old position.
+        connection = self._get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
 
+    def _get_connection(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared between threads, nor be
+        # inherited by forked worker processes.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self._path, timeout=self._timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
 
-class FigureRepository:
-    def __init__(self):
-        self._figures = []
 
-    def add(self, figure: FigureDataAdapter):
-        self._figures.append(figure)
+class GameStatusCache:
+    # Least recently used statuses by Zobrist hash of the position. Games are
+    # rebuilt from the store on every request, so the status memoized on the
+    # game itself would be lost. A position's status never changes and a move
+    # leads to a different hash, so entries never need to be invalidated.
+    # Request threads share the cache, so it is only changed under a lock.
 
-    def update(self, figure: FigureDataAdapter):
-        self.delete(figure.id)
-        self._figures.append(figure)
+    def __init__(self, max_size: int = 4096):
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._statuses: "OrderedDict[int, engine.GameStatus]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
 
-    def get(self, figure_id: int) -> FigureDataAdapter:
-        for figure in self._figures:
-            if figure.id == figure_id:
-                return figure
-        raise ValueError("Not found")
+    def get_status(self, game: engine.Game) -> engine.GameStatus:
+        key = game.hash
+        with self._lock:
+            status = self._statuses.get(key)
+            if status is not None:
+                self._statuses.move_to_end(key)
+                self.hits += 1
+                return status
+            self.misses += 1
 
-    def get_game_figures(self, game_id: str) -> Tuple[FigureDataAdapter, ...]:
-        game_figures = []
-        for figure in self._figures:
-            if figure.game_id == game_id:
-                game_figures.append(figure)
-        return tuple(game_figures)
+        # Computed outside of the lock. Two threads may compute the same status,
+        # which is harmless.
+        status = game.get_status()
+        with self._lock:
+            self._statuses[key] = status
+            if len(self._statuses) > self._max_size:
+                self._statuses.popitem(last=False)
+        return status
 
     def clear(self):
-        self._figures = []
+        with self._lock:
+            self._statuses.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def create_game_store(database: Optional[str] = None):
+    if database:
+        return SqliteGameStore(database)
+    return MemoryGameStore()
+
+
+def get_figure_id(position: engine.Position) -> str:
+    return engine.get_field_name(position)
+
+
+def _get_backend(game: engine.Game) -> str:
+    for backend, game_data_adapter in GAME_DATA_ADAPTERS.items():
+        if isinstance(game, game_data_adapter):
+            return backend
+    raise ValueError(f"Unknown game type {type(game).__name__}")
+
+
+def _pack_game(game: engine.Game) -> bytes:
+    return packing.pack_position(game.figures, game.in_turn)
+
 
-    def delete(self, figure_id: str):
-        self._figures = list(fig for fig in self._figures if fig.id != figure_id)
+def _unpack_game(game_id: str, backend: str, packed: bytes) -> GameDataAdapter:
+    figure_builder = engine.FigureBuilder(FigureDataAdapterFactory(game_id))
+    figures, in_turn = packing.unpack_position(packed, figure_builder)
+    return GAME_DATA_ADAPTERS[backend](figures, in_turn, game_id)
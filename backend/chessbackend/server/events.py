@@ -0,0 +1,69 @@
+from typing import Any, Dict, Optional, Set
+import queue
+import threading
+
+# In-process publish/subscribe of game changes. Only clients connected to the
+# same process as the one that made a move are notified, so several worker
+# processes need a shared broker instead.
+
+Event = Dict[str, Any]
+
+
+class Subscription:
+    def __init__(self, max_queue_size: int):
+        self._events: "queue.Queue[Event]" = queue.Queue(max_queue_size)
+        # Set when the subscriber does not keep up. It has missed events and
+        # must reload the game instead of applying further ones.
+        self.closed = False
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        # Waits for the next event, `None` if there was none within `timeout`.
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def put(self, event: Event):
+        try:
+            self._events.put_nowait(event)
+        except queue.Full:
+            self.closed = True
+
+
+class GameEvents:
+    def __init__(self, max_queue_size: int = 64):
+        self._max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, game_id: str) -> Subscription:
+        subscription = Subscription(self._max_queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(game_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, game_id: str, subscription: Subscription):
+        with self._lock:
+            game_subscriptions = self._subscriptions.get(game_id)
+            if game_subscriptions is None:
+                return
+            game_subscriptions.discard(subscription)
+            if not game_subscriptions:
+                del self._subscriptions[game_id]
+
+    def publish(self, game_id: str, event: Event):
+        # Never blocks: a subscriber whose queue is full is closed instead.
+        with self._lock:
+            subscriptions = tuple(self._subscriptions.get(game_id, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+            if subscription.closed:
+                self.unsubscribe(game_id, subscription)
+
+    def count_subscriptions(self, game_id: str) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(game_id, ()))
+
+    def clear(self):
+        with self._lock:
+            self._subscriptions = {}
@@ -0,0 +1,257 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Union
+from chessbackend import engine
+from chessbackend.engine import book, packing, search, tablebase
+from chessbackend.server import data
+import json
+import multiprocessing
+import threading
+import uuid
+
+# AI moves are searched in worker processes, so that a search neither blocks a
+# request thread nor competes with it for the interpreter lock. Workers get the
+# packed position, not live game objects.
+#
+# The futures of a job live in the process that submitted it. When the app runs
+# in several processes, a request for the job can reach another one, so with a
+# job store every job is also recorded in the game store, which all of them
+# share. A `MemoryGameStore` is not shared, so jobs then work only when the app
+# runs in one process.
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+class AiMoveResult(NamedTuple):
+    # `None` if the colour in turn cannot move.
+    move: Optional[engine.Move]
+    score: int
+    depth: int
+    nodes: int
+
+
+class AiMoveJob:
+    def __init__(self, id: str, game_id: str, future: Future, slot: int):
+        self.id = id
+        self.game_id = game_id
+        self.future = future
+        self.slot = slot
+        self.cancelled = False
+
+    @property
+    def status(self) -> str:
+        if self.cancelled or self.future.cancelled():
+            return CANCELLED
+        if not self.future.done():
+            return RUNNING if self.future.running() else QUEUED
+        if self.future.exception() is not None:
+            return FAILED
+        return DONE
+
+    @property
+    def result(self) -> Optional[AiMoveResult]:
+        if self.status != DONE:
+            return None
+        return self.future.result()
+
+
+class StoredAiMoveJob:
+    # A job of another process, as far as the job store knows it. Such a job is
+    # queued until it is finished, because only the process that runs it knows
+    # when it starts.
+
+    def __init__(self, record: data.JobRecord):
+        self.id = record.id
+        self.game_id = record.game_id
+        self.status = record.status
+        self.result = _load_result(record.result)
+
+
+class AiMoveJobs:
+    # At most `max_pending_jobs` jobs are queued or running at a time. Each of
+    # them owns a slot in an array shared with the workers, in which a running
+    # search is told to stop when its job is cancelled.
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending_jobs: int = 16,
+        max_kept_jobs: int = 1024,
+        book_path: Optional[str] = None,
+        tablebase_directory: Optional[str] = None,
+        job_store: Union[data.MemoryGameStore, data.SqliteGameStore, None] = None,
+    ):
+        self._max_workers = max_workers
+        self._job_store = job_store
+        self._book_path = book_path
+        self._tablebase_directory = tablebase_directory
+        self._max_kept_jobs = max_kept_jobs
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stop_flags = multiprocessing.Array("b", max_pending_jobs, lock=False)
+        self._free_slots: List[int] = list(range(max_pending_jobs))
+        self._jobs: "OrderedDict[str, AiMoveJob]" = OrderedDict()
+
+    def submit(
+        self,
+        game_id: str,
+        packed_position: bytes,
+        time_limit: float,
+        max_depth: int = search.MAX_DEPTH,
+    ) -> AiMoveJob:
+        with self._lock:
+            if not self._free_slots:
+                raise JobQueueFullError("Too many pending AI move jobs")
+            slot = self._free_slots.pop()
+            self._stop_flags[slot] = 0
+            future = self._get_executor().submit(
+                _search_move, packed_position, time_limit, max_depth, slot
+            )
+            job = AiMoveJob(str(uuid.uuid4()), game_id, future, slot)
+            self._jobs[job.id] = job
+            self._forget_finished_jobs()
+        if self._job_store is not None:
+            self._job_store.add_job(data.JobRecord(job.id, game_id, QUEUED))
+        # Outside of the lock, because the callback runs right away if the job
+        # is already done.
+        future.add_done_callback(lambda _: self._finish_job(job))
+        return job
+
+    def get(self, job_id: str) -> Union[AiMoveJob, StoredAiMoveJob]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            if self._job_store is None:
+                raise data.NotFoundError("Not found")
+            return StoredAiMoveJob(self._job_store.get_job(job_id))
+        if self._job_store is not None and not job.future.done():
+            # Another process may have cancelled the job.
+            if self._job_store.get_job(job_id).status == CANCELLED:
+                self._stop_job(job)
+        return job
+
+    def cancel(self, job_id: str) -> Union[AiMoveJob, StoredAiMoveJob]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            if self._job_store is None:
+                raise data.NotFoundError("Not found")
+            # A job of another process. Its result is thrown away, but its
+            # search runs on until that process gets the job, or to its time
+            # limit. A finished job keeps its result.
+            return StoredAiMoveJob(self._job_store.finish_job(job_id, CANCELLED))
+        if not job.future.cancel():
+            # Already running: the search stops within a few nodes and its
+            # result is thrown away.
+            self._stop_job(job)
+        return job
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Started on first use, so that importing the app starts no processes.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self._max_workers,
+                initializer=_init_worker,
+                initargs=(self._stop_flags, self._book_path, self._tablebase_directory),
+            )
+        return self._executor
+
+    def _stop_job(self, job: AiMoveJob):
+        # A finished job may have passed on its slot already.
+        with self._lock:
+            if not job.future.done():
+                job.cancelled = True
+                self._stop_flags[job.slot] = 1
+
+    def _finish_job(self, job: AiMoveJob):
+        # The status is taken under the lock, so that it is the same as the one
+        # a concurrent `_stop_job` leaves.
+        with self._lock:
+            self._free_slots.append(job.slot)
+            status = job.status
+        if self._job_store is not None:
+            self._job_store.finish_job(job.id, status, _dump_result(job.result))
+
+    def _forget_finished_jobs(self):
+        # Keeps the oldest finished jobs only up to `max_kept_jobs`.
+        for job_id in tuple(self._jobs):
+            if len(self._jobs) <= self._max_kept_jobs:
+                break
+            if self._jobs[job_id].future.done():
+                del self._jobs[job_id]
+
+
+def _dump_result(result: Optional[AiMoveResult]) -> Optional[str]:
+    if result is None:
+        return None
+    move = None
+    if result.move is not None:
+        move = [
+            engine.get_square_index(result.move.source),
+            engine.get_square_index(result.move.target),
+        ]
+    return json.dumps(
+        {
+            "move": move,
+            "score": result.score,
+            "depth": result.depth,
+            "nodes": result.nodes,
+        }
+    )
+
+
+def _load_result(dumped_result: Optional[str]) -> Optional[AiMoveResult]:
+    if dumped_result is None:
+        return None
+    result = json.loads(dumped_result)
+    move = None
+    if result["move"] is not None:
+        source, target = result["move"]
+        move = engine.Move(engine.get_position(source), engine.get_position(target))
+    return AiMoveResult(move, result["score"], result["depth"], result["nodes"])
+
+
+_stop_flags = None
+_opening_book: Optional[book.OpeningBook] = None
+_endgame_tablebase: Optional[tablebase.Tablebase] = None
+
+
+def _init_worker(
+    stop_flags, book_path: Optional[str], tablebase_directory: Optional[str]
+):
+    global _stop_flags, _opening_book, _endgame_tablebase
+    _stop_flags = stop_flags
+    # Every worker maps the book and table files, which costs no memory of its
+    # own. Tablebase results are cached per worker.
+    _opening_book = book.OpeningBook(book_path) if book_path else None
+    _endgame_tablebase = (
+        tablebase.open_tablebase(tablebase_directory) if tablebase_directory else None
+    )
+
+
+def _search_move(
+    packed_position: bytes, time_limit: float, max_depth: int, slot: int
+) -> AiMoveResult:
+    figure_builder = engine.FigureBuilder(engine.FigureFactory())
+    figures, in_turn = packing.unpack_position(packed_position, figure_builder)
+    result = search.search(
+        engine.Game(figures, in_turn),
+        max_depth,
+        time_limit,
+        should_stop=lambda: _stop_flags[slot] != 0,
+        opening_book=_opening_book,
+        endgame_tablebase=_endgame_tablebase,
+    )
+    return AiMoveResult(result.best_move, result.score, result.depth, result.nodes)
@@ -0,0 +1,60 @@
+import json
+from chessbackend.cli import analyse
+
+POSITIONS = """\
+# Comments and empty lines are skipped.
+6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1
+
+8/3k4/8/8/8/8/3K4/8 w - - bm Kc3; id "kings";
+not a position
+"""
+
+
+def test_read_positions():
+    records = list(analyse.read_positions(POSITIONS.splitlines()))
+    assert [record.index for record in records] == [0, 1, 2]
+    assert records[0].fen == "6k1/5ppp/8/8/8/8/8/R5K1 w - -"
+    assert records[1] == analyse.PositionRecord(1, "kings", "8/3k4/8/8/8/8/3K4/8 w - -")
+
+
+def test_read_pgn_positions(capsys):
+    games = '[Event "?"]\n\n1. e4 e5 2. Nf3 1-0\n\n1. e4 Kf3 *\n'
+    records = list(analyse.read_pgn_positions(games.splitlines()))
+    assert [record.id for record in records] == ["1:0", "1:1", "1:2", "2:0"]
+    assert records[2].played_move == "Nf3"
+    assert records[3].fen.startswith("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w")
+    # The second game stops at the illegal king move.
+    assert "Game 2, ply 1" in capsys.readouterr().err
+
+
+def test_analyse_keeps_input_order():
+    records = analyse.read_positions(POSITIONS.splitlines())
+    results = list(analyse.analyse(records, max_depth=2, workers=2))
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert results[0]["bestMove"] == "a1a8"
+    assert results[1]["id"] == "kings"
+    assert "error" in results[2]
+
+
+def test_main_resumes(tmp_path):
+    input_path = tmp_path / "positions.epd"
+    input_path.write_text(POSITIONS)
+    output_path = tmp_path / "results.jsonl"
+    # An earlier run that finished the first position and was stopped while
+    # writing the second.
+    output_path.write_text('{"index": 0}\n{"index": 1, "fe')
+
+    analyse.main(
+        [
+            str(input_path),
+            "--depth",
+            "1",
+            "--workers",
+            "1",
+            "--output",
+            str(output_path),
+        ]
+    )
+    lines = output_path.read_text().splitlines()
+    assert [json.loads(line)["index"] for line in lines] == [0, 1, 2]
+    assert analyse.count_results(str(output_path)) == 3
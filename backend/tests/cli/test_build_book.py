@@ -0,0 +1,18 @@
+from chessbackend.cli import book as book_cli
+from chessbackend.engine import book
+
+
+def test_main(tmp_path, capsys):
+    input_path = tmp_path / "games.pgn"
+    input_path.write_text("1. e4 e5 1-0\n\n1. d4 Ke2 0-1\n")
+    output_path = tmp_path / "book.bin"
+
+    book_cli.main([str(input_path), str(output_path)])
+
+    output = capsys.readouterr()
+    assert "2 games, 1 book entries" in output.out
+    # Only e4 is in the book: e5 and d4 lost, and the illegal king move ends
+    # the second game.
+    assert "Game 2" in output.err
+    with book.OpeningBook(str(output_path)) as opening_book:
+        assert len(opening_book) == 1
@@ -0,0 +1,13 @@
+from chessbackend import engine
+from chessbackend.cli import formatting
+
+
+def test_format_move():
+    move = engine.Move(engine.Position(4, 1), engine.Position(4, 3))
+    assert formatting.format_move(move) == "e2e4"
+    assert formatting.format_move(None) == "none"
+
+
+def test_format_speed():
+    assert formatting.format_speed(1000, 0.5) == "0.500s, 2000 nodes/s"
+    assert formatting.format_speed(1000, 0) == "0.000s, inf nodes/s"
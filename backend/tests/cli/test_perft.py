@@ -0,0 +1,46 @@
+import pytest
+from chessbackend import engine
+from chessbackend.cli import perft
+from chessbackend.engine import fen
+
+
+@pytest.mark.parametrize("position", perft.REFERENCE_SUITE)
+def test_reference_suite(position):
+    game = engine.Game.from_fen(position.fen)
+    start_hash = game.hash
+    for depth, expected_nodes in enumerate(position.node_counts[:2], start=1):
+        assert perft.perft(game, depth) == expected_nodes
+    assert game.hash == start_hash
+
+
+def test_divide():
+    game = engine.Game.from_fen(fen.START_FEN)
+    node_counts = perft.divide(game, 2)
+    assert len(node_counts) == 20
+    assert sum(node_counts.values()) == 400
+    assert node_counts[engine.Move(engine.Position(4, 1), engine.Position(4, 3))] == 20
+
+
+def test_main(capsys):
+    perft.main(["--depth", "2", "--fen", "8/3k4/8/8/8/8/3K4/8 w - - 0 1"])
+    assert "depth 2: 64 nodes" in capsys.readouterr().out
+
+
+def test_main_suite_fails_on_wrong_count(monkeypatch):
+    wrong_suite = (perft.PerftPosition(fen.START_FEN, (21,)),)
+    monkeypatch.setattr(perft, "REFERENCE_SUITE", wrong_suite)
+    with pytest.raises(SystemExit) as exit_info:
+        perft.main(["--suite", "--depth", "1"])
+    assert exit_info.value.code == 1
+
+
+@pytest.mark.parametrize("depth", ["0", "-1"])
+def test_main_rejects_depth_below_one(depth):
+    with pytest.raises(SystemExit) as exit_info:
+        perft.main(["--depth", depth, "--divide"])
+    assert exit_info.value.code == 2
+
+
+def test_perft_depth_zero():
+    assert perft.perft(engine.Game.from_fen(fen.START_FEN), 0) == 1
+    assert perft.perft(engine.Game.from_fen(fen.START_FEN), -1) == 1
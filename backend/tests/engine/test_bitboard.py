@@ -0,0 +1,116 @@
+import pytest
+from chessbackend import engine
+from chessbackend.engine import zobrist
+
+figure_factory = engine.FigureFactory()
+figure_builder = engine.FigureBuilder(figure_factory)
+
+
+def _get_all_moves(game):
+    return {
+        (figure.position, target)
+        for figure in game.figures
+        for target in game.get_all_target_positions(figure.position)
+    }
+
+
+def test_default_position_has_same_moves_as_game():
+    figures = engine.build_default_figures(figure_builder)
+    bitboard_game = engine.BitboardGame(figures)
+    game = engine.Game(figures)
+    assert len(_get_all_moves(bitboard_game)) == 20
+    assert _get_all_moves(bitboard_game) == _get_all_moves(game)
+    assert set(bitboard_game.get_all_possible_moves()) == set(
+        game.get_all_possible_moves()
+    )
+
+
+def test_hash_matches_game():
+    game = engine.Game.from_fen("4k3/8/8/8/3p4/8/8/R3K3 w - - 0 1")
+    bitboard_game = engine.BitboardGame.from_fen(game.to_fen())
+    moves = (
+        engine.Move(engine.Position(0, 0), engine.Position(0, 3)),
+        engine.Move(engine.Position(4, 7), engine.Position(3, 7)),
+        engine.Move(engine.Position(0, 3), engine.Position(3, 3)),
+    )
+    for move in moves:
+        game.make_move(move)
+        bitboard_game.make_move(move)
+        assert bitboard_game.hash == game.hash
+    bitboard_game.in_turn = engine.Colour.WHITE
+    assert bitboard_game.hash == zobrist.compute_hash(
+        bitboard_game.figures, engine.Colour.WHITE
+    )
+
+
+def test_make_move_keeps_figures():
+    figures = engine.build_default_figures(figure_builder)
+    game = engine.BitboardGame(figures)
+    game.make_move(engine.Move(engine.Position(6, 0), engine.Position(5, 2)))
+    assert game.in_turn == engine.Colour.BLACK
+    assert len(game.figures) == 32
+    knight = next(fig for fig in game.figures if fig.position == (5, 2))
+    assert knight.name == "Knight"
+    assert knight.colour == engine.Colour.WHITE
+
+
+def test_capture_removes_figure():
+    white_rook = figure_builder.build_rook(engine.Colour.WHITE, engine.Position(0, 0))
+    black_rook = figure_builder.build_rook(engine.Colour.BLACK, engine.Position(0, 5))
+    game = engine.BitboardGame((white_rook, black_rook))
+    game.make_move(engine.Move(white_rook.position, black_rook.position))
+    assert len(game.figures) == 1
+    assert game.figures[0].position == black_rook.position
+
+
+def test_sliding_moves_stop_at_blockers():
+    queen = figure_builder.build_queen(engine.Colour.WHITE, engine.Position(3, 3))
+    blocker = figure_builder.build_pawn(engine.Colour.WHITE, engine.Position(3, 4))
+    game = engine.BitboardGame((queen, blocker))
+    target_positions = game.get_all_target_positions(queen.position)
+    assert len(target_positions) == 23
+    assert engine.Position(3, 5) not in target_positions
+
+
+def test_make_move_raises_error_on_invalid_move():
+    white_rook = figure_builder.build_rook(engine.Colour.WHITE, engine.Position(0, 1))
+    game = engine.BitboardGame((white_rook,))
+    invalid_move = engine.Move(white_rook.position, engine.Position(1, 2))
+    assert not game.is_move_possible(invalid_move)
+    with pytest.raises(ValueError):
+        game.make_move(invalid_move)
+
+
+def test_cannot_expose_own_king():
+    white_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(4, 0))
+    white_bishop = figure_builder.build_bishop(
+        engine.Colour.WHITE, engine.Position(4, 1)
+    )
+    black_rook = figure_builder.build_rook(engine.Colour.BLACK, engine.Position(4, 7))
+    game = engine.BitboardGame((white_king, white_bishop, black_rook))
+    assert game.get_all_target_positions(white_bishop.position) == tuple()
+
+
+def test_checkmate_and_stalemate():
+    white_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(0, 0))
+    first_black_rook = figure_builder.build_rook(
+        engine.Colour.BLACK, engine.Position(0, 7)
+    )
+    second_black_rook = figure_builder.build_rook(
+        engine.Colour.BLACK, engine.Position(1, 7)
+    )
+    checkmate_game = engine.BitboardGame(
+        (white_king, first_black_rook, second_black_rook)
+    )
+    assert checkmate_game.is_check()
+    assert checkmate_game.is_checkmate()
+    assert not checkmate_game.is_stalemate()
+
+    third_black_rook = figure_builder.build_rook(
+        engine.Colour.BLACK, engine.Position(7, 1)
+    )
+    stalemate_game = engine.BitboardGame(
+        (white_king, second_black_rook, third_black_rook)
+    )
+    assert not stalemate_game.is_check()
+    assert stalemate_game.is_stalemate()
@@ -0,0 +1,83 @@
+import io
+import random
+import pytest
+from chessbackend import engine
+from chessbackend.engine import book, fen, pgn, search
+
+GAMES = """\
+1. e4 e5 2. Nf3 1-0
+
+1. e4 c5 0-1
+
+1. d4 d5 1/2-1/2
+"""
+
+
+def _move(source, target):
+    return engine.Move(engine.parse_field_name(source), engine.parse_field_name(target))
+
+
+@pytest.fixture
+def book_path(tmp_path):
+    builder = book.BookBuilder(max_ply=2)
+    for game in pgn.read_games(io.StringIO(GAMES)):
+        builder.add_game(game)
+    path = str(tmp_path / "book.bin")
+    builder.write(path)
+    return path
+
+
+def test_book_entries(book_path):
+    start_game = engine.Game.from_fen(fen.START_FEN)
+    with book.OpeningBook(book_path) as opening_book:
+        # e4 won once and lost once, d4 was drawn. Nf3 is past the maximum ply,
+        # and black's e5 lost.
+        assert len(opening_book) == 4
+        assert set(opening_book.get_entries(start_game.hash)) == {
+            book.BookEntry(_move("e2", "e4"), book.WIN_WEIGHT),
+            book.BookEntry(_move("d2", "d4"), book.DRAW_WEIGHT),
+        }
+        start_game.push(_move("e2", "e4"))
+        assert opening_book.get_entries(start_game.hash) == (
+            book.BookEntry(_move("c7", "c5"), book.WIN_WEIGHT),
+        )
+        assert opening_book.get_entries(12345) == ()
+
+
+def test_choose_move(book_path):
+    game = engine.BitboardGame.from_fen(fen.START_FEN)
+    with book.OpeningBook(book_path) as opening_book:
+        moves = {
+            opening_book.choose_move(game, random.Random(seed)) for seed in range(20)
+        }
+        assert moves == {_move("e2", "e4"), _move("d2", "d4")}
+        assert (
+            opening_book.choose_move(engine.Game.from_fen("4k3/8/8/8/8/8/8/4K3 w - -"))
+            is None
+        )
+
+
+def test_search_plays_book_move(book_path):
+    game = engine.Game.from_fen(fen.START_FEN)
+    with book.OpeningBook(book_path) as opening_book:
+        result = search.search(game, max_depth=3, opening_book=opening_book)
+    assert result.best_move in {_move("e2", "e4"), _move("d2", "d4")}
+    assert result.nodes == 0
+
+
+def test_empty_and_invalid_book_files(tmp_path):
+    empty_path = tmp_path / "empty.bin"
+    empty_path.write_bytes(b"")
+    with book.OpeningBook(str(empty_path)) as opening_book:
+        assert opening_book.get_entries(0) == ()
+    invalid_path = tmp_path / "invalid.bin"
+    invalid_path.write_bytes(b"\0" * 17)
+    with pytest.raises(book.BookError):
+        book.OpeningBook(str(invalid_path))
+
+
+def test_encode_move():
+    move = _move("g1", "f3")
+    # Polyglot encoding of g1f3.
+    assert book.encode_move(move) == 6 << 6 | 21
+    assert book.decode_move(book.encode_move(move)) == move
@@ -14,30 +14,34 @@ class TestLinearMovements:
     def test_horizontal_move(build_figure):
         moving_figure = build_figure(engine.Colour.WHITE, engine.Position(3, 3))
         move = engine.Move(engine.Position(3, 3), engine.Position(3, 4))
-        assert moving_figure.is_move_possible(move, (moving_figure,))
-        moving_figure, *_ = moving_figure.execute_move(move, (moving_figure,))
+        assert moving_figure.is_move_possible(move, engine.Board((moving_figure,)))
+        moving_figure, *_ = moving_figure.execute_move(
+            move, engine.Board((moving_figure,))
+        )
         assert moving_figure.position == move.target
 
     @staticmethod
     def test_vertical_move(build_figure):
         moving_figure = build_figure(engine.Colour.WHITE, engine.Position(3, 3))
         move = engine.Move(engine.Position(3, 3), engine.Position(4, 3))
-        assert moving_figure.is_move_possible(move, (moving_figure,))
-        moving_figure, *_ = moving_figure.execute_move(move, (moving_figure,))
+        assert moving_figure.is_move_possible(move, engine.Board((moving_figure,)))
+        moving_figure, *_ = moving_figure.execute_move(
+            move, engine.Board((moving_figure,))
+        )
         assert moving_figure.position == move.target
 
     @staticmethod
     def test_illegal_move(build_figure):
         moving_figure = build_figure(engine.Colour.WHITE, engine.Position(3, 3))
         move = engine.Move(engine.Position(3, 3), engine.Position(4, 5))
-        assert not moving_figure.is_move_possible(move, (moving_figure,))
+        assert not moving_figure.is_move_possible(move, engine.Board((moving_figure,)))
 
     @staticmethod
     def test_beat_figure(build_figure):
         moving_figure = build_figure(engine.Colour.WHITE, engine.Position(3, 3))
         fig_opposite_color = build_figure(engine.Colour.BLACK, engine.Position(4, 3))
         move = engine.Move(engine.Position(3, 3), engine.Position(4, 3))
-        figures = (moving_figure, fig_opposite_color)
+        figures = engine.Board((moving_figure, fig_opposite_color))
         assert moving_figure.is_move_possible(move, figures)
         figures_after_move = moving_figure.execute_move(move, figures)
         assert len(figures_after_move) == 1
@@ -49,7 +53,7 @@ class TestLinearMovements:
         moving_figure = build_figure(engine.Colour.WHITE, engine.Position(3, 3))
         fig_same_color = build_figure(engine.Colour.WHITE, engine.Position(4, 3))
         move = engine.Move(engine.Position(3, 3), engine.Position(4, 3))
-        figures = (moving_figure, fig_same_color)
+        figures = engine.Board((moving_figure, fig_same_color))
         assert not moving_figure.is_move_possible(move, figures)
 
     @staticmethod
@@ -59,7 +63,9 @@ class TestLinearMovements:
         fig_in_horizontal_way = build_figure(engine.Colour.WHITE, engine.Position(3, 4))
         vertical_move = engine.Move(engine.Position(3, 3), engine.Position(5, 3))
         horizontal_move = engine.Move(engine.Position(3, 3), engine.Position(3, 5))
-        figures = (moving_figure, fig_in_vertical_way, fig_in_horizontal_way)
+        figures = engine.Board(
+            (moving_figure, fig_in_vertical_way, fig_in_horizontal_way)
+        )
         assert not moving_figure.is_move_possible(vertical_move, figures)
         assert not moving_figure.is_move_possible(horizontal_move, figures)
 
@@ -72,22 +78,24 @@ class TestLinearMovements:
     def test_diagonal_move(build_figure):
         moving_figure = build_figure(engine.Colour.WHITE, engine.Position(3, 3))
         move = engine.Move(engine.Position(3, 3), engine.Position(5, 5))
-        assert moving_figure.is_move_possible(move, (moving_figure,))
-        moving_figure, *_ = moving_figure.execute_move(move, (moving_figure,))
+        assert moving_figure.is_move_possible(move, engine.Board((moving_figure,)))
+        moving_figure, *_ = moving_figure.execute_move(
+            move, engine.Board((moving_figure,))
+        )
         assert moving_figure.position == move.target
 
     @staticmethod
     def test_illegal_move(build_figure):
         moving_figure = build_figure(engine.Colour.WHITE, engine.Position(3, 3))
         move = engine.Move(engine.Position(3, 3), engine.Position(4, 5))
-        assert not moving_figure.is_move_possible(move, (moving_figure,))
+        assert not moving_figure.is_move_possible(move, engine.Board((moving_figure,)))
 
     @staticmethod
     def test_beat_figure(build_figure):
         moving_figure = build_figure(engine.Colour.WHITE, engine.Position(3, 3))
         fig_opposite_color = build_figure(engine.Colour.BLACK, engine.Position(4, 4))
         move = engine.Move(engine.Position(3, 3), engine.Position(4, 4))
-        figures = (moving_figure, fig_opposite_color)
+        figures = engine.Board((moving_figure, fig_opposite_color))
         assert moving_figure.is_move_possible(move, figures)
         figures_after_move = moving_figure.execute_move(move, figures)
         assert len(figures_after_move) == 1
@@ -99,7 +107,7 @@ class TestLinearMovements:
         moving_figure = build_figure(engine.Colour.WHITE, engine.Position(3, 3))
         fig_same_color = build_figure(engine.Colour.WHITE, engine.Position(4, 4))
         move = engine.Move(engine.Position(3, 3), engine.Position(4, 4))
-        figures = (moving_figure, fig_same_color)
+        figures = engine.Board((moving_figure, fig_same_color))
         assert not moving_figure.is_move_possible(move, figures)
 
     @staticmethod
@@ -107,7 +115,7 @@ class TestLinearMovements:
         moving_figure = build_figure(engine.Colour.WHITE, engine.Position(3, 3))
         fig_in_way = build_figure(engine.Colour.WHITE, engine.Position(4, 4))
         move = engine.Move(engine.Position(3, 3), engine.Position(5, 5))
-        figures = (moving_figure, fig_in_way)
+        figures = engine.Board((moving_figure, fig_in_way))
         assert not moving_figure.is_move_possible(move, figures)
 
 
@@ -125,7 +133,7 @@ class TestKnightMovements:
             engine.Colour.WHITE, source_position
         )
         move = engine.Move(source_position, target_position)
-        figures = (moving_figure,)
+        figures = engine.Board((moving_figure,))
         assert moving_figure.is_move_possible(move, figures)
         moving_figure, *_ = moving_figure.execute_move(move, figures)
         assert moving_figure.position == target_position
@@ -143,7 +151,7 @@ class TestKnightMovements:
             engine.Colour.WHITE, source_position
         )
         move = engine.Move(source_position, target_position)
-        figures = (moving_figure,)
+        figures = engine.Board((moving_figure,))
         assert not moving_figure.is_move_possible(move, figures)
 
     @staticmethod
@@ -155,7 +163,7 @@ class TestKnightMovements:
             engine.Colour.WHITE, engine.Position(2, 3)
         )
         move = engine.Move(engine.Position(4, 4), engine.Position(2, 3))
-        figures = (moving_figure, fig_same_color)
+        figures = engine.Board((moving_figure, fig_same_color))
         assert not moving_figure.is_move_possible(move, figures)
 
     @staticmethod
@@ -167,7 +175,7 @@ class TestKnightMovements:
             engine.Colour.BLACK, engine.Position(2, 3)
         )
         move = engine.Move(engine.Position(4, 4), engine.Position(2, 3))
-        figures = (moving_figure, fig_opposite_color)
+        figures = engine.Board((moving_figure, fig_opposite_color))
         assert moving_figure.is_move_possible(move, figures)
         figures_after_move = moving_figure.execute_move(move, figures)
         assert len(figures_after_move) == 1
@@ -188,7 +196,7 @@ class TestKingRegularMovements:
     def test_king_movement(source_position, target_position):
         moving_figure = figure_builder.build_king(engine.Colour.WHITE, source_position)
         move = engine.Move(source_position, target_position)
-        figures = (moving_figure,)
+        figures = engine.Board((moving_figure,))
         assert moving_figure.is_move_possible(move, figures)
         moving_figure, *_ = moving_figure.execute_move(move, figures)
         assert moving_figure.position == target_position
@@ -205,7 +213,7 @@ class TestKingRegularMovements:
     def test_king_movement(self, source_position, target_position):
         moving_figure = figure_builder.build_king(engine.Colour.WHITE, source_position)
         move = engine.Move(source_position, target_position)
-        figures = (moving_figure,)
+        figures = engine.Board((moving_figure,))
         assert not moving_figure.is_move_possible(move, figures)
 
 
@@ -230,7 +238,7 @@ class TestPawnForwardMovement:
     def test_pawn_move_forward(self, colour, source_position, target_position):
         moving_figure = figure_builder.build_pawn(colour, source_position)
         move = engine.Move(source_position, target_position)
-        figures = (moving_figure,)
+        figures = engine.Board((moving_figure,))
         assert moving_figure.is_move_possible(move, figures)
 
     @pytest.mark.parametrize(
@@ -245,7 +253,7 @@ class TestPawnForwardMovement:
     def test_pawn_invalid_move_forward(self, colour, source_position, target_position):
         moving_figure = figure_builder.build_pawn(colour, source_position)
         move = engine.Move(source_position, target_position)
-        figures = (moving_figure,)
+        figures = engine.Board((moving_figure,))
         assert not moving_figure.is_move_possible(move, figures)
 
     @staticmethod
@@ -257,8 +265,10 @@ class TestPawnForwardMovement:
             engine.Colour.BLACK, engine.Position(2, 3)
         )
         move = engine.Move(moving_figure.position, figure_in_way.position)
-        assert moving_figure.is_move_possible(move, (moving_figure,))
-        assert not moving_figure.is_move_possible(move, (moving_figure, figure_in_way))
+        assert moving_figure.is_move_possible(move, engine.Board((moving_figure,)))
+        assert not moving_figure.is_move_possible(
+            move, engine.Board((moving_figure, figure_in_way))
+        )
 
 
 class TestPawnCaptureMovement:
@@ -271,9 +281,9 @@ class TestPawnCaptureMovement:
             engine.Colour.BLACK, engine.Position(3, 3)
         )
         move = engine.Move(moving_figure.position, fig_to_capture.position)
-        figures = (moving_figure, fig_to_capture)
+        figures = engine.Board((moving_figure, fig_to_capture))
         assert moving_figure.is_move_possible(move, figures)
-        assert not moving_figure.is_move_possible(move, (moving_figure,))
+        assert not moving_figure.is_move_possible(move, engine.Board((moving_figure,)))
 
         figures_after_move = moving_figure.execute_move(move, figures)
         assert len(figures_after_move) == 1
@@ -289,9 +299,9 @@ class TestPawnCaptureMovement:
             engine.Colour.WHITE, engine.Position(2, 2)
         )
         move = engine.Move(moving_figure.position, fig_to_capture.position)
-        figures = (moving_figure, fig_to_capture)
+        figures = engine.Board((moving_figure, fig_to_capture))
         assert moving_figure.is_move_possible(move, figures)
-        assert not moving_figure.is_move_possible(move, (moving_figure,))
+        assert not moving_figure.is_move_possible(move, engine.Board((moving_figure,)))
 
         figures_after_move = moving_figure.execute_move(move, figures)
         assert len(figures_after_move) == 1
@@ -308,6 +318,93 @@ def test_build_default_figures():
     assert len(black_figures) == len(white_figures)
 
 
+def test_build_figure_by_code():
+    for code, name in enumerate(engine.FIGURE_NAMES):
+        figure = figure_builder.build(code, engine.Colour.WHITE, engine.Position(0, 0))
+        assert (figure.code, figure.name) == (code, name)
+    queen = figure_builder.build_queen(engine.Colour.BLACK, engine.Position(3, 7))
+    assert queen.code == engine.QUEEN
+
+
 def test_position_equal():
     assert engine.Position(3, 3) == engine.Position(3, 3)
     assert engine.Position(3, 3) != engine.Position(3, 4)
+
+
+class TestGetAllPossibleMoves:
+    @staticmethod
+    def test_rook_moves_stop_at_blockers():
+        rook = figure_builder.build_rook(engine.Colour.WHITE, engine.Position(0, 0))
+        own_pawn = figure_builder.build_pawn(engine.Colour.WHITE, engine.Position(0, 2))
+        enemy_pawn = figure_builder.build_pawn(
+            engine.Colour.BLACK, engine.Position(3, 0)
+        )
+        figures = engine.Board((rook, own_pawn, enemy_pawn))
+        targets = {move.target for move in rook.get_all_possible_moves(figures)}
+        assert targets == {
+            engine.Position(0, 1),
+            engine.Position(1, 0),
+            engine.Position(2, 0),
+            engine.Position(3, 0),
+        }
+
+    @staticmethod
+    def test_knight_moves_in_corner():
+        knight = figure_builder.build_knight(engine.Colour.WHITE, engine.Position(0, 0))
+        targets = {
+            move.target
+            for move in knight.get_all_possible_moves(engine.Board((knight,)))
+        }
+        assert targets == {engine.Position(1, 2), engine.Position(2, 1)}
+
+    @staticmethod
+    def test_queen_moves_on_empty_board():
+        queen = figure_builder.build_queen(engine.Colour.WHITE, engine.Position(3, 3))
+        assert len(queen.get_all_possible_moves(engine.Board((queen,)))) == 27
+
+    @staticmethod
+    def test_pawn_moves_from_start():
+        pawn = figure_builder.build_pawn(engine.Colour.BLACK, engine.Position(4, 6))
+        enemy_pawn = figure_builder.build_pawn(
+            engine.Colour.WHITE, engine.Position(5, 5)
+        )
+        figures = engine.Board((pawn, enemy_pawn))
+        targets = {move.target for move in pawn.get_all_possible_moves(figures)}
+        assert targets == {
+            engine.Position(4, 5),
+            engine.Position(4, 4),
+            engine.Position(5, 5),
+        }
+
+    @staticmethod
+    def test_pawn_cannot_jump_over_figure():
+        pawn = figure_builder.build_pawn(engine.Colour.WHITE, engine.Position(4, 1))
+        blocker = figure_builder.build_knight(
+            engine.Colour.BLACK, engine.Position(4, 2)
+        )
+        assert pawn.get_all_possible_moves(engine.Board((pawn, blocker))) == tuple()
+
+
+class TestBoard:
+    @staticmethod
+    def test_get_figure():
+        king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(4, 0))
+        pawn = figure_builder.build_pawn(engine.Colour.BLACK, engine.Position(4, 6))
+        board = engine.Board((king, pawn))
+        assert board.get(engine.Position(4, 0)) is king
+        assert board.get(engine.Position(4, 6)) is pawn
+        assert board.get(engine.Position(4, 4)) is None
+        assert board.get(engine.Position(-1, 8)) is None
+        assert engine.get_figure_at_position(board, pawn.position) is pawn
+
+    @staticmethod
+    def test_remove_and_place():
+        king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(4, 0))
+        board = engine.Board((king,))
+        assert board.get_king(engine.Colour.WHITE) is king
+        assert board.remove(king.position) is king
+        assert len(board) == 0
+        assert board.get_king(engine.Colour.WHITE) is None
+        board.place(king)
+        assert tuple(board) == (king,)
+        assert board.get_king(engine.Colour.WHITE) is king
@@ -0,0 +1,62 @@
+from chessbackend import engine
+from chessbackend.engine import evaluation
+
+figure_factory = engine.FigureFactory()
+figure_builder = engine.FigureBuilder(figure_factory)
+
+
+def test_default_position_is_balanced():
+    game = engine.Game(engine.build_default_figures(figure_builder))
+    assert game.evaluation.get_score(engine.Colour.WHITE) == 0
+    assert game.evaluation.get_score(engine.Colour.BLACK) == 0
+
+
+def test_evaluation_is_updated_incrementally():
+    game = engine.Game(engine.build_default_figures(figure_builder))
+    moves = (
+        engine.Move(engine.Position(4, 1), engine.Position(4, 3)),
+        engine.Move(engine.Position(3, 6), engine.Position(3, 4)),
+        engine.Move(engine.Position(4, 3), engine.Position(3, 4)),
+    )
+    for move in moves:
+        game.make_move(move)
+        recomputed_evaluation = evaluation.Evaluation(game.figures)
+        assert game.evaluation.get_score(
+            engine.Colour.WHITE
+        ) == recomputed_evaluation.get_score(engine.Colour.WHITE)
+
+    assert game.evaluation.get_score(engine.Colour.WHITE) > 0
+    assert game.evaluation.get_score(engine.Colour.BLACK) == -game.evaluation.get_score(
+        engine.Colour.WHITE
+    )
+
+    for _ in moves:
+        game.pop()
+    assert game.evaluation.get_score(engine.Colour.WHITE) == 0
+
+
+def test_king_prefers_center_in_endgame():
+    black_king = figure_builder.build_king(engine.Colour.BLACK, engine.Position(4, 7))
+    center_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(3, 3))
+    corner_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(6, 0))
+    center_evaluation = evaluation.Evaluation((center_king, black_king))
+    corner_evaluation = evaluation.Evaluation((corner_king, black_king))
+    assert center_evaluation.get_score(
+        engine.Colour.WHITE
+    ) > corner_evaluation.get_score(engine.Colour.WHITE)
+
+
+def test_king_prefers_corner_in_middlegame():
+    figures = engine.build_default_figures(figure_builder)
+    other_figures = tuple(
+        fig
+        for fig in figures
+        if not (fig.name == "King" and fig.colour == engine.Colour.WHITE)
+    )
+    center_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(3, 3))
+    corner_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(6, 0))
+    center_evaluation = evaluation.Evaluation(other_figures + (center_king,))
+    corner_evaluation = evaluation.Evaluation(other_figures + (corner_king,))
+    assert center_evaluation.get_score(
+        engine.Colour.WHITE
+    ) < corner_evaluation.get_score(engine.Colour.WHITE)
@@ -0,0 +1,60 @@
+import pytest
+from chessbackend import engine
+from chessbackend.engine import fen
+
+figure_factory = engine.FigureFactory()
+figure_builder = engine.FigureBuilder(figure_factory)
+
+
+def test_parse_start_fen():
+    figures, in_turn = fen.parse_fen(fen.START_FEN, figure_builder)
+    assert in_turn == engine.Colour.WHITE
+    assert len(figures) == 32
+    default_figures = engine.build_default_figures(figure_builder)
+    assert {(fig.name, fig.colour, fig.position) for fig in figures} == {
+        (fig.name, fig.colour, fig.position) for fig in default_figures
+    }
+
+
+def test_parse_fen():
+    figures, in_turn = fen.parse_fen(
+        "8/8/1k6/2b5/2pP4/8/5K2/8 b - - 0 1", figure_builder
+    )
+    assert in_turn == engine.Colour.BLACK
+    board = engine.Board(figures)
+    assert board.get(engine.Position(1, 5)).name == "King"
+    assert board.get(engine.Position(1, 5)).colour == engine.Colour.BLACK
+    assert board.get(engine.Position(3, 3)).name == "Pawn"
+    assert board.get(engine.Position(3, 3)).colour == engine.Colour.WHITE
+
+
+@pytest.mark.parametrize(
+    "fen_string",
+    (
+        "",
+        "8/8/8/8/8/8/8/8",
+        "8/8/8/8/8/8/8 w - - 0 1",
+        "9/8/8/8/8/8/8/8 w - - 0 1",
+        "8/8/8/8/8/8/8/7x w - - 0 1",
+        "8/8/8/8/8/8/8/8 x - - 0 1",
+        "k7/8/8/8/8/8/8/K07 w - - 0 1",
+        # No king, two kings of one colour, the colour not in turn in check.
+        "k7/8/8/8/8/8/8/8 w - - 0 1",
+        "k7/8/8/8/8/8/8/KK6 w - - 0 1",
+        "k7/8/8/8/8/8/8/R3K3 w - - 0 1",
+    ),
+)
+def test_parse_invalid_fen(fen_string):
+    with pytest.raises(fen.FenError):
+        fen.parse_fen(fen_string, figure_builder)
+
+
+@pytest.mark.parametrize("game_class", (engine.Game, engine.BitboardGame))
+def test_game_fen_round_trip(game_class):
+    fen_string = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b - - 0 1"
+    game = game_class.from_fen(fen_string)
+    assert game.to_fen() == fen_string
+    game.make_move(engine.Move(engine.Position(6, 7), engine.Position(5, 5)))
+    assert game.to_fen() == (
+        "r1bqkb1r/pppp1ppp/2n2n2/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w - - 0 1"
+    )
@@ -188,3 +188,147 @@ def test_make_move_raises_error_on_invalid_move():
     assert not game.is_move_possible(invalid_move)
     with pytest.raises(ValueError):
         game.make_move(invalid_move)
+
+
+def test_push_and_pop_restore_position():
+    white_rook = figure_builder.build_rook(engine.Colour.WHITE, engine.Position(0, 0))
+    black_rook = figure_builder.build_rook(engine.Colour.BLACK, engine.Position(0, 5))
+    game = engine.Game((white_rook, black_rook), engine.Colour.WHITE)
+
+    move = engine.Move(white_rook.position, black_rook.position)
+    game.push(move)
+    assert game.in_turn == engine.Colour.BLACK
+    assert len(game.figures) == 1
+    assert game.board.get(engine.Position(0, 5)).colour == engine.Colour.WHITE
+
+    assert game.pop() == move
+    assert game.in_turn == engine.Colour.WHITE
+    assert len(game.figures) == 2
+    assert game.board.get(engine.Position(0, 0)).colour == engine.Colour.WHITE
+    assert game.board.get(engine.Position(0, 5)).colour == engine.Colour.BLACK
+
+
+def test_make_move_does_not_change_passed_figures():
+    white_rook = figure_builder.build_rook(engine.Colour.WHITE, engine.Position(0, 0))
+    game = engine.Game((white_rook,), engine.Colour.WHITE)
+    game.make_move(engine.Move(white_rook.position, engine.Position(0, 3)))
+    assert white_rook.position == engine.Position(0, 0)
+    assert game.figures[0].position == engine.Position(0, 3)
+
+
+def test_is_move_possible_rejects_impossible_figure_move():
+    white_rook = figure_builder.build_rook(engine.Colour.WHITE, engine.Position(0, 0))
+    game = engine.Game((white_rook,), engine.Colour.WHITE)
+    assert not game.is_move_possible(
+        engine.Move(white_rook.position, engine.Position(1, 1))
+    )
+
+
+def test_pinned_figure_can_only_move_along_pin_ray():
+    white_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(0, 0))
+    white_queen = figure_builder.build_queen(engine.Colour.WHITE, engine.Position(2, 2))
+    black_bishop = figure_builder.build_bishop(
+        engine.Colour.BLACK, engine.Position(5, 5)
+    )
+    figures = (white_king, white_queen, black_bishop)
+    game = engine.Game(figures, engine.Colour.WHITE)
+
+    queen_target_positions = game.get_all_target_positions(white_queen.position)
+    assert set(queen_target_positions) == {
+        engine.Position(1, 1),
+        engine.Position(3, 3),
+        engine.Position(4, 4),
+        engine.Position(5, 5),
+    }
+
+
+def test_check_can_be_blocked():
+    white_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(0, 0))
+    white_rook = figure_builder.build_rook(engine.Colour.WHITE, engine.Position(7, 3))
+    black_rook = figure_builder.build_rook(engine.Colour.BLACK, engine.Position(0, 7))
+    figures = (white_king, white_rook, black_rook)
+    game = engine.Game(figures, engine.Colour.WHITE)
+
+    assert game.is_check()
+    rook_target_positions = game.get_all_target_positions(white_rook.position)
+    assert set(rook_target_positions) == {engine.Position(0, 3)}
+
+
+def test_only_king_can_move_in_double_check():
+    white_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(4, 0))
+    white_rook = figure_builder.build_rook(engine.Colour.WHITE, engine.Position(0, 2))
+    black_rook = figure_builder.build_rook(engine.Colour.BLACK, engine.Position(4, 7))
+    black_knight = figure_builder.build_knight(
+        engine.Colour.BLACK, engine.Position(3, 2)
+    )
+    figures = (white_king, white_rook, black_rook, black_knight)
+    game = engine.Game(figures, engine.Colour.WHITE)
+
+    assert game.is_check()
+    assert game.get_all_target_positions(white_rook.position) == tuple()
+    assert len(game.get_all_target_positions(white_king.position)) > 0
+
+
+class TestGameHash:
+    @staticmethod
+    def test_hash_is_updated_incrementally():
+        figures = engine.build_default_figures(figure_builder)
+        game = engine.Game(figures)
+        start_hash = game.hash
+        game.make_move(engine.Move(engine.Position(6, 0), engine.Position(5, 2)))
+        assert game.hash != start_hash
+        assert game.hash == engine.Game(game.figures, game.in_turn).hash
+        game.pop()
+        assert game.hash == start_hash
+
+    @staticmethod
+    def test_transpositions_have_same_hash():
+        figures = engine.build_default_figures(figure_builder)
+        knight_first = engine.Game(figures)
+        pawn_first = engine.Game(figures)
+        knight_move = engine.Move(engine.Position(6, 0), engine.Position(5, 2))
+        pawn_move = engine.Move(engine.Position(4, 1), engine.Position(4, 3))
+        black_move = engine.Move(engine.Position(1, 7), engine.Position(2, 5))
+        for move in (knight_move, black_move, pawn_move):
+            knight_first.make_move(move)
+        for move in (pawn_move, black_move, knight_move):
+            pawn_first.make_move(move)
+        assert knight_first.hash == pawn_first.hash
+
+    @staticmethod
+    def test_hash_depends_on_colour_in_turn():
+        figures = engine.build_default_figures(figure_builder)
+        white_in_turn_game = engine.Game(figures, engine.Colour.WHITE)
+        black_in_turn_game = engine.Game(figures, engine.Colour.BLACK)
+        assert white_in_turn_game.hash != black_in_turn_game.hash
+        black_in_turn_game.in_turn = engine.Colour.WHITE
+        assert white_in_turn_game.hash == black_in_turn_game.hash
+
+
+def test_game_get_all_possible_captures():
+    white_rook = figure_builder.build_rook(engine.Colour.WHITE, engine.Position(0, 0))
+    black_pawn = figure_builder.build_pawn(engine.Colour.BLACK, engine.Position(0, 5))
+    black_knight = figure_builder.build_knight(
+        engine.Colour.BLACK, engine.Position(0, 6)
+    )
+    figures = (white_rook, black_pawn, black_knight)
+    game = engine.Game(figures, engine.Colour.WHITE)
+    assert game.get_all_possible_captures() == (
+        engine.Move(white_rook.position, black_pawn.position),
+    )
+
+
+@pytest.mark.parametrize("game_class", [engine.Game, engine.BitboardGame])
+def test_get_status_is_updated_after_move(game_class):
+    # Black to move into a position where white mates with Ra1-a8.
+    game = game_class.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 b - - 0 1")
+    assert game.get_status() == engine.GameStatus(False, False, False)
+
+    game.make_move(engine.Move(engine.Position(7, 6), engine.Position(7, 5)))
+    game.make_move(engine.Move(engine.Position(0, 0), engine.Position(0, 7)))
+    assert game.get_status() == engine.GameStatus(True, False, False)
+
+    game = game_class.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    game.make_move(engine.Move(engine.Position(0, 0), engine.Position(0, 7)))
+    assert game.get_status() == engine.GameStatus(True, True, False)
+    assert game.is_checkmate()
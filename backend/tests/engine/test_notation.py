@@ -0,0 +1,41 @@
+import pytest
+from chessbackend import engine
+from chessbackend.engine import fen, notation
+
+
+def _move(source, target):
+    return engine.Move(engine.parse_field_name(source), engine.parse_field_name(target))
+
+
+@pytest.mark.parametrize(
+    "fen_string, source, target, san",
+    [
+        (fen.START_FEN, "e2", "e4", "e4"),
+        (fen.START_FEN, "g1", "f3", "Nf3"),
+        ("4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1", "e4", "d5", "exd5"),
+        ("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1", "a1", "a8", "Ra8#"),
+        ("6k1/5pp1/8/8/8/8/8/R5K1 w - - 0 1", "a1", "a8", "Ra8+"),
+        ("6k1/8/8/8/8/8/8/R3R1K1 w - - 0 1", "a1", "c1", "Rac1"),
+        ("6k1/8/8/8/R7/8/8/R5K1 w - - 0 1", "a4", "a2", "R4a2"),
+        ("7k/8/8/8/Q1Q5/8/Q7/4K3 w - - 0 1", "a4", "b3", "Qa4b3"),
+    ],
+)
+def test_build_and_parse_san(fen_string, source, target, san):
+    game = engine.Game.from_fen(fen_string)
+    move = _move(source, target)
+    assert notation.build_san(game, move) == san
+    assert notation.parse_san(game, san) == move
+    # The game is not changed by trying out the move.
+    assert game.to_fen().split()[:2] == fen_string.split()[:2]
+
+
+def test_parse_san_with_bitboard_game():
+    game = engine.BitboardGame.from_fen(fen.START_FEN)
+    assert notation.parse_san(game, "Nc3!?") == _move("b1", "c3")
+
+
+@pytest.mark.parametrize("san", ["Rc1", "Ke2", "O-O", "e8=Q", "Zz9"])
+def test_parse_invalid_san(san):
+    game = engine.Game.from_fen("6k1/8/8/8/8/8/4P3/R3R1K1 w - - 0 1")
+    with pytest.raises(notation.SanError):
+        notation.parse_san(game, san)
@@ -0,0 +1,66 @@
+from chessbackend import engine
+from chessbackend.engine import ordering, search
+
+figure_factory = engine.FigureFactory()
+figure_builder = engine.FigureBuilder(figure_factory)
+
+
+def _build_game():
+    white_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(0, 0))
+    white_pawn = figure_builder.build_pawn(engine.Colour.WHITE, engine.Position(3, 3))
+    white_queen = figure_builder.build_queen(engine.Colour.WHITE, engine.Position(4, 0))
+    black_king = figure_builder.build_king(engine.Colour.BLACK, engine.Position(7, 7))
+    black_rook = figure_builder.build_rook(engine.Colour.BLACK, engine.Position(4, 4))
+    black_knight = figure_builder.build_knight(
+        engine.Colour.BLACK, engine.Position(2, 4)
+    )
+    figures = (
+        white_king,
+        white_pawn,
+        white_queen,
+        black_king,
+        black_rook,
+        black_knight,
+    )
+    return engine.Game(figures)
+
+
+def test_captures_ordered_by_victim_then_attacker():
+    game = _build_game()
+    orderer = ordering.HeuristicMoveOrderer()
+    moves = orderer.order_moves(game, game.get_all_possible_moves(), 0, None)
+    assert moves[:3] == (
+        engine.Move(engine.Position(3, 3), engine.Position(4, 4)),
+        engine.Move(engine.Position(4, 0), engine.Position(4, 4)),
+        engine.Move(engine.Position(3, 3), engine.Position(2, 4)),
+    )
+
+
+def test_transposition_move_first():
+    game = _build_game()
+    orderer = ordering.HeuristicMoveOrderer()
+    transposition_move = engine.Move(engine.Position(0, 0), engine.Position(1, 1))
+    moves = orderer.order_moves(
+        game, game.get_all_possible_moves(), 0, transposition_move
+    )
+    assert moves[0] == transposition_move
+
+
+def test_killer_move_before_other_quiet_moves():
+    game = _build_game()
+    orderer = ordering.HeuristicMoveOrderer()
+    killer_move = engine.Move(engine.Position(0, 0), engine.Position(0, 1))
+    orderer.record_cutoff(game, killer_move, 3, 2, 5)
+    moves = orderer.order_moves(game, game.get_all_possible_moves(), 2, None)
+    assert moves[3] == killer_move
+    assert orderer.cutoffs == 1
+    assert orderer.first_move_cutoffs == 0
+
+
+def test_search_counts_cutoffs():
+    game = engine.Game(engine.build_default_figures(figure_builder))
+    orderer = ordering.HeuristicMoveOrderer()
+    search.search(game, max_depth=3, move_orderer=orderer)
+    assert orderer.ordered_nodes > 0
+    assert 0 < orderer.cutoff_rate <= 1
+    assert 0 < orderer.first_move_cutoff_rate <= 1
@@ -0,0 +1,30 @@
+import pytest
+from chessbackend import engine
+from chessbackend.engine import fen, packing
+
+figure_builder = engine.FigureBuilder(engine.FigureFactory())
+
+
+@pytest.mark.parametrize(
+    "fen_string",
+    [
+        fen.START_FEN.replace("KQkq", "-"),
+        "8/8/1k6/2b5/2pP4/8/5K2/8 b - - 0 1",
+        "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1",
+    ],
+)
+def test_pack_and_unpack_position(fen_string):
+    figures, in_turn = fen.parse_fen(fen_string, figure_builder)
+    packed = packing.pack_position(figures, in_turn)
+    assert len(packed) == packing.PACKED_SIZE
+    unpacked_figures, unpacked_in_turn = packing.unpack_position(packed, figure_builder)
+    assert unpacked_in_turn == in_turn
+    assert fen.build_fen(unpacked_figures, unpacked_in_turn) == fen_string
+
+
+@pytest.mark.parametrize(
+    "packed", [b"", bytes(packing.PACKED_SIZE - 1) + b"\x02", b"\x0d" + bytes(64)]
+)
+def test_unpack_invalid_position(packed):
+    with pytest.raises(packing.PackingError):
+        packing.unpack_position(packed, figure_builder)
@@ -0,0 +1,22 @@
+from chessbackend import engine
+from chessbackend.engine import parallel
+
+
+def test_parallel_search_finds_mate_in_one():
+    game = engine.Game.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    with parallel.ParallelSearcher(workers=2, memory_limit=1024 * 1024) as searcher:
+        parallel_result = searcher.search(game, max_depth=3)
+
+        # The workers wrote to the table of the searcher.
+        table = searcher.transposition_table
+        assert table.get(game.hash) is not None
+        searcher.clear()
+        assert table.get(game.hash) is None
+
+    assert parallel_result.result.best_move == engine.Move(
+        engine.Position(0, 0), engine.Position(0, 7)
+    )
+    assert len(parallel_result.worker_nodes) == 2
+    assert parallel_result.result.nodes == sum(parallel_result.worker_nodes)
+    # The position was not changed by the search.
+    assert game.to_fen() == "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"
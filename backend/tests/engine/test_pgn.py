@@ -0,0 +1,66 @@
+import io
+from chessbackend import engine
+from chessbackend.engine import pgn
+
+PGN = """\
+[Event "Club \\"Open\\""]
+[White "White"]
+[Black "Black"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 {A comment
+over two lines} Nc6 (2... d6 3. d4) 3. Bb5 $1 a6 ; rest of line
+4. Bxc6 dxc6 1-0
+
+% escaped line
+[Event "Second"]
+[SetUp "1"]
+[FEN "6k1/5ppp/8/8/8/8/8/R5K1 b - - 0 1"]
+
+1... h6 2. Ra8+ Kh7 *
+"""
+
+
+def test_read_games():
+    games = list(pgn.read_games(io.StringIO(PGN)))
+    assert len(games) == 2
+    assert games[0].headers["Event"] == 'Club "Open"'
+    assert games[0].moves == ("e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Bxc6", "dxc6")
+    assert games[0].result == "1-0"
+    assert games[1].moves == ("h6", "Ra8+", "Kh7")
+    assert games[1].result == "*"
+
+
+def test_iterate_moves():
+    game = next(pgn.read_games(io.StringIO(PGN)))
+    moves = [move for _, move in pgn.iterate_moves(game)]
+    assert moves[0] == engine.Move(engine.Position(4, 1), engine.Position(4, 3))
+    assert len(moves) == 8
+
+
+def test_write_and_read_games():
+    games = list(pgn.read_games(io.StringIO(PGN)))
+    output = io.StringIO()
+    pgn.write_games(games, output)
+    assert "1... h6 2. Ra8+ Kh7 *" in output.getvalue()
+    assert list(pgn.read_games(io.StringIO(output.getvalue()))) == [
+        game._replace(headers={**game.headers, **_missing_tags(game)}) for game in games
+    ]
+
+
+def test_build_pgn_game():
+    start_game = engine.Game.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    pgn_game = pgn.build_pgn_game(
+        start_game,
+        [engine.Move(engine.Position(0, 0), engine.Position(0, 7))],
+        {"Event": "Test"},
+        "1-0",
+    )
+    assert pgn_game.moves == ("Ra8#",)
+    assert pgn_game.headers["FEN"] == start_game.to_fen()
+
+
+def _missing_tags(game):
+    return {tag: "?" for tag in pgn.SEVEN_TAG_ROSTER if tag not in game.headers} | {
+        "Result": game.result
+    }
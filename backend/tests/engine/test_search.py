@@ -0,0 +1,112 @@
+from chessbackend import engine
+from chessbackend.engine import search
+
+figure_factory = engine.FigureFactory()
+figure_builder = engine.FigureBuilder(figure_factory)
+
+
+def test_search_finds_mate_in_one():
+    white_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(6, 5))
+    white_rook = figure_builder.build_rook(engine.Colour.WHITE, engine.Position(0, 0))
+    black_king = figure_builder.build_king(engine.Colour.BLACK, engine.Position(6, 7))
+    game = engine.Game((white_king, white_rook, black_king))
+
+    result = search.search(game, max_depth=3)
+    assert result.best_move == engine.Move(engine.Position(0, 0), engine.Position(0, 7))
+    assert result.score >= search.MATE_SCORE - search.MAX_DEPTH
+    assert result.principal_variation[0] == result.best_move
+
+
+def test_search_captures_undefended_queen():
+    white_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(0, 0))
+    white_knight = figure_builder.build_knight(
+        engine.Colour.WHITE, engine.Position(3, 3)
+    )
+    black_king = figure_builder.build_king(engine.Colour.BLACK, engine.Position(7, 7))
+    black_queen = figure_builder.build_queen(engine.Colour.BLACK, engine.Position(4, 5))
+    game = engine.Game((white_king, white_knight, black_king, black_queen))
+
+    result = search.search(game, max_depth=2)
+    assert result.best_move == engine.Move(engine.Position(3, 3), engine.Position(4, 5))
+    assert result.depth == 2
+    assert len(result.principal_variation) == 2
+
+
+def test_search_respects_node_limit_and_restores_game():
+    game = engine.Game(engine.build_default_figures(figure_builder))
+    start_hash = game.hash
+
+    result = search.search(game, max_depth=10, node_limit=500)
+    assert result.best_move in game.get_all_possible_moves()
+    assert result.depth < 10
+    assert game.hash == start_hash
+    assert game.in_turn == engine.Colour.WHITE
+    assert len(game.figures) == 32
+
+
+def test_search_without_possible_moves():
+    white_king = figure_builder.build_king(engine.Colour.WHITE, engine.Position(0, 0))
+    first_black_rook = figure_builder.build_rook(
+        engine.Colour.BLACK, engine.Position(0, 7)
+    )
+    second_black_rook = figure_builder.build_rook(
+        engine.Colour.BLACK, engine.Position(1, 7)
+    )
+    game = engine.Game((white_king, first_black_rook, second_black_rook))
+
+    result = search.search(game, max_depth=2)
+    assert result.best_move is None
+    assert result.score == -search.MATE_SCORE
+
+
+class TestQuiescence:
+    @staticmethod
+    def _build_game():
+        white_king = figure_builder.build_king(
+            engine.Colour.WHITE, engine.Position(0, 0)
+        )
+        white_queen = figure_builder.build_queen(
+            engine.Colour.WHITE, engine.Position(3, 3)
+        )
+        black_king = figure_builder.build_king(
+            engine.Colour.BLACK, engine.Position(7, 7)
+        )
+        black_pawn = figure_builder.build_pawn(
+            engine.Colour.BLACK, engine.Position(4, 4)
+        )
+        defending_black_pawn = figure_builder.build_pawn(
+            engine.Colour.BLACK, engine.Position(5, 5)
+        )
+        figures = (
+            white_king,
+            white_queen,
+            black_king,
+            black_pawn,
+            defending_black_pawn,
+        )
+        return engine.Game(figures)
+
+    def test_horizon_capture_without_quiescence(self):
+        game = self._build_game()
+        result = search.search(game, max_depth=1, quiescence=False)
+        assert result.best_move == engine.Move(
+            engine.Position(3, 3), engine.Position(4, 4)
+        )
+
+    def test_quiescence_sees_recapture(self):
+        game = self._build_game()
+        result = search.search(game, max_depth=1)
+        assert result.best_move != engine.Move(
+            engine.Position(3, 3), engine.Position(4, 4)
+        )
+        assert 600 < result.score < 800
+
+    def test_quiescence_searches_evasions_in_check(self):
+        # The capture on a8 mates. At the horizon black is in check, so it may
+        # not stand pat and has no evasion.
+        game = engine.Game.from_fen("n5k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        result = search.search(game, max_depth=1)
+        assert result.best_move == engine.Move(
+            engine.Position(0, 0), engine.Position(0, 7)
+        )
+        assert result.score >= search.MATE_SCORE - search.MAX_DEPTH
@@ -0,0 +1,120 @@
+import pytest
+from chessbackend import engine
+from chessbackend.engine import search, tablebase
+
+chess = pytest.importorskip("chess")
+
+
+class FakeTables:
+    # King and rook against king: a win for the rook's side, and a shorter way
+    # to the mate with the rook on the seventh rank.
+    def __init__(self):
+        self.probes = 0
+
+    def probe_wdl(self, board):
+        self.probes += 1
+        if len(board.piece_map()) < 3:
+            return 0
+        return 2 if board.turn == chess.WHITE else -2
+
+    def probe_dtz(self, board):
+        if len(board.piece_map()) < 3:
+            return 0
+        if board.turn == chess.WHITE:
+            return 5
+        return -1 if board.pieces(chess.ROOK, chess.WHITE) & chess.BB_RANK_7 else -9
+
+    def close(self):
+        pass
+
+
+def _move(source, target):
+    return engine.Move(engine.parse_field_name(source), engine.parse_field_name(target))
+
+
+@pytest.fixture
+def endgame_tablebase():
+    return tablebase.Tablebase(FakeTables(), max_pieces=3)
+
+
+def test_probe_caches_results(endgame_tablebase):
+    game = engine.Game.from_fen("4k3/8/8/8/8/8/8/R3K3 w - - 0 1")
+    assert endgame_tablebase.probe(game) == tablebase.TablebaseResult(2, 5)
+    assert endgame_tablebase.probe(game) == tablebase.TablebaseResult(2, 5)
+    assert (endgame_tablebase.hits, endgame_tablebase.misses) == (1, 1)
+    # Positions with pawns or too many figures are not probed.
+    assert (
+        endgame_tablebase.probe(engine.Game.from_fen("4k3/8/8/8/8/8/P7/4K3 w")) is None
+    )
+    assert (
+        endgame_tablebase.probe(engine.Game.from_fen("4k3/8/8/8/8/8/n7/R3K3 w")) is None
+    )
+    assert endgame_tablebase._tables.probes == 1
+    # Only the position with a pawn is cached.
+    assert (endgame_tablebase.hits, endgame_tablebase.misses) == (1, 2)
+
+
+@pytest.mark.parametrize(
+    "fen_string, move",
+    [
+        # Mate is played right away.
+        ("6k1/8/6K1/8/8/8/8/R7 w - - 0 1", _move("a1", "a8")),
+        # Otherwise the move with the shortest way to a capture or mate.
+        ("4k3/8/8/8/8/8/8/R3K3 w - - 0 1", _move("a1", "a7")),
+    ],
+)
+def test_get_best_move(endgame_tablebase, fen_string, move):
+    game = engine.Game.from_fen(fen_string)
+    assert endgame_tablebase.get_best_move(game) == (
+        move,
+        tablebase.TablebaseResult(2, 5),
+    )
+
+
+class CaptureTables:
+    # Two rooks against a bishop: the win goes through capturing the bishop,
+    # which takes longer to the next capture afterwards than a quiet move.
+    def probe_wdl(self, board):
+        return 2 if board.turn == chess.WHITE else -2
+
+    def probe_dtz(self, board):
+        if board.turn == chess.WHITE:
+            return 1 if board.pieces(chess.BISHOP, chess.BLACK) else 19
+        return -2 if board.pieces(chess.BISHOP, chess.BLACK) else -20
+
+    def close(self):
+        pass
+
+
+def test_get_best_move_plays_capture():
+    endgame_tablebase = tablebase.Tablebase(CaptureTables(), max_pieces=5)
+    game = engine.Game.from_fen("1b2k3/8/8/8/8/8/8/1R2K2R w - - 0 1")
+    assert endgame_tablebase.get_best_move(game) == (
+        _move("b1", "b8"),
+        tablebase.TablebaseResult(2, 1),
+    )
+
+
+def test_search_looks_up_tablebase_positions(endgame_tablebase):
+    game = engine.Game.from_fen("4k3/8/8/8/8/8/8/R3K3 w - - 0 1")
+    result = search.search(game, max_depth=4, endgame_tablebase=endgame_tablebase)
+    assert result.best_move == _move("a1", "a7")
+    assert result.score == search.TABLEBASE_WIN_SCORE - 5
+    assert result.nodes == 0
+
+
+def test_search_probes_positions_after_captures(endgame_tablebase):
+    game = engine.Game.from_fen("4k3/8/8/8/8/8/n7/R3K3 w - - 0 1")
+    result = search.search(game, max_depth=2, endgame_tablebase=endgame_tablebase)
+    assert result.best_move == _move("a1", "a2")
+    assert result.score >= search.TABLEBASE_WIN_SCORE - search.MAX_DEPTH - 9
+
+
+def test_get_max_pieces():
+    file_names = ["KRvK.rtbw", "KQRvK.rtbw", "KQRvKR.rtbz", "README"]
+    assert tablebase.get_max_pieces(file_names) == 4
+
+
+def test_open_missing_directory(tmp_path):
+    with pytest.raises(tablebase.TablebaseError):
+        tablebase.open_tablebase(str(tmp_path / "missing"))
@@ -0,0 +1,71 @@
+from chessbackend import engine
+from chessbackend.engine import search, transposition
+
+
+figure_factory = engine.FigureFactory()
+figure_builder = engine.FigureBuilder(figure_factory)
+
+
+def test_store_and_get():
+    table = transposition.TranspositionTable()
+    move = engine.Move(engine.Position(6, 0), engine.Position(5, 2))
+    table.store(12345, 3, -250, transposition.LOWER_BOUND, move)
+    entry = table.get(12345)
+    assert entry == transposition.TranspositionEntry(
+        3, -250, transposition.LOWER_BOUND, move
+    )
+    assert table.get(54321) is None
+    assert table.hits == 1
+    assert table.probes == 2
+
+
+def test_store_without_best_move():
+    table = transposition.TranspositionTable()
+    table.store(1, 0, 0, transposition.UPPER_BOUND, None)
+    assert table.get(1).best_move is None
+
+
+def test_memory_limit():
+    table = transposition.TranspositionTable(memory_limit=1024)
+    assert table.memory_usage <= 1024
+    for key in range(1, 1000):
+        table.store(key, 1, key, transposition.EXACT, None)
+    assert table.memory_usage <= 1024
+    assert table.get(999).score == 999
+
+
+def test_deeper_entry_is_kept():
+    # A table with a single bucket, so all keys collide.
+    table = transposition.TranspositionTable(memory_limit=1)
+    table.store(1, 8, 100, transposition.EXACT, None)
+    table.store(2, 2, 200, transposition.EXACT, None)
+    table.store(3, 1, 300, transposition.EXACT, None)
+    assert table.get(1).score == 100
+    assert table.get(2) is None
+    assert table.get(3).score == 300
+
+
+def test_search_uses_shared_table():
+    table = transposition.TranspositionTable()
+    game = engine.Game(engine.build_default_figures(figure_builder))
+    first_result = search.search(game, max_depth=3, transposition_table=table)
+    second_result = search.search(game, max_depth=3, transposition_table=table)
+    assert table.hits > 0
+    assert second_result.nodes < first_result.nodes
+    assert second_result.best_move == first_result.best_move
+
+
+def test_tables_share_buffer():
+    buffer = memoryview(bytearray(transposition.get_buffer_size(1024)))
+    first_table = transposition.TranspositionTable(1024, buffer)
+    second_table = transposition.TranspositionTable(1024, buffer)
+    first_table.store(12345, 3, 42, transposition.EXACT, None)
+    assert second_table.get(12345).score == 42
+
+
+def test_torn_entry_is_ignored():
+    table = transposition.TranspositionTable(memory_limit=1)
+    table.store(1, 3, 100, transposition.EXACT, None)
+    # As if another process wrote the data of another entry at the same time.
+    table._data[0] = transposition._pack_entry(5, 200, transposition.EXACT, None)
+    assert table.get(1) is None
@@ -1,6 +1,8 @@
+import time
 import pytest
 from chessbackend.server import app, data
 from chessbackend import engine
+from chessbackend.engine import tablebase
 from flask import json
 
 
@@ -24,6 +26,29 @@ def test_get_game(client):
     assert isinstance(get_data["stalemate"], bool)
 
 
+def test_get_game_with_tablebase(client, monkeypatch):
+    pytest.importorskip("chess")
+
+    class FakeTables:
+        def probe_wdl(self, board):
+            return 2
+
+        def probe_dtz(self, board):
+            return 7
+
+    monkeypatch.setattr(
+        app, "endgame_tablebase", tablebase.Tablebase(FakeTables(), max_pieces=3)
+    )
+    game_id = json.loads(
+        client.post("/game", json={"fen": "4k3/8/8/8/8/8/8/R3K3 w - - 0 1"}).data
+    )["id"]
+    get_data = json.loads(client.get(f"/game/{game_id}").data)
+    assert get_data["tablebase"] == {"wdl": 2, "dtz": 7}
+
+    start_game_id = json.loads(client.post("/game").data)["id"]
+    assert "tablebase" not in json.loads(client.get(f"/game/{start_game_id}").data)
+
+
 def test_get_game_figures(client):
     create_response = client.post("/game")
     create_data = json.loads(create_response.data)
@@ -68,6 +93,20 @@ def test_get_figure_details(client):
     assert len(figure_details_data["validMoves"][0]) == 2
 
 
+def test_make_move_in_san(client):
+    game_id = json.loads(client.post("/game").data)["id"]
+
+    assert client.patch(f"/game/{game_id}", json={"san": "Nf3"}).status_code == 204
+    assert client.patch(f"/game/{game_id}", json={"san": "Nf3"}).status_code == 409
+    assert client.patch(f"/game/{game_id}", json={"san": 5}).status_code == 400
+
+    figures_data = json.loads(client.get(f"/game/{game_id}/figures").data)
+    assert any(
+        fig["name"] == "Knight" and (fig["positionX"], fig["positionY"]) == (5, 2)
+        for fig in figures_data
+    )
+
+
 def test_update_figure_location(client):
     create_response = client.post("/game")
     create_data = json.loads(create_response.data)
@@ -98,6 +137,160 @@ def test_update_figure_location(client):
     assert game_data["inTurn"] == "black"
 
 
+def test_create_game_from_fen(client):
+    fen = "4k3/8/8/8/8/8/8/4K2R b - - 0 1"
+    create_response = client.post("/game", json={"fen": fen})
+    assert create_response.status_code == 201
+    create_data = json.loads(create_response.data)
+    assert create_data["inTurn"] == "black"
+
+    game_response = client.get(f"/game/{create_data['id']}")
+    game_data = json.loads(game_response.data)
+    assert game_data["fen"] == fen
+
+    figures_response = client.get(f"/game/{create_data['id']}/figures")
+    assert len(json.loads(figures_response.data)) == 3
+
+
+def test_create_game_from_invalid_fen(client):
+    create_response = client.post("/game", json={"fen": "not a fen"})
+    assert create_response.status_code == 400
+    assert client.post("/game", json={"fen": 5}).status_code == 400
+    assert client.post("/game", json=["fen"]).status_code == 400
+    assert client.post("/game", json={"fen": "k7/8/8/8/8/8/8/8 w"}).status_code == 400
+
+
+def test_bitboard_backend(client):
+    app.app.config["ENGINE_BACKEND"] = "bitboard"
+    try:
+        create_response = client.post("/game")
+    finally:
+        app.app.config["ENGINE_BACKEND"] = "figures"
+    game_id = json.loads(create_response.data)["id"]
+
+    patch_response = client.patch(
+        f"/game/{game_id}", json={"from": {"x": 4, "y": 1}, "to": {"x": 4, "y": 3}}
+    )
+    assert patch_response.status_code == 204
+
+    game_response = client.get(f"/game/{game_id}")
+    game_data = json.loads(game_response.data)
+    assert game_data["inTurn"] == "black"
+    assert not game_data["check"]
+
+
+def test_get_moves(client):
+    game_id = json.loads(client.post("/game").data)["id"]
+
+    moves_response = client.get(f"/game/{game_id}/moves")
+    assert moves_response.status_code == 200
+    moves_data = json.loads(moves_response.data)
+    assert moves_data["inTurn"] == "white"
+    assert sum(len(targets) for targets in moves_data["moves"].values()) == 20
+    assert sorted(moves_data["moves"]["e2"]) == [[4, 2], [4, 3]]
+    assert "e1" not in moves_data["moves"]
+
+    etag = moves_response.headers["ETag"]
+    cached_response = client.get(
+        f"/game/{game_id}/moves", headers={"If-None-Match": etag}
+    )
+    assert cached_response.status_code == 304
+
+    client.patch(
+        f"/game/{game_id}", json={"from": {"x": 4, "y": 1}, "to": {"x": 4, "y": 3}}
+    )
+    moved_response = client.get(
+        f"/game/{game_id}/moves", headers={"If-None-Match": etag}
+    )
+    assert moved_response.status_code == 200
+    assert json.loads(moved_response.data)["inTurn"] == "black"
+
+
+def test_get_events(client):
+    game_id = json.loads(client.post("/game").data)["id"]
+    events_response = client.get(f"/game/{game_id}/events")
+    assert events_response.mimetype == "text/event-stream"
+    assert app.game_events.count_subscriptions(game_id) == 1
+
+    client.patch(
+        f"/game/{game_id}", json={"from": {"x": 4, "y": 1}, "to": {"x": 4, "y": 3}}
+    )
+    chunks = iter(events_response.response)
+    assert next(chunks) == b": subscribed\n\n"
+    event = next(chunks).decode()
+    assert event.startswith("event: move\n")
+    event_data = json.loads(event.split("data: ")[1])
+    assert event_data["move"] == {"from": {"x": 4, "y": 1}, "to": {"x": 4, "y": 3}}
+    assert event_data["inTurn"] == "black"
+    assert not event_data["check"]
+    moves_response = client.get(f"/game/{game_id}/moves")
+    assert moves_response.headers["ETag"] == f'"{event_data["hash"]}"'
+
+    events_response.close()
+    assert app.game_events.count_subscriptions(game_id) == 0
+
+
+def test_ai_move_job(client):
+    fen = "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"
+    game_id = json.loads(client.post("/game", json={"fen": fen}).data)["id"]
+
+    create_response = client.post(f"/game/{game_id}/ai-move", json={"timeLimit": 5})
+    assert create_response.status_code == 202
+    job_url = create_response.headers["Location"]
+    assert json.loads(create_response.data)["status"] in ("queued", "running")
+
+    deadline = time.monotonic() + 30
+    job_data = json.loads(client.get(job_url).data)
+    while job_data["status"] != "done" and time.monotonic() < deadline:
+        time.sleep(0.05)
+        job_data = json.loads(client.get(job_url).data)
+    assert job_data["result"]["move"] == {
+        "from": {"x": 0, "y": 0},
+        "to": {"x": 0, "y": 7},
+    }
+
+    assert client.delete(job_url).status_code == 200
+    assert client.get(f"/game/other/ai-move/{job_data['id']}").status_code == 404
+    invalid_response = client.post(f"/game/{game_id}/ai-move", json={"timeLimit": "x"})
+    assert invalid_response.status_code == 400
+    assert client.post(f"/game/{game_id}/ai-move", json=[1]).status_code == 400
+
+
+def test_sqlite_game_store(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        app, "game_store", data.SqliteGameStore(str(tmp_path / "games.sqlite3"))
+    )
+    game_id = json.loads(client.post("/game").data)["id"]
+
+    patch_response = client.patch(
+        f"/game/{game_id}", json={"from": {"x": 4, "y": 1}, "to": {"x": 4, "y": 5}}
+    )
+    assert patch_response.status_code == 409
+    patch_response = client.patch(
+        f"/game/{game_id}", json={"from": {"x": 4, "y": 1}, "to": {"x": 4, "y": 3}}
+    )
+    assert patch_response.status_code == 204
+
+    game_data = json.loads(client.get(f"/game/{game_id}").data)
+    assert game_data["inTurn"] == "black"
+    figures_data = json.loads(client.get(f"/game/{game_id}/figures").data)
+    figure_id = next(
+        fig["id"]
+        for fig in figures_data
+        if (fig["positionX"], fig["positionY"]) == (4, 3)
+    )
+    figure_response = client.get(f"/game/{game_id}/figures/{figure_id}")
+    assert json.loads(figure_response.data)["name"] == "Pawn"
+
+
+def test_unknown_game(client):
+    assert client.get("/game/unknown").status_code == 404
+    patch_response = client.patch(
+        "/game/unknown", json={"from": {"x": 4, "y": 1}, "to": {"x": 4, "y": 3}}
+    )
+    assert patch_response.status_code == 404
+
+
 @pytest.fixture
 def client():
     app.app.config["TESTING"] = True
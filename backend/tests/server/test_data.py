@@ -0,0 +1,147 @@
+import threading
+import pytest
+from chessbackend import engine
+from chessbackend.server import data
+
+
+def _build_game_figures(game_id):
+    figure_builder = engine.FigureBuilder(data.FigureDataAdapterFactory(game_id))
+    return engine.build_default_figures(figure_builder)
+
+
+def _create_game(backend="figures"):
+    game = data.GameDataAdapterFactory(backend).create()
+    game.figures = _build_game_figures(game.id)
+    return game
+
+
+@pytest.mark.parametrize("backend", ["figures", "bitboard"])
+def test_sqlite_game_store(tmp_path, backend):
+    database = str(tmp_path / "games.sqlite3")
+    store = data.SqliteGameStore(database)
+    game = _create_game(backend)
+    store.add(game)
+
+    move = engine.Move(engine.Position(4, 1), engine.Position(4, 3))
+    store.make_move(game.id, move)
+
+    # A second store on the same file, as used by another worker process.
+    stored_game = data.SqliteGameStore(database).get(game.id)
+    assert isinstance(stored_game, data.GAME_DATA_ADAPTERS[backend])
+    assert stored_game.in_turn == engine.Colour.BLACK
+    assert stored_game.to_fen() == (
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b - - 0 1"
+    )
+    assert store.get_moves(game.id) == (move,)
+
+
+def test_sqlite_game_store_invalid_move(tmp_path):
+    store = data.SqliteGameStore(str(tmp_path / "games.sqlite3"))
+    game = _create_game()
+    store.add(game)
+    with pytest.raises(ValueError):
+        store.make_move(
+            game.id, engine.Move(engine.Position(4, 1), engine.Position(4, 4))
+        )
+    assert store.get(game.id).to_fen() == game.to_fen()
+    assert store.get_moves(game.id) == tuple()
+    with pytest.raises(data.NotFoundError):
+        store.get("unknown")
+
+
+@pytest.mark.parametrize("store_type", ["memory", "sqlite"])
+def test_game_store_jobs(tmp_path, store_type):
+    if store_type == "sqlite":
+        store = data.SqliteGameStore(str(tmp_path / "games.sqlite3"), max_kept_jobs=2)
+    else:
+        store = data.MemoryGameStore(max_kept_jobs=2)
+    store.add_job(data.JobRecord("first", "game", "queued"))
+    assert store.get_job("first") == data.JobRecord("first", "game", "queued")
+
+    # Only the first finish counts.
+    assert store.finish_job("first", "cancelled") == data.JobRecord(
+        "first", "game", "cancelled", True
+    )
+    assert store.finish_job("first", "done", "{}").status == "cancelled"
+
+    # The oldest jobs are dropped.
+    store.add_job(data.JobRecord("second", "game", "queued"))
+    store.add_job(data.JobRecord("third", "game", "queued"))
+    with pytest.raises(data.NotFoundError):
+        store.get_job("first")
+    assert store.get_job("second").status == "queued"
+    store.clear()
+    with pytest.raises(data.NotFoundError):
+        store.get_job("third")
+
+
+def test_figure_ids_are_field_names():
+    store = data.MemoryGameStore()
+    game = _create_game()
+    store.add(game)
+    figure_ids = {fig.id: fig for fig in store.get(game.id).figures}
+    assert len(figure_ids) == 32
+    assert figure_ids["e2"].name == "Pawn"
+    assert figure_ids["e2"].position == engine.Position(4, 1)
+    assert figure_ids["d8"].name == "Queen"
+
+    store.make_move(game.id, engine.Move(engine.Position(4, 1), engine.Position(4, 3)))
+    figure_ids = {fig.id: fig for fig in store.get(game.id).figures}
+    assert "e2" not in figure_ids
+    assert figure_ids["e4"].name == "Pawn"
+
+
+def test_memory_game_store_concurrent_moves():
+    store = data.MemoryGameStore()
+    game = _create_game()
+    store.add(game)
+    move = engine.Move(engine.Position(4, 1), engine.Position(4, 3))
+    barrier = threading.Barrier(8)
+    results = []
+
+    def make_move():
+        barrier.wait()
+        try:
+            store.make_move(game.id, move)
+            results.append(True)
+        except ValueError:
+            results.append(False)
+
+    threads = [threading.Thread(target=make_move) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Only the first move is valid, the others find black in turn.
+    assert results.count(True) == 1
+    assert store.get(game.id).in_turn == engine.Colour.BLACK
+
+
+def test_memory_game_store_capture():
+    store = data.MemoryGameStore()
+    game = data.GameDataAdapterFactory().create()
+    figure_builder = engine.FigureBuilder(data.FigureDataAdapterFactory(game.id))
+    game.figures = (
+        figure_builder.build_king(engine.Colour.WHITE, engine.Position(4, 0)),
+        figure_builder.build_rook(engine.Colour.WHITE, engine.Position(0, 0)),
+        figure_builder.build_king(engine.Colour.BLACK, engine.Position(4, 7)),
+        figure_builder.build_knight(engine.Colour.BLACK, engine.Position(0, 7)),
+    )
+    store.add(game)
+    store.make_move(game.id, engine.Move(engine.Position(0, 0), engine.Position(0, 7)))
+    assert len(store.get(game.id).figures) == 3
+
+
+def test_game_status_cache():
+    cache = data.GameStatusCache(max_size=1)
+    first_game = _create_game()
+    second_game = _create_game("bitboard")
+    assert cache.get_status(first_game) == engine.GameStatus(False, False, False)
+    # The same position in another game is a hit.
+    assert cache.get_status(second_game) == engine.GameStatus(False, False, False)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    second_game.make_move(engine.Move(engine.Position(4, 1), engine.Position(4, 3)))
+    cache.get_status(second_game)
+    cache.get_status(first_game)
+    assert (cache.hits, cache.misses) == (1, 3)
@@ -0,0 +1,29 @@
+from chessbackend.server import events
+
+
+def test_publish_to_game_subscribers():
+    game_events = events.GameEvents()
+    first_subscription = game_events.subscribe("game")
+    second_subscription = game_events.subscribe("game")
+    other_subscription = game_events.subscribe("other")
+
+    game_events.publish("game", {"inTurn": "black"})
+    assert first_subscription.get(0) == {"inTurn": "black"}
+    assert second_subscription.get(0) == {"inTurn": "black"}
+    assert other_subscription.get(0) is None
+
+    game_events.unsubscribe("game", first_subscription)
+    game_events.publish("game", {"inTurn": "white"})
+    assert first_subscription.get(0) is None
+    assert second_subscription.get(0) == {"inTurn": "white"}
+
+
+def test_slow_subscriber_is_closed():
+    game_events = events.GameEvents(max_queue_size=1)
+    subscription = game_events.subscribe("game")
+    game_events.publish("game", {"inTurn": "black"})
+    assert not subscription.closed
+
+    game_events.publish("game", {"inTurn": "white"})
+    assert subscription.closed
+    assert game_events.count_subscriptions("game") == 0
@@ -0,0 +1,104 @@
+from concurrent import futures
+import time
+import pytest
+from chessbackend import engine
+from chessbackend.engine import book, fen, packing, pgn
+from chessbackend.server import data, jobs
+
+figure_builder = engine.FigureBuilder(engine.FigureFactory())
+
+
+def _pack_fen(fen_string):
+    return packing.pack_position(*fen.parse_fen(fen_string, figure_builder))
+
+
+def _wait(job, timeout=30):
+    futures.wait((job.future,), timeout)
+    return job
+
+
+@pytest.fixture
+def ai_move_jobs():
+    ai_move_jobs = jobs.AiMoveJobs(max_workers=1, max_pending_jobs=2)
+    yield ai_move_jobs
+    ai_move_jobs.shutdown()
+
+
+def test_ai_move_job_finds_mate(ai_move_jobs):
+    job = ai_move_jobs.submit("game", _pack_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"), 5)
+    assert ai_move_jobs.get(job.id) is job
+    _wait(job)
+    assert job.status == jobs.DONE
+    assert job.result.move == engine.Move(engine.Position(0, 0), engine.Position(0, 7))
+    with pytest.raises(data.NotFoundError):
+        ai_move_jobs.get("unknown")
+
+
+def test_pending_jobs_are_bounded(ai_move_jobs):
+    packed_position = _pack_fen(fen.START_FEN)
+    first_job = ai_move_jobs.submit("game", packed_position, 5)
+    second_job = ai_move_jobs.submit("game", packed_position, 5)
+    with pytest.raises(jobs.JobQueueFullError):
+        ai_move_jobs.submit("game", packed_position, 5)
+
+    for job in (first_job, second_job):
+        ai_move_jobs.cancel(job.id)
+        assert job.status == jobs.CANCELLED
+    start = time.monotonic()
+    for job in (first_job, second_job):
+        _wait(job)
+    # The running search stopped long before its time limit.
+    assert time.monotonic() - start < 4
+    assert first_job.result is None
+
+    # The slots of the cancelled jobs are free again, once their done
+    # callbacks ran.
+    time.sleep(0.1)
+    _wait(ai_move_jobs.submit("game", packed_position, 0.1))
+
+
+def test_ai_move_job_plays_book_move(tmp_path):
+    builder = book.BookBuilder()
+    builder.add_game(pgn.PgnGame({}, ("Nf3",), "1-0"))
+    book_path = str(tmp_path / "book.bin")
+    builder.write(book_path)
+    ai_move_jobs = jobs.AiMoveJobs(max_workers=1, book_path=book_path)
+    try:
+        job = _wait(ai_move_jobs.submit("game", _pack_fen(fen.START_FEN), 5))
+    finally:
+        ai_move_jobs.shutdown()
+    assert job.result.move == engine.Move(engine.Position(6, 0), engine.Position(5, 2))
+    assert job.result.nodes == 0
+
+
+def test_jobs_are_shared_through_the_store(tmp_path):
+    # Two processes of the app, each with its own workers, on the same store.
+    database = str(tmp_path / "games.sqlite3")
+    ai_move_jobs = jobs.AiMoveJobs(
+        max_workers=1, job_store=data.SqliteGameStore(database)
+    )
+    other_ai_move_jobs = jobs.AiMoveJobs(job_store=data.SqliteGameStore(database))
+    try:
+        packed_position = _pack_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        job = _wait(ai_move_jobs.submit("game", packed_position, 5))
+        time.sleep(0.1)
+        stored_job = other_ai_move_jobs.get(job.id)
+        assert (stored_job.game_id, stored_job.status) == ("game", jobs.DONE)
+        assert stored_job.result == job.result
+        # A finished job keeps its result.
+        assert other_ai_move_jobs.cancel(job.id).status == jobs.DONE
+
+        job = ai_move_jobs.submit("game", _pack_fen(fen.START_FEN), 5)
+        assert other_ai_move_jobs.cancel(job.id).status == jobs.CANCELLED
+        # The process running the search stops it when it gets the job.
+        start = time.monotonic()
+        assert ai_move_jobs.get(job.id).status == jobs.CANCELLED
+        _wait(job)
+        assert time.monotonic() - start < 4
+        time.sleep(0.1)
+        assert other_ai_move_jobs.get(job.id).result is None
+        with pytest.raises(data.NotFoundError):
+            other_ai_move_jobs.get("unknown")
+    finally:
+        ai_move_jobs.shutdown()
+        other_ai_move_jobs.shutdown()
@@ -1,5 +1,5 @@
-import { useEffect, useState } from "react";
-import { Game, Figure } from "./api";
+import { useEffect, useRef, useState } from "react";
+import { Game, Figure, LegalMoves } from "./api";
 import "./App.css";
 import Chessboard from "./Chessboard";
 
@@ -10,7 +10,7 @@ function App() {
   const [selectedCell, setSelectedCell] = useState<
     [number, number] | undefined
   >();
-  const [moveProposals, setMoveProposals] = useState<[number, number][]>([]);
+  const [legalMoves, setLegalMoves] = useState<LegalMoves | undefined>();
 
   async function createGame() {
     fetch("/game", {
@@ -27,26 +27,56 @@ function App() {
       .then((result) => setGame(result));
   }, [moveCounter]);
 
+  // Own moves refresh the board when the PATCH succeeds. The event stream is
+  // only needed for the opponent's moves, so the event of an own move is
+  // skipped.
+  const ownMove = useRef<string | undefined>();
+
+  // One event stream per game: it is closed when the game changes.
+  const gameId = game?.id;
+  useEffect(() => {
+    if (gameId === undefined) return;
+    const events = new EventSource(`/game/${gameId}/events`);
+    let opened = false;
+    events.addEventListener("open", () => {
+      // Moves may have been missed while the stream was reconnecting.
+      if (opened) setMoveCounter((counter) => counter + 1);
+      opened = true;
+    });
+    events.addEventListener("move", (event) => {
+      const { move } = JSON.parse((event as MessageEvent).data);
+      if (JSON.stringify(move) === ownMove.current) {
+        ownMove.current = undefined;
+        return;
+      }
+      setMoveCounter((counter) => counter + 1);
+    });
+    return () => events.close();
+  }, [gameId]);
+
   async function makeMove(target: [number, number]) {
     if (!game || !selectedCell) return;
+    const move = {
+      from: {
+        x: selectedCell[0],
+        y: selectedCell[1],
+      },
+      to: {
+        x: target[0],
+        y: target[1],
+      },
+    };
+    ownMove.current = JSON.stringify(move);
     fetch(`/game/${game.id}`, {
       method: "PATCH",
       headers: {
         "Content-Type": "application/json",
       },
-      body: JSON.stringify({
-        from: {
-          x: selectedCell[0],
-          y: selectedCell[1],
-        },
-        to: {
-          x: target[0],
-          y: target[1],
-        },
-      }),
-    }).then(() => {
+      body: JSON.stringify(move),
+    }).then((response) => {
+      if (response.ok) setMoveCounter((counter) => counter + 1);
+      else ownMove.current = undefined;
       setSelectedCell(undefined);
-      setMoveCounter((counter) => counter + 1);
     });
   }
 
@@ -55,6 +85,9 @@ function App() {
     fetch(`/game/${game.id}/figures`)
       .then((response) => response.json())
       .then((result) => setFigures(result));
+    fetch(`/game/${game.id}/moves`)
+      .then((response) => response.json())
+      .then((result) => setLegalMoves(result));
   }, [game]);
 
   const selectedFigure = figures.find(
@@ -64,15 +97,8 @@ function App() {
       fig.positionY === selectedCell[1]
   );
 
-  useEffect(() => {
-    if (!game || !selectedFigure) {
-      setMoveProposals([]);
-    } else {
-      fetch(`/game/${game.id}/figures/${selectedFigure.id}`)
-        .then((response) => response.json())
-        .then((result) => setMoveProposals(result["validMoves"]));
-    }
-  }, [selectedFigure, game]);
+  const moveProposals =
+    (selectedFigure && legalMoves?.moves[selectedFigure.id]) || [];
 
   return (
     <div className="App">
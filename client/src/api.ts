@@ -13,3 +13,9 @@ export type Game = {
   checkmate: boolean;
   stalemate: boolean;
 };
+
+export type LegalMoves = {
+  inTurn: string;
+  // Target fields by id of the figure to move.
+  moves: { [figureId: string]: [number, number][] };
+};